@@ -0,0 +1,131 @@
+"""
+app/aio.py
+
+asyncio evaluation API for services that embed the calculator.
+
+Cheap calculations run inline on the event loop. Calculations predicted to be
+expensive (big-int powers, modulus of huge integers) are offloaded to an
+executor, a thread pool by default or any 'concurrent.futures' executor such
+as a ProcessPoolExecutor, with a limit on how many run at once.
+
+'evaluate' raises like the synchronous path; 'evaluate_outcome' returns an
+Outcome instead (see app.outcome), for services that handle many failing
+requests.
+
+Cancellation:
+    - Cancelling the awaiting task cancels an offloaded calculation that has not
+      started yet and releases its concurrency slot immediately.
+    - A calculation already running in a thread cannot be interrupted; its result
+      is discarded. Use a process pool when running work must be abandoned.
+
+With a Tracer (see app.tracing), the dispatch and execute stages of each
+request are recorded as spans in the "server" category; an offloaded execute
+span covers the wait for a concurrency slot and for the executor.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from typing import Optional
+from app.calculation import Calculation, CalculationFactory
+from app.outcome import ErrorCode, Failure, Outcome
+from app.tracing import NULL_TRACER, Tracer
+
+# Estimated result size (in bits) above which a calculation is offloaded.
+EXPENSIVE_BITS = 1 << 16
+
+#--------------------------------------
+# Cost Prediction
+#--------------------------------------
+
+def is_expensive(calculation: Calculation, expensive_bits: int = EXPENSIVE_BITS) -> bool:
+    """
+    Predicts whether executing a calculation would block the event loop.
+
+    Only integer operands are considered: float arithmetic is constant time,
+    while big-int '**' grows with the size of the result and '%' with the size
+    of the operands.
+    """
+
+    a, b = calculation.a, calculation.b
+    if not (isinstance(a, int) and isinstance(b, int)):
+        return False
+    if calculation.operator == '**':
+        return b > 0 and abs(a) > 1 and a.bit_length() * b > expensive_bits
+    if calculation.operator == '%':
+        return max(a.bit_length(), b.bit_length()) > expensive_bits
+    return False
+
+#--------------------------------------
+# Async Calculator
+#--------------------------------------
+
+class AsyncCalculator:
+    """
+    Evaluates calculations from coroutines without blocking the event loop.
+
+    Args:
+        executor: Executor used for expensive calculations (None uses the loop's
+            default thread pool).
+        max_concurrency: Maximum number of offloaded calculations running at once.
+        expensive_bits: Threshold passed to 'is_expensive'.
+        tracer: Records dispatch and execute spans (None: no tracing).
+    """
+
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        max_concurrency: int = 4,
+        expensive_bits: int = EXPENSIVE_BITS,
+        tracer: Optional[Tracer] = None,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        self.executor = executor
+        self.expensive_bits = expensive_bits
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._trace = tracer if tracer is not None else NULL_TRACER
+
+    async def evaluate(self, a: float, calculation_type: str, b: float) -> float:
+        """
+        Creates and executes a calculation, offloading it when predicted expensive.
+
+        Raises the same exceptions as the synchronous path (ValueError for an
+        unsupported operator, ZeroDivisionError for a zero divisor).
+        """
+
+        with self._trace.span("dispatch", "server", operator=calculation_type):
+            calculation = CalculationFactory.create_calculation(a, calculation_type, b)
+            expensive = is_expensive(calculation, self.expensive_bits)
+        with self._trace.span("execute", "server", operator=calculation_type, offloaded=expensive):
+            if not expensive:
+                return calculation.execute()
+
+            async with self._semaphore:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self.executor, calculation.execute)
+
+    async def evaluate_outcome(self, a: float, calculation_type: str, b: float) -> Outcome:
+        """
+        Like 'evaluate', but returns a Failure instead of raising: with an
+        UNSUPPORTED_OPERATOR code for an unknown operator, or the calculation's
+        own error code (e.g. DIVIDE_BY_ZERO).
+        """
+
+        with self._trace.span("dispatch", "server", operator=calculation_type):
+            calculation_class = CalculationFactory.get_calculation_class(calculation_type)
+            if calculation_class is None:
+                return Failure(ErrorCode.UNSUPPORTED_OPERATOR,
+                               CalculationFactory.unsupported_message(calculation_type))
+            calculation = calculation_class(a, b)
+            expensive = is_expensive(calculation, self.expensive_bits)
+        with self._trace.span("execute", "server", operator=calculation_type, offloaded=expensive):
+            if not expensive:
+                return calculation.evaluate()
+
+            async with self._semaphore:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self.executor, calculation.evaluate)
+
+async def evaluate(a: float, calculation_type: str, b: float) -> float:
+    """Evaluates one calculation with a default AsyncCalculator."""
+    return await AsyncCalculator().evaluate(a, calculation_type, b)
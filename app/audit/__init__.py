@@ -0,0 +1,187 @@
+"""
+app/audit.py
+
+Asynchronous audit log of executed calculations.
+
+'AuditLog.record' only puts a tuple on a bounded queue; a background writer
+thread turns queued records into JSON Lines and writes everything that is
+queued in one call, so the REPL never waits for the disk. Each line is:
+
+    {"time": ..., "operator": "/", "a": 1.0, "b": 0.0, "result": null,
+     "latency": 1.2e-06, "error": "divide_by_zero", "message": "..."}
+
+Results that are not finite real numbers (inf, nan, complex) are written as
+text, e.g. "inf", so every line stays valid JSON.
+
+The log file is rotated like 'logging.handlers.RotatingFileHandler': once it
+would grow past 'max_bytes', 'path' becomes 'path.1', 'path.1' becomes
+'path.2', and so on, keeping 'backups' old files.
+
+When the queue is full, the policy decides:
+    - DROP: the record is discarded and counted in 'dropped' (the REPL never blocks).
+    - BLOCK: 'record' waits for room (no record is lost).
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any, List, Optional, TextIO, Tuple
+from app.calculation import Calculation
+from app.outcome import Failure, Outcome, json_result
+
+# Queue-full policies.
+DROP = "drop"
+BLOCK = "block"
+POLICIES = (DROP, BLOCK)
+
+# Defaults
+MAX_BYTES = 10 * 1024 * 1024    # size at which the log is rotated
+BACKUPS = 5                     # rotated files kept
+QUEUE_SIZE = 10_000             # records waiting for the writer
+
+# Queued record: (time, operator, a, b, outcome, latency)
+Record = Tuple[float, str, Any, Any, Outcome, float]
+
+_STOP = None
+
+#--------------------------------------
+# Helper Functions
+#--------------------------------------
+
+def _render(record: Record) -> str:
+    """Renders one queued record as a JSON line."""
+    timestamp, operator, a, b, outcome, latency = record
+    if type(outcome) is Failure:
+        result, error, message = None, str(outcome.code), outcome.message
+    else:
+        result, error, message = outcome, None, None
+    return json.dumps({
+        "time": timestamp, "operator": operator, "a": json_result(a), "b": json_result(b),
+        "result": json_result(result), "latency": latency, "error": error, "message": message,
+    }) + "\n"
+
+#--------------------------------------
+# Audit Log
+#--------------------------------------
+
+class AuditLog:
+    """
+    Writes calculation records to a rotating JSON Lines file from a background thread.
+
+    Args:
+        path: Log file; rotated files are 'path.1' to 'path.<backups>'.
+        max_bytes: Rotate before the file would grow past this size.
+        backups: Number of rotated files kept.
+        queue_size: Records that may wait for the writer.
+        policy: DROP or BLOCK, applied when the queue is full.
+    """
+
+    def __init__(self, path: str, max_bytes: int = MAX_BYTES, backups: int = BACKUPS,
+                 queue_size: int = QUEUE_SIZE, policy: str = DROP) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy '{policy}'. Use one of: {', '.join(POLICIES)}.")
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1.")
+        if backups < 0:
+            raise ValueError("backups must not be negative.")
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1.")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.policy = policy
+        self.dropped = 0
+        self.written = 0
+        self.writes = 0
+        self.error: Optional[OSError] = None
+        self._queue: "queue.Queue[Optional[Record]]" = queue.Queue(queue_size)
+        self._file: TextIO = open(path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+        self._rotating = True
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_loop, name="audit-writer", daemon=True)
+        self._writer.start()
+
+    def record(self, calculation: Calculation, outcome: Outcome, latency: float) -> None:
+        """Queues a record of an executed calculation: its result or a Failure, and its latency."""
+        if self._closed:
+            raise ValueError("The audit log is closed.")
+        record = (time.time(), calculation.operator, calculation.a, calculation.b, outcome, latency)
+        if self.policy == BLOCK:
+            self._queue.put(record)
+            return
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _write_loop(self) -> None:
+        """Writer thread: waits for a record, then writes everything queued in one call."""
+        while True:
+            batch: List[Optional[Record]] = [self._queue.get()]
+            while batch[-1] is not _STOP:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is _STOP
+            if stop:
+                batch.pop()
+            if batch:
+                self._write("".join(map(_render, batch)), len(batch))
+            if stop:
+                break
+        self._file.close()
+
+    def _write(self, data: str, count: int) -> None:
+        """Writes rendered records, rotating first if the file would grow too large."""
+        try:
+            size = len(data.encode("utf-8"))
+            if self._rotating and self._size and self._size + size > self.max_bytes:
+                self._rotate()
+            self._file.write(data)
+            self._file.flush()
+            self._size += size
+            self.written += count
+            self.writes += 1
+        except OSError as error:   # keep serving the REPL; the loss is counted
+            self.error = error
+            self.dropped += count
+
+    def _rotate(self) -> None:
+        """
+        Shifts 'path.N' to 'path.N+1', 'path' to 'path.1', and opens a new file.
+
+        If a rename fails, 'path' is reopened for appending and rotation stops
+        for this log, so later records are still written.
+        """
+        self._file.close()
+        try:
+            if self.backups:
+                for index in range(self.backups - 1, 0, -1):
+                    source = f"{self.path}.{index}"
+                    if os.path.exists(source):
+                        os.replace(source, f"{self.path}.{index + 1}")
+                os.replace(self.path, f"{self.path}.1")
+        except OSError as error:
+            self.error = error
+            self._rotating = False
+            self._file = open(self.path, "a", encoding="utf-8")
+            return
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._size = 0
+
+    def close(self) -> None:
+        """Writes every queued record, then stops the writer thread and closes the file."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_STOP)
+            self._writer.join()
+
+    def __enter__(self) -> "AuditLog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
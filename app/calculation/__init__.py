@@ -6,11 +6,27 @@ This module implements a flexible calculator system using:
     - Factory pattern for dynamic operator registration.
     - Decorator pattern for clean operator-to-subclass mapping.
     - Concrete class for implementation of operations.
+
+The factory registry is thread-safe: registrations take a lock and publish a
+new dict, so lookups never lock. 'CalculationFactory.freeze' turns the
+registry into a read-only mapping after startup; registering after that
+raises RegistryFrozenError.
+
+With interning on ('CalculationFactory.set_interning'), the factory returns
+one shared, immutable instance per (calculation type, a, b) with float
+operands, so histories of repeated calculations hold references instead of
+duplicates. Shared instances live in a weak-value table and are dropped once
+nothing refers to them.
 """
 
+import struct
+import threading
+import weakref
 from abc import ABC, abstractmethod
-from typing import Dict, Type
-from app.operation import Operation
+from types import MappingProxyType
+from typing import Callable, Dict, Mapping, Optional, Tuple, Type
+from app.operation import CheckedOperation, Operation, VectorOperation
+from app.outcome import Failure, Outcome, classify
 
 #--------------------------------------------------------
 # Abstract Base Class: Calculation (Parent Class)
@@ -27,6 +43,15 @@ class Calculation(ABC):
 
     # Subclasses will overwrite this with the proper operator.
     operator: str = " "
+
+    # Subclasses may overwrite this with the scalar 'Operation' method they execute.
+    operation: Optional[Callable] = None
+
+    # Subclasses may overwrite this with a vectorized 'VectorOperation' kernel.
+    kernel: Optional[Callable] = None
+
+    # Subclasses may overwrite this with the exception-free 'CheckedOperation' method.
+    checked: Optional[Callable] = None
     
     def __init__(self, a: float, b: float) -> None:
         """
@@ -51,6 +76,22 @@ class Calculation(ABC):
         """
         pass    # pragma: no cover
 
+    def evaluate(self) -> Outcome:
+        """
+        Performs the calculation without raising.
+
+        Returns:
+            Outcome: The result, or a Failure with an error code and message.
+            Uses 'checked' when set, otherwise 'execute' with its exception
+            mapped to a code.
+        """
+        try:
+            if self.checked is not None:
+                return self.checked(self.a, self.b)
+            return self.execute()
+        except Exception as error:   # cases the checks do not cover, e.g. huge int operands
+            return Failure(classify(error), str(error))
+
     def __str__(self) -> str:
         """
         User-friendly string representation of the mathematical operation.
@@ -59,7 +100,15 @@ class Calculation(ABC):
             'AddCalculation: a + b': str
         """
 
-        result = self.execute()
+        return self.describe(self.execute())
+
+    def describe(self, result: Outcome) -> str:
+        """
+        Same as __str__, with a result that was already computed.
+
+        Callers that have executed the calculation (e.g. on a worker with a
+        timeout) use it to avoid executing it again.
+        """
         return f"{self.__class__.__name__}: {self.a} {self.operator} {self.b} = {result}"
     
     def __repr__(self) -> str:
@@ -71,10 +120,50 @@ class Calculation(ABC):
         """
         return f"{self.__class__.__name__}(a={self.a}, b={self.b})"
     
+#--------------------------------------------------------
+# Shared (Interned) Calculations
+#--------------------------------------------------------
+
+# Exact bit pattern of two float operands, so 0.0 and -0.0 are interned apart.
+_OPERANDS = struct.Struct("<dd")
+
+def _read_only(self, *args) -> None:
+    raise AttributeError(f"Shared {type(self).__name__} instances are immutable.")
+
+def _init_shared(self, a: float, b: float) -> None:
+    self.__dict__.update(a=a, b=b)
+
+def _reduce_shared(self):
+    # Unpickles as a plain instance of the registered class
+    return type(self).__bases__[0], (self.a, self.b)
+
+_shared_classes: Dict[Type[Calculation], Type[Calculation]] = {}
+
+def shared_class(calculation_class: Type[Calculation]) -> Type[Calculation]:
+    """
+    Returns the immutable variant of a calculation class.
+
+    It keeps the class's name, so __str__ and __repr__ are unchanged, and is a
+    subclass, so isinstance checks still hold.
+    """
+
+    shared = _shared_classes.get(calculation_class)
+    if shared is None:
+        shared = type(calculation_class.__name__, (calculation_class,), {
+            "__init__": _init_shared, "__setattr__": _read_only, "__delattr__": _read_only,
+            "__reduce__": _reduce_shared, "__module__": calculation_class.__module__,
+            "__qualname__": calculation_class.__qualname__,
+        })
+        _shared_classes[calculation_class] = shared
+    return shared
+
 #--------------------------------------------------------
 # Factory Class: CalculationFactory
 #--------------------------------------------------------
 
+class RegistryFrozenError(ValueError):
+    """Raised when registering a calculation type after the registry is frozen."""
+
 class CalculationFactory:
     """
     Stores key-value pairs into a dictionary.
@@ -84,7 +173,19 @@ class CalculationFactory:
     Defines which subclass to use based on the operator.
     """
 
-    _calculations: Dict[str, Type[Calculation]] = {}
+    # Replaced, never mutated, by registration; a read-only mapping once frozen.
+    _calculations: Mapping[str, Type[Calculation]] = {}
+
+    # Incremented on every registration so caches built from the registry can expire.
+    _version: int = 0
+
+    # Serializes registrations; lookups read '_calculations' without it.
+    _lock = threading.Lock()
+    _frozen: bool = False
+
+    # Shared instances by (calculation type, packed operands), while interning is on.
+    _interning: bool = False
+    _interned: "weakref.WeakValueDictionary[Tuple[str, bytes], Calculation]" = weakref.WeakValueDictionary()
 
     @classmethod
     def register_calculation(cls, calculation_type: str):
@@ -95,14 +196,43 @@ class CalculationFactory:
         """
 
         def decorator(subclass: Type[Calculation]) -> Type[Calculation]:
-            if calculation_type in cls._calculations:
-                raise ValueError(
-                    f"Calculation type '{calculation_type}' is already registered."
-                    )
-            cls._calculations[calculation_type] = subclass
+            with cls._lock:
+                if cls._frozen:
+                    raise RegistryFrozenError(
+                        f"Cannot register calculation type '{calculation_type}': "
+                        "the calculation registry is frozen."
+                        )
+                if calculation_type in cls._calculations:
+                    raise ValueError(
+                        f"Calculation type '{calculation_type}' is already registered."
+                        )
+                # Copy on write: concurrent lookups see the old or the new dict, never a partial one.
+                calculations: Dict[str, Type[Calculation]] = dict(cls._calculations)
+                calculations[calculation_type] = subclass
+                cls._calculations = calculations
+                cls._version += 1
             return subclass
         return decorator
 
+    @classmethod
+    def freeze(cls) -> None:
+        """
+        Makes the registry read-only, e.g. once startup registrations are done.
+
+        Later registrations raise RegistryFrozenError. Freezing twice is harmless.
+        """
+
+        with cls._lock:
+            if not cls._frozen:
+                cls._calculations = MappingProxyType(dict(cls._calculations))
+                cls._frozen = True
+
+    @classmethod
+    def is_frozen(cls) -> bool:
+        """Returns True once the registry has been frozen."""
+
+        return cls._frozen
+
     @classmethod
     def create_calculation(cls, a: float, calculation_type: str, b: float) -> Calculation:
         """
@@ -114,12 +244,74 @@ class CalculationFactory:
         calculation_class = cls._calculations.get(calculation_type)
 
         if not calculation_class:
-            available_calculations = ', '.join(cls._calculations.keys())  # +, -, *, /, **
-            raise ValueError(
-                f"Unsupported calculation type: '{calculation_type}'. Available calculation types: '{available_calculations}'"
-            )
+            raise ValueError(cls.unsupported_message(calculation_type))
+        if cls._interning and type(a) is float and type(b) is float:
+            return cls._intern(calculation_class, calculation_type, a, b)
         return calculation_class(a, b)
 
+    @classmethod
+    def _intern(cls, calculation_class: Type[Calculation], calculation_type: str,
+                a: float, b: float) -> Calculation:
+        """Returns the shared instance for a calculation, creating it on first use."""
+
+        key = (calculation_type, _OPERANDS.pack(a, b))
+        calculation = cls._interned.get(key)
+        if calculation is None or type(calculation).__bases__[0] is not calculation_class:
+            calculation = shared_class(calculation_class)(a, b)
+            cls._interned[key] = calculation
+        return calculation
+
+    @classmethod
+    def set_interning(cls, enabled: bool) -> None:
+        """
+        Turns interning on or off.
+
+        While on, 'create_calculation' returns shared, immutable instances for
+        float operands; other operands (e.g. big ints) still get a new instance.
+        """
+
+        cls._interning = enabled
+        if not enabled:
+            cls._interned.clear()
+
+    @classmethod
+    def interned_count(cls) -> int:
+        """Number of shared instances currently alive."""
+
+        return len(cls._interned)
+
+    @classmethod
+    def unsupported_message(cls, calculation_type: str) -> str:
+        """Error message for an unsupported calculation type, listing the valid ones."""
+
+        available_calculations = ', '.join(cls._calculations.keys())  # +, -, *, /, **
+        return f"Unsupported calculation type: '{calculation_type}'. Available calculation types: '{available_calculations}'"
+
+    @classmethod
+    def get_calculation_class(cls, calculation_type: str) -> Optional[Type[Calculation]]:
+        """Returns the subclass registered for a calculation type, or None."""
+
+        return cls._calculations.get(calculation_type)
+
+    @classmethod
+    def calculation_types(cls) -> Tuple[str, ...]:
+        """Returns the registered calculation types in registration order."""
+
+        return tuple(cls._calculations)
+
+    @classmethod
+    def get_kernel(cls, calculation_type: str) -> Optional[Callable]:
+        """
+        Returns the vectorized kernel registered for a calculation type.
+
+        Returns None when the calculation type is unknown or has no kernel.
+        """
+
+        calculation_class = cls._calculations.get(calculation_type)
+        if calculation_class is None:
+            return None
+        return calculation_class.kernel
+
 #--------------------------------------------------------
 # Calculation Concrete Classes (Subclasses)
 #--------------------------------------------------------
@@ -135,6 +327,9 @@ class AddCalculation(Calculation): # addition concrete/subclass
     """Performs addition operation of a + b."""
 
     operator: str = '+'
+    operation = staticmethod(Operation.addition)
+    kernel = staticmethod(VectorOperation.addition)
+    checked = staticmethod(CheckedOperation.addition)
 
     def execute(self) -> float:
         return Operation.addition(self.a, self.b)
@@ -144,6 +339,9 @@ class SubtractCalculation(Calculation): # subtraction concrete/subclass
     """Performs subtraction operation of a - b."""
 
     operator: str = '-'
+    operation = staticmethod(Operation.subtraction)
+    kernel = staticmethod(VectorOperation.subtraction)
+    checked = staticmethod(CheckedOperation.subtraction)
 
     def execute(self) -> float:
         return Operation.subtraction(self.a, self.b)
@@ -153,6 +351,9 @@ class MultiplyCalculation(Calculation): # multiplication concrete/subclass
     """Performs multiplication operation of a * b."""
 
     operator: str = '*'
+    operation = staticmethod(Operation.multiplication)
+    kernel = staticmethod(VectorOperation.multiplication)
+    checked = staticmethod(CheckedOperation.multiplication)
 
     def execute(self) -> float:
         return Operation.multiplication(self.a, self.b)
@@ -162,6 +363,9 @@ class DivideCalculation(Calculation): # division concrete/subclass
     """Performs division operation of a / b."""
 
     operator: str = '/'
+    operation = staticmethod(Operation.division)
+    kernel = staticmethod(VectorOperation.division)
+    checked = staticmethod(CheckedOperation.division)
 
     def execute(self) -> float:
         return Operation.division(self.a, self.b)
@@ -172,6 +376,9 @@ class PowerCalculation(Calculation): # power concrete/subclass
     """Performs power operation of a ** b."""
 
     operator: str = '**'
+    operation = staticmethod(Operation.power)
+    kernel = staticmethod(VectorOperation.power)
+    checked = staticmethod(CheckedOperation.power)
 
     def execute(self) -> float:
         return Operation.power(self.a, self.b)
@@ -181,6 +388,9 @@ class ModulusCalculation(Calculation): # modulus concrete/subclass
     """Performs modulus operation of a % b."""
     
     operator: str = '%'
+    operation = staticmethod(Operation.modulus)
+    kernel = staticmethod(VectorOperation.modulus)
+    checked = staticmethod(CheckedOperation.modulus)
 
     def execute(self) -> float:
         return Operation.modulus(self.a, self.b)
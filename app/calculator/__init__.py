@@ -5,19 +5,52 @@ REPL calculator that takes user input.
 
 Provides user with help and history of calculations performed during their session.
 
+Supports named variables ('x = 3 * 4') and 'ans' (the last result) as operands,
+and n-ary reductions ('sum 1 2 3', 'prod file data.csv 2').
+
+Keeps running statistics of calculation results ('stats results').
+
+Can profile itself in place ('profile start' / 'profile stop', see app.profiler)
+and report its memory use ('memory', see app.memory). 'timeit' times a
+calculation on each evaluation path (see app.timing) without adding it to the
+history.
+
+Output is buffered and can be written as JSON Lines (see app.output).
+
+Each calculation runs on a worker thread with a timeout (see app.runner): a
+runaway calculation, or one interrupted with Ctrl-C, is abandoned and the
+session continues with its history intact.
+
+With a Tracer (see app.tracing), the parse, resolve, dispatch, execute and
+output stages of each input are recorded as spans. With an AuditLog (see
+app.audit), every executed calculation is logged in the background.
+
 Provides user with exit stategies as well.
 """
 
 import sys
-from typing import List
+import time
+from typing import List, Optional, Sequence
+from app.audit import AuditLog
 from app.calculation import Calculation, CalculationFactory
+from app.history import History
+from app.memory import memory_report, stop_tracing
+from app.outcome import ErrorCode, Failure, Outcome, classify
+from app.output import OutputWriter
+from app.parser import INVALID_INPUT, parse_input, parse_tokens
+from app.profiler import SessionProfiler
+from app.runner import DEFAULT_TIMEOUT, CalculationRunner, CalculationTimeoutError
+from app.reduction import REDUCTIONS, read_column, reduce_values
+from app.timing import DEFAULT_CALLS, format_timings, time_calculation
+from app.tracing import NULL_TRACER, Tracer
+from app.variables import Definition, UndefinedVariableError, Workspace
 
 #--------------------------------------
 # Helper Functions
 #--------------------------------------
 
-def display_help() -> None:
-    """Displays help instructions for the user."""
+def display_help(out: Optional[OutputWriter] = None) -> None:
+    """Displays help instructions for the user (through 'out' when given)."""
 
     help_message = """
     REPL Calculator Help
@@ -35,9 +68,29 @@ def display_help() -> None:
         **  : First operand to the power of the second.
         %   : Remainder of first operand divided by second.
 
+    Variables:
+        <name> = <number1> <operator> <number2>
+        - Store the result in a variable. Variables and 'ans' (the last result)
+          can be used in place of numbers. Redefining a variable recomputes
+          only the variables that depend on it. 'ans', 'sum', 'prod' and
+          'timeit' cannot be used as names.
+
+    Reductions:
+        sum <number1> <number2> ...  : Adds any number of operands.
+        prod <number1> <number2> ... : Multiplies any number of operands.
+        sum file <path> [column]     : Reduces a column (starting at 1) of a text or CSV file.
+
     Special Commands:
         help    : Displays this help message.
         history : Shows the history of calculations.
+        stats results : Shows count, mean, variance, min and max of results.
+        profile start : Starts profiling this session.
+        profile stop  : Stops profiling and shows where the time went.
+        memory        : Shows memory use; starts allocation tracing on first use.
+        memory stop   : Stops allocation tracing.
+        timeit <number1> <operator> <number2> [n]
+                      : Times n calls (default 10000) of a calculation on each
+                        evaluation path, without adding it to the history.
         exit    : Exits the calculator.
 
     Examples:
@@ -47,25 +100,83 @@ def display_help() -> None:
         4 / 2
         2 ** 2
         8 % 2
+        x = 3 * 4
+        x + ans
+        sum 1 2 3 4
     """
 
-    print(help_message)
+    write = out.line if out is not None else print
+    write(help_message)
+
+def display_history(history: Sequence[Calculation], out: Optional[OutputWriter] = None) -> None:
+    """
+    Displays the history of calculations performed during the users session (through 'out' when given).
 
-def display_history(history: List[Calculation]) -> None:
-    """Displays the history of calculations performed during the users session."""
+    A History is shown with the results it stored, without executing any calculation again.
+    """
 
+    write = out.line if out is not None else print
     if not history:
-        print("No calculations performed yet.")
+        write("No calculations performed yet.")
+    elif isinstance(history, History):
+        write("Calculation History:")
+        for idx, (calculation, result) in enumerate(history.entries(), start=1):
+            write(f"{idx}. {calculation.describe(result)}")
     else:
-        print("Calculation History:")
+        write("Calculation History:")
         for idx, calculation in enumerate(history, start=1):
-            print(f"{idx}. {calculation}")
+            write(f"{idx}. {calculation}")
+
+def run_reduction(raw_tokens: List[str], workspace: Workspace) -> float:
+    """
+    Runs a reduction command: '<reduction> <operands...>' or '<reduction> file <path> [column]'.
+
+    Operands may be numbers, variables or 'ans'; file paths keep their case.
+    """
+
+    name = raw_tokens[0].lower()
+    if len(raw_tokens) > 1 and raw_tokens[1].lower() == "file":
+        if len(raw_tokens) not in (3, 4):
+            raise ValueError(f"Invalid input. Please use the format: {name} file <path> [column]")
+        column = int(raw_tokens[3]) - 1 if len(raw_tokens) == 4 else 0
+        if column < 0:
+            raise ValueError("Column numbers start at 1.")
+        return reduce_values(name, read_column(raw_tokens[2], column))
+    return reduce_values(name, (workspace.resolve(token.lower()) for token in raw_tokens[1:]))
+
+def run_timeit(raw_tokens: List[str], workspace: Workspace, runner: CalculationRunner) -> str:
+    """
+    Runs 'timeit <number1> <operator> <number2> [n]' on a worker and returns the report.
+
+    Operands may be numbers, variables or 'ans'. The runner's timeout applies
+    to the whole measurement.
+    """
+
+    operands = raw_tokens[1:]
+    if len(operands) not in (3, 4):
+        raise ValueError("Invalid input. Please use the format: timeit <number1> <operator> <number2> [n]")
+    calls = DEFAULT_CALLS
+    if len(operands) == 4:
+        try:
+            calls = int(operands[3])
+        except ValueError:
+            raise ValueError("The number of calls must be a whole number.") from None
+    expression = " ".join(operands[:3])
+    parsed = parse_input(expression)
+    if parsed.error is not None:
+        raise ValueError(parsed.message)
+    a, b = workspace.resolve(parsed.a), workspace.resolve(parsed.b)
+    return format_timings(expression, runner.call(
+        lambda: time_calculation(a, parsed.operator, b, calls)))
 
 #--------------------------------------
 # REPL Calculator Main Function
 #--------------------------------------
 
-def calculator() -> None:
+def calculator(output: Optional[OutputWriter] = None,
+               timeout: Optional[float] = DEFAULT_TIMEOUT,
+               tracer: Optional[Tracer] = None,
+               audit: Optional[AuditLog] = None) -> None:
     """
     REPL calculator that performs:
      - Addition
@@ -74,16 +185,61 @@ def calculator() -> None:
      - Division
      - Power
      - Modulus
+
+    Output goes through 'output' (a buffered plain-text OutputWriter by
+    default), so piped sessions are not bound by one write call per line.
+
+    Each calculation is abandoned after 'timeout' seconds (None: no limit).
+
+    With a 'tracer', each stage of handling an input is recorded as a span.
+
+    With an 'audit' log, every executed calculation is recorded with its
+    result or error and its latency.
     """
 
-    history: List[Calculation] = []
+    out = output if output is not None else OutputWriter()
+    trace = tracer if tracer is not None else NULL_TRACER
+    runner = CalculationRunner(timeout)
+    profiler = SessionProfiler()
+    tracing_memory = False     # whether 'memory' started tracemalloc
+
+    def end_session() -> None:
+        """Stops the workers, the profiler and allocation tracing before exiting."""
+        runner.close()
+        profiler.cancel()
+        if tracing_memory:
+            stop_tracing()
+    def recompute(calculation: Calculation) -> float:
+        """Executes and audits a dependent variable's calculation on a worker, like any other calculation."""
+        outcome: Outcome = None
+        started = time.perf_counter()
+        try:
+            result = outcome = runner.run(calculation)
+            return result
+        except CalculationTimeoutError as te:
+            outcome = Failure(ErrorCode.TIMEOUT, str(te))
+            raise
+        except KeyboardInterrupt:
+            outcome = Failure(ErrorCode.INTERRUPTED, "Calculation interrupted and abandoned.")
+            raise InterruptedError(outcome.message) from None
+        except Exception as e:
+            outcome = Failure(classify(e), str(e))
+            raise
+        finally:
+            if audit is not None:
+                audit.record(calculation, outcome, time.perf_counter() - started)
+
+    history: History = History()
+    workspace = Workspace(recompute)
 
-    print("Welcome to the REPL calculator!")
-    print("Type 'help' for instructions or 'exit' to quit")
+    out.line("Welcome to the REPL calculator!")
+    out.line("Type 'help' for instructions or 'exit' to quit")
 
     while True:
         try:
-            user_input: str = input(">> ").strip().lower()
+            with profiler.paused():
+                raw_input: str = out.read_input(">> ").strip()
+            user_input: str = raw_input.lower()
 
             # If empty, prompt user to enter the calculation again.
             if not user_input:
@@ -91,64 +247,182 @@ def calculator() -> None:
 
             # If the user needs help, they can type 'help'.
             elif user_input == "help":
-                display_help()
+                display_help(out)
                 continue       # prompt user to try again
 
             # If the user wants to see their calculation history, they can type 'history'.
             elif user_input == "history":
-                display_history(history) 
+                display_history(history, out)
+                continue
+
+            # If the user wants statistics of their results, they can type 'stats results'.
+            elif user_input == "stats results":
+                out.line(history.stats.summary())
+                continue
+
+            # If the user wants to profile the session, they can type 'profile start' and 'profile stop'.
+            elif user_input in ("profile start", "profile stop"):
+                try:
+                    if user_input == "profile start":
+                        profiler.start()
+                        out.line("Profiling started. Type 'profile stop' to see the report.")
+                    else:
+                        out.line(profiler.stop())
+                except ValueError as ve:
+                    out.line(ve)
+                continue
+
+            # If the user wants to see memory use, they can type 'memory' (and 'memory stop').
+            elif user_input == "memory":
+                out.line(memory_report(history))
+                tracing_memory = True
+                continue
+            elif user_input == "memory stop":
+                tracing_memory = False
+                out.line("Allocation tracing stopped." if stop_tracing()
+                         else "Allocation tracing is not running.")
                 continue
 
             # If the user wants to exit, they can type 'exit'.
             if user_input == "exit":
-                print("Exiting REPL calculator. Goodbye!")
+                out.line("Exiting REPL calculator. Goodbye!")
+                out.flush()
+                end_session()
                 sys.exit(0)    # pragma: no cover
 
-            # Parsing input
+            # Timing a calculation does not add it to the history
+            tokens = user_input.split()
+            # An assignment to a command word is left to the parser, which rejects the name
+            command = tokens[0] if len(tokens) < 2 or tokens[1] != "=" else None
+            if command == "timeit":
+                try:
+                    out.line(run_timeit(tokens, workspace, runner))
+                except (ValueError, CalculationTimeoutError) as error:
+                    out.line(error)
+                    out.line("Type 'help' for more information.")
+                except KeyboardInterrupt:
+                    out.line("Timing interrupted and abandoned.")
+                continue
+
+            # N-ary reductions do not create a Calculation per operand
+            if command in REDUCTIONS:
+                try:
+                    with trace.span("reduction", operator=command):
+                        result = run_reduction(raw_input.split(), workspace)
+                except (ValueError, OSError) as error:
+                    out.line(error)
+                    out.line("Type 'help' for more information.")
+                    continue   # prompt user to try again
+                workspace.ans = result
+                out.result(result, result, command)
+                continue
+
+            # Parsing input, with an optional '<name> =' assignment prefix
+            with trace.span("parse"):
+                name, a, operator, b, error, message = parse_tokens(tokens)
+            if error == INVALID_INPUT:
+                out.line(message)
+                out.line("Type 'help' for more information.")
+                continue       # prompt user to try again
+            elif error is not None:
+                out.line(message)
+                out.line("Type 'help' for a list of supported operations.")
+                continue       # prompt user to try again
             try:
-                num1_str, operator, num2_str = user_input.split()
-                num1: float = float(num1_str)
-                num2: float = float(num2_str)
-            except ValueError:
-                print("Invalid input. Please use the format: <number1> <operator> <number2>")
-                print("Type 'help' for more information.")
+                # Numbers are parsed already; only names are looked up
+                with trace.span("resolve"):
+                    num1: float = a if type(a) is float else workspace.resolve(a)
+                    num2: float = b if type(b) is float else workspace.resolve(b)
+            except UndefinedVariableError as ue:
+                out.line(ue)
+                out.line("Invalid input. Please ensure numbers are valid.")
                 continue       # prompt user to try again
 
             # Attempt to create calculation instance
             try:
-                calculation = CalculationFactory.create_calculation(num1, operator, num2)
+                with trace.span("dispatch", operator=operator):
+                    calculation = CalculationFactory.create_calculation(num1, operator, num2)
             except ValueError as ve:
-                print(ve)
-                print("Type 'help' for a list of supported operations.")
+                out.line(ve)
+                out.line("Type 'help' for a list of supported operations.")
                 continue       # prompt user to try again
 
-            # Attempt to execute calculation
+            # Attempt to execute calculation on a worker, within the timeout
+            outcome: Outcome = None
+            started = time.perf_counter()
             try:
-                result = calculation.execute()
+                with trace.span("execute", operator=operator):
+                    if profiler.active:
+                        result = outcome = runner.call(profiler.wrap(calculation.execute))
+                    else:
+                        result = outcome = runner.run(calculation)
+            # Runaway calculation, abandoned in the background
+            except CalculationTimeoutError as te:
+                outcome = Failure(ErrorCode.TIMEOUT, str(te))
+                out.line(te)
+                out.line("Please try smaller operands.")
+                continue       # prompt user to try again
+            # Ctrl-C while waiting abandons only this calculation
+            except KeyboardInterrupt:
+                outcome = Failure(ErrorCode.INTERRUPTED, "Calculation interrupted and abandoned.")
+                out.line(outcome.message)
+                continue       # prompt user to try again
             # Division by zero error
             except ZeroDivisionError as ze:
-                print(ze)
-                print("Please enter a non-zero divisor.")
+                outcome = Failure(ErrorCode.DIVIDE_BY_ZERO, str(ze))
+                out.line(ze)
+                out.line("Please enter a non-zero divisor.")
                 continue       # prompt user to try again
             # Handle any unforseen errors
             except Exception as e:
-                print(f"An error occurred during calculation: {e}")
-                print("Please try again.")
+                outcome = Failure(classify(e), str(e))
+                out.line(f"An error occurred during calculation: {e}")
+                out.line("Please try again.")
                 continue       # prompt user to try again
-
-            # Print the calculation result string
-            result_str: str = f"{calculation}"
-            print(f"Result: {result_str}")
+            # Every executed calculation is audited, whatever its outcome
+            finally:
+                if audit is not None:
+                    audit.record(calculation, outcome, time.perf_counter() - started)
+
+            # Bind the result to a variable and recompute its dependents
+            updates = []
+            if name is None:
+                workspace.ans = result
+            else:
+                try:
+                    definition = Definition(str(a), operator, str(b))
+                    updates = workspace.bind(name, definition, calculation, result)
+                except ValueError as ve:
+                    out.line(ve)
+                    out.line("Type 'help' for more information.")
+                    continue   # prompt user to try again
+
+            # Write the calculation result string
+            with trace.span("output"):
+                out.result(calculation, result, name)
 
             # Append the calculation to the history list
-            history.append(calculation)
+            history.append(calculation, result)
+
+            # Report recomputed variables, which are new calculations as well
+            for update in updates:
+                if update.error is not None:
+                    out.line(f"Updated: {update.name} could not be recomputed: {update.error}")
+                else:
+                    value = workspace.values[update.name]
+                    out.line(f"Updated: {update.name} = {update.calculation.describe(value)}")
+                    history.append(update.calculation, value)
 
         except KeyboardInterrupt:
-            print("Keyboard interupt detected. Exiting calculator. Goodbye!")
+            out.line("Keyboard interupt detected. Exiting calculator. Goodbye!")
+            out.flush()
+            end_session()
             sys.exit(0)        # pragma: no cover
 
         except EOFError:
-            print("EOF detected. Exiting calculator. Goodbye!")
+            out.line("EOF detected. Exiting calculator. Goodbye!")
+            out.flush()
+            end_session()
             sys.exit(0)        # pragma: no cover
 
 # If this script is ran directly, start the calculator REPL.
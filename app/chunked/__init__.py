@@ -0,0 +1,163 @@
+"""
+app/chunked.py
+
+Chunked evaluation of expressions over arrays.
+
+Applying 'a * b + c % d' naively to N-element arrays allocates an N-element
+temporary per operator. 'evaluate_arrays' instead walks the arrays in chunks
+of 'chunk_size' elements: every operator writes into a chunk-sized scratch
+buffer that is reused for the next chunk, and the root operator writes
+straight into the output. Operators overwrite the scratch buffer of one of
+their operands, so only a few buffers are live at once. Peak memory is the
+output plus those chunk-sized buffers, independent of N.
+
+Operators are applied with the vectorized 'VectorOperation' kernels; operators
+registered without a kernel are applied element-wise with their scalar function.
+"""
+
+from array import array
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Union
+from app.calculation import CalculationFactory
+from app.expression import BinaryOp, Node, Number, Variable, parse, scalar_function
+from app.operation import VectorOperation
+from app.variables import UndefinedVariableError
+
+# Elements per chunk: 8192 float64 values (64 KiB) per scratch buffer.
+CHUNK_SIZE = 8192
+
+#--------------------------------------
+# Helper Functions
+#--------------------------------------
+
+def _view(values: Sequence[float]) -> Sequence[float]:
+    """Returns a zero-copy view of buffer-backed sequences (array, mmap, ...)."""
+    try:
+        return memoryview(values)
+    except TypeError:
+        return values
+
+def _kernel(calculation_type: str) -> Callable:
+    """Returns the vectorized kernel of an operator, or an element-wise fallback."""
+
+    kernel = CalculationFactory.get_kernel(calculation_type)
+    if kernel is not None:
+        return kernel
+    function = scalar_function(calculation_type)
+    return lambda a, b, out=None: VectorOperation._apply(function, a, b, out)
+
+class _ChunkEvaluator:
+    """Evaluates an expression tree chunk by chunk with a pool of scratch buffers."""
+
+    def __init__(self, columns: Dict[str, Sequence[float]], chunk_size: int) -> None:
+        self.columns = columns
+        self.chunk_size = chunk_size
+        self.kernels: Dict[str, Callable] = {}
+        self.constants: Dict[float, array] = {}
+        self.free: List[array] = []
+        self.allocated = 0
+
+    def kernel(self, calculation_type: str) -> Callable:
+        if calculation_type not in self.kernels:
+            self.kernels[calculation_type] = _kernel(calculation_type)
+        return self.kernels[calculation_type]
+
+    def _acquire(self) -> array:
+        if self.free:
+            return self.free.pop()
+        self.allocated += 1
+        return array('d', [0.0]) * self.chunk_size
+
+    def operand(self, node: Node, start: int, stop: int):
+        """Returns (values, scratch buffer to release or None) for a node over one chunk."""
+
+        size = stop - start
+        if isinstance(node, Number):
+            constant = self.constants.get(node.value)
+            if constant is None:
+                constant = self.constants[node.value] = array('d', [node.value]) * self.chunk_size
+            return memoryview(constant)[:size], None
+        if isinstance(node, Variable):
+            return self.columns[node.name][start:stop], None
+        left, left_buffer = self.operand(node.left, start, stop)
+        right, right_buffer = self.operand(node.right, start, stop)
+        # Write over an operand's scratch buffer: kernels read all input before writing.
+        buffer = left_buffer or right_buffer or self._acquire()
+        if left_buffer is not None and right_buffer is not None:
+            self.free.append(right_buffer)
+        values = memoryview(buffer)[:size]
+        self.kernel(node.operator)(left, right, values)
+        return values, buffer
+
+    def apply(self, node: BinaryOp, start: int, stop: int, out) -> None:
+        """Evaluates an operator node over one chunk into 'out'."""
+
+        left, left_buffer = self.operand(node.left, start, stop)
+        right, right_buffer = self.operand(node.right, start, stop)
+        self.kernel(node.operator)(left, right, out)
+        for buffer in (left_buffer, right_buffer):
+            if buffer is not None:
+                self.free.append(buffer)
+
+#--------------------------------------
+# Chunked Evaluation
+#--------------------------------------
+
+def evaluate_arrays(
+    expression: Union[str, Node],
+    arrays: Mapping[str, Sequence[float]],
+    chunk_size: int = CHUNK_SIZE,
+    out: Optional[array] = None,
+) -> array:
+    """
+    Evaluates an expression element-wise over equal-length arrays.
+
+    Args:
+        expression: Expression text or a parsed expression tree.
+        arrays: Variable name -> operand values (list, array.array, memoryview, ...).
+        chunk_size: Elements processed per chunk.
+        out: Optional float64 array of the same length to write the results into.
+
+    Returns:
+        array: float64 results.
+
+    Raises:
+        ValueError: Malformed expression, unsupported operator or mismatched lengths.
+        UndefinedVariableError: A variable of the expression has no array.
+        ZeroDivisionError: A division or modulus has a zero divisor.
+    """
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+    tree = parse(expression) if isinstance(expression, str) else expression
+
+    columns: Dict[str, Sequence[float]] = {}
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, BinaryOp):
+            stack.extend((node.left, node.right))
+        elif isinstance(node, Variable) and node.name not in columns:
+            if node.name not in arrays:
+                raise UndefinedVariableError(f"Undefined variable: '{node.name}'.")
+            columns[node.name] = _view(arrays[node.name])
+
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"Array length mismatch: {sorted(lengths)}.")
+    length = lengths.pop() if lengths else (len(out) if out is not None else 1)
+
+    if out is None:
+        out = array('d', [0.0]) * length
+    elif len(out) != length:
+        raise ValueError(f"Output length mismatch: {len(out)} != {length}.")
+    result = memoryview(out)
+
+    evaluator = _ChunkEvaluator(columns, min(chunk_size, max(length, 1)))
+    for start in range(0, length, evaluator.chunk_size):
+        stop = min(start + evaluator.chunk_size, length)
+        if isinstance(tree, BinaryOp):
+            evaluator.apply(tree, start, stop, result[start:stop])
+        else:
+            values, _ = evaluator.operand(tree, start, stop)
+            result[start:stop] = array('d', values)
+    return out
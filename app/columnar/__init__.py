@@ -0,0 +1,190 @@
+"""
+app/columnar.py
+
+Binary columnar batch input evaluated through memory-mapped files.
+
+A batch is stored as three column files of equal row count:
+    - a:  operand 'a' per row, native float64 ('d') or int64 ('q') values.
+    - b:  operand 'b' per row, float64 or int64 values.
+    - op: one operator code byte per row (see OPERATOR_CODES).
+
+'evaluate_columns' memory-maps the inputs and a float64 output file and feeds
+zero-copy memoryview slices of each run of rows sharing an operator straight to
+that operator's vectorized kernel, which writes into the mapped output. Rows
+that cannot be computed (e.g. a zero divisor) get NaN and are counted per
+error code, using the exception-free 'CheckedOperation' checks.
+"""
+
+import math
+import mmap
+import re
+from array import array
+from contextlib import ExitStack
+from typing import Callable, Dict, Iterable, List, NamedTuple, Tuple
+from app.calculation import CalculationFactory
+from app.outcome import ErrorCode, ErrorCounts, Failure, Outcome
+
+# Operator code byte -> calculation type
+OPERATOR_CODES: Dict[int, str] = {0: '+', 1: '-', 2: '*', 3: '/', 4: '**', 5: '%'}
+
+# Matches each run of identical operator bytes.
+_RUNS = re.compile(rb"(.)\1*", re.DOTALL)
+
+class ColumnarReport(NamedTuple):
+    """Summary of a columnar evaluation."""
+
+    rows: int
+    vectorized: int    # rows computed by a kernel over a whole run
+    errors: int        # rows written as NaN
+    error_codes: ErrorCounts
+
+#--------------------------------------
+# Writing Columns
+#--------------------------------------
+
+def encode_operators(operators: Iterable[str]) -> bytes:
+    """
+    Encodes calculation types as operator code bytes.
+
+    Raises:
+        ValueError: If an operator has no code.
+    """
+
+    codes = {operator: code for code, operator in OPERATOR_CODES.items()}
+    try:
+        return bytes(codes[operator] for operator in operators)
+    except KeyError as error:
+        raise ValueError(f"No operator code for calculation type: '{error.args[0]}'.") from None
+
+def write_columns(
+    a_path: str,
+    b_path: str,
+    op_path: str,
+    records: Iterable[Tuple[float, str, float]],
+    typecodes: Tuple[str, str] = ('d', 'd'),
+) -> int:
+    """
+    Writes '(a, operator, b)' records as column files.
+
+    Returns:
+        int: Number of rows written.
+
+    Raises:
+        ValueError: If an operator has no code.
+    """
+
+    a_values, b_values, operators = array(typecodes[0]), array(typecodes[1]), []
+    for a, operator, b in records:
+        a_values.append(a)
+        b_values.append(b)
+        operators.append(operator)
+    op_values = encode_operators(operators)
+    for path, data in ((a_path, a_values), (b_path, b_values), (op_path, op_values)):
+        with open(path, "wb") as file:
+            file.write(data)
+    return len(op_values)
+
+#--------------------------------------
+# Evaluating Columns
+#--------------------------------------
+
+def _size(path: str) -> int:
+    with open(path, "rb") as file:
+        return file.seek(0, 2)
+
+def _map(stack: ExitStack, path: str, access: int) -> mmap.mmap:
+    with open(path, "r+b" if access == mmap.ACCESS_WRITE else "rb") as file:
+        return stack.enter_context(mmap.mmap(file.fileno(), 0, access=access))
+
+def _checked(operator: str) -> Callable[[float, float], Outcome]:
+    """Returns the exception-free scalar function of a calculation type."""
+    calculation_class = CalculationFactory.get_calculation_class(operator)
+    if calculation_class.checked is not None:
+        return calculation_class.checked
+    return lambda a, b: calculation_class(a, b).evaluate()
+
+def _evaluate_rows(operator: str, a, b, out) -> ErrorCounts:
+    """Evaluates a run row by row, writing NaN for failing rows; returns the error counts."""
+
+    checked = _checked(operator)
+    counts = ErrorCounts()
+    for index, (x, y) in enumerate(zip(a, b)):
+        outcome = checked(x, y)
+        if type(outcome) is Failure:
+            counts[outcome.code] += 1
+            out[index] = math.nan
+            continue
+        try:
+            out[index] = outcome
+        except (OverflowError, ValueError):   # an exact int64 power too large for float64
+            counts[ErrorCode.OVERFLOW] += 1
+            out[index] = math.nan
+    return counts
+
+def evaluate_runs(ops, a, b, out, offset: int = 0) -> Tuple[int, ErrorCounts]:
+    """
+    Evaluates rows given as operator codes and operand views into 'out'.
+
+    Each run of rows sharing an operator goes to that operator's kernel as
+    zero-copy slices. 'offset' is the row number of the first row, for errors.
+
+    Returns:
+        Tuple[int, ErrorCounts]: Rows computed by kernels, and the rows
+        written as NaN per error code.
+
+    Raises:
+        ValueError: If an operator code is unknown.
+    """
+
+    vectorized = 0
+    errors = ErrorCounts()
+    for run in _RUNS.finditer(ops):
+        start, stop = run.span()
+        code = run.group(1)[0]
+        operator = OPERATOR_CODES.get(code)
+        if operator is None:
+            raise ValueError(f"Row {offset + start}: unknown operator code {code}.")
+        kernel = CalculationFactory.get_kernel(operator)
+        if kernel is not None:
+            try:
+                kernel(a[start:stop], b[start:stop], out[start:stop])
+                vectorized += stop - start
+                continue
+            except (ArithmeticError, TypeError):
+                pass   # e.g. a zero divisor in the run: fall back to row by row
+        errors.update(_evaluate_rows(operator, a[start:stop], b[start:stop], out[start:stop]))
+    return vectorized, errors
+
+def evaluate_columns(
+    a_path: str,
+    b_path: str,
+    op_path: str,
+    out_path: str,
+    typecodes: Tuple[str, str] = ('d', 'd'),
+) -> ColumnarReport:
+    """
+    Evaluates a columnar batch into a float64 output file at 'out_path'.
+
+    Raises:
+        ValueError: Mismatched column lengths or an unknown operator code.
+    """
+
+    with ExitStack() as stack:
+        ops = _map(stack, op_path, mmap.ACCESS_READ) if _size(op_path) else b""
+        rows = len(ops)
+        with open(out_path, "wb") as file:
+            file.truncate(8 * rows)
+        if rows == 0:
+            return ColumnarReport(0, 0, 0, ErrorCounts())
+
+        views: List[memoryview] = []
+        for path, typecode in ((a_path, typecodes[0]), (b_path, typecodes[1])):
+            view = stack.enter_context(memoryview(_map(stack, path, mmap.ACCESS_READ)).cast(typecode))
+            if len(view) != rows:
+                raise ValueError(f"Column length mismatch: {path} has {len(view)} rows, expected {rows}.")
+            views.append(view)
+        a, b = views
+        out = stack.enter_context(memoryview(_map(stack, out_path, mmap.ACCESS_WRITE)).cast('d'))
+
+        vectorized, errors = evaluate_runs(ops, a, b, out)
+        return ColumnarReport(rows, vectorized, errors.errors, errors)
@@ -0,0 +1,154 @@
+"""
+app/csvmode.py
+
+Column-wise evaluation of an expression over the rows of a CSV file.
+
+The CSV is read in streaming chunks of rows. Operand columns are named in the
+expression ('colA / colB', '(price - cost) * qty'), each chunk is evaluated
+column-wise with the vectorized kernels, and the result column is appended to
+every output row. Rows that cannot be computed get an error marker instead of
+aborting the run:
+    - #DIV/0! : A division or modulus by zero.
+    - #VALUE! : An operand cell that is not a number.
+    - #ERROR! : Any other calculation error.
+
+Usage:
+    python -m app.csvmode <input.csv> "<expression>" [-o output.csv] [--column result]
+"""
+
+import argparse
+import csv
+import sys
+from array import array
+from typing import List, NamedTuple, Optional, TextIO
+from app.chunked import evaluate_arrays
+from app.expression import compile_expression, parse, variables_of
+from app.reduction import chunked
+from app.variables import UndefinedVariableError
+
+# Rows evaluated per chunk.
+CHUNK_SIZE = 4096
+
+DIV_ZERO_MARKER = "#DIV/0!"
+VALUE_MARKER = "#VALUE!"
+ERROR_MARKER = "#ERROR!"
+
+class CsvReport(NamedTuple):
+    """Summary of a CSV evaluation."""
+
+    rows: int
+    errors: int
+
+#--------------------------------------
+# Helper Functions
+#--------------------------------------
+
+def _marker(error: Exception) -> str:
+    """Returns the error marker written for a failed row."""
+    if isinstance(error, ZeroDivisionError):
+        return DIV_ZERO_MARKER
+    return ERROR_MARKER
+
+def _evaluate_chunk(source: str, names: List[str], operands: List[List[float]]) -> List[str]:
+    """Evaluates one chunk column-wise, falling back to row by row if the kernels raise."""
+
+    count = len(operands)
+    columns = {name: [row[index] for row in operands] for index, name in enumerate(names)}
+    try:
+        results = evaluate_arrays(source, columns, out=array('d', [0.0]) * count)
+        return [str(value) for value in results]
+    except (ArithmeticError, TypeError, ValueError):
+        pass   # e.g. a zero divisor in the chunk: mark only the failing rows
+
+    compiled = compile_expression(source)
+    rendered: List[str] = []
+    for row in operands:
+        try:
+            value = compiled(**dict(zip(names, row)))
+        except (ArithmeticError, TypeError, ValueError) as error:
+            rendered.append(_marker(error))
+        else:
+            rendered.append(ERROR_MARKER if isinstance(value, complex) else str(value))
+    return rendered
+
+#--------------------------------------
+# CSV Evaluation
+#--------------------------------------
+
+def evaluate_csv(
+    source: TextIO,
+    target: TextIO,
+    expression: str,
+    result_column: str = "result",
+    chunk_size: int = CHUNK_SIZE,
+) -> CsvReport:
+    """
+    Streams rows from 'source' to 'target', appending the expression's result column.
+
+    Raises:
+        ValueError: Empty input or a malformed expression.
+        UndefinedVariableError: The expression names a column that does not exist.
+    """
+
+    reader = csv.reader(source)
+    writer = csv.writer(target, lineterminator="\n")
+    header = next(reader, None)
+    if header is None:
+        raise ValueError("The CSV input is empty.")
+
+    names = list(variables_of(parse(expression)))
+    for name in names:
+        if name not in header:
+            raise UndefinedVariableError(f"Undefined column: '{name}'.")
+    indices = [header.index(name) for name in names]
+    writer.writerow(header + [result_column])
+
+    rows = errors = 0
+    for chunk in chunked(reader, chunk_size):
+        # Parse operand cells; rows with a non-numeric cell are marked and skipped.
+        operands: List[List[float]] = []
+        valid: List[bool] = []
+        for row in chunk:
+            try:
+                operands.append([float(row[index]) for index in indices])
+                valid.append(True)
+            except (IndexError, ValueError):
+                valid.append(False)
+
+        results = iter(_evaluate_chunk(expression, names, operands) if operands else ())
+        for row, ok in zip(chunk, valid):
+            value = next(results) if ok else VALUE_MARKER
+            if value.startswith("#"):
+                errors += 1
+            writer.writerow(row + [value])
+        rows += len(chunk)
+    return CsvReport(rows, errors)
+
+#--------------------------------------
+# Command Line
+#--------------------------------------
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Runs CSV mode from the command line; returns the exit status."""
+
+    parser = argparse.ArgumentParser(prog="python -m app.csvmode",
+                                     description="Evaluate an expression over the columns of a CSV file.")
+    parser.add_argument("input", help="input CSV file with a header row")
+    parser.add_argument("expression", help="expression over column names, e.g. 'colA / colB'")
+    parser.add_argument("-o", "--output", help="output CSV file (default: standard output)")
+    parser.add_argument("--column", default="result", help="name of the appended result column")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="rows evaluated per chunk")
+    args = parser.parse_args(argv)
+
+    try:
+        with open(args.input, newline="", encoding="utf-8") as source:
+            if args.output:
+                with open(args.output, "w", newline="", encoding="utf-8") as target:
+                    report = evaluate_csv(source, target, args.expression, args.column, args.chunk_size)
+            else:
+                report = evaluate_csv(source, sys.stdout, args.expression, args.column, args.chunk_size)
+    except (OSError, ValueError) as error:
+        print(error, file=sys.stderr)
+        return 1
+    print(f"{report.rows} rows evaluated, {report.errors} errors.", file=sys.stderr)
+    return 0
@@ -0,0 +1,10 @@
+"""
+app/csvmode/__main__.py
+
+Runs CSV mode: python -m app.csvmode <input.csv> "<expression>"
+"""
+
+import sys
+from app.csvmode import main
+
+sys.exit(main())               # pragma: no cover
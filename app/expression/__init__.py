@@ -0,0 +1,279 @@
+"""
+app/expression.py
+
+Infix expressions over the operators registered with CalculationFactory.
+
+Provides:
+    - parse: Parses text such as '(x + 2) * y ** 2' into an expression tree.
+    - evaluate: Tree-walking evaluation, one Calculation per operator node.
+    - compile_expression: Compiles an expression into a cached Python function.
+
+Operator precedence (lowest to highest): '+' '-', then '*' '/' '%' and any other
+registered operator, then '**' (right-associative). Parentheses group.
+Negative number literals are written with a leading '-' ('2 * -3').
+"""
+
+import ast
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple, Union
+from app.calculation import CalculationFactory
+from app.operation import Operation
+from app.variables import UndefinedVariableError
+
+PRECEDENCE: Dict[str, int] = {'+': 1, '-': 1, '*': 2, '/': 2, '%': 2, '**': 3}
+DEFAULT_PRECEDENCE = 2
+RIGHT_ASSOCIATIVE = {'**'}
+
+#--------------------------------------
+# Expression Tree
+#--------------------------------------
+
+class Number(NamedTuple):
+    """A numeric literal."""
+
+    value: float
+
+class Variable(NamedTuple):
+    """A named operand supplied at evaluation time."""
+
+    name: str
+
+class BinaryOp(NamedTuple):
+    """A registered operator applied to two sub-expressions."""
+
+    operator: str
+    left: "Node"
+    right: "Node"
+
+Node = Union[Number, Variable, BinaryOp]
+
+#--------------------------------------
+# Tokenizer and Parser
+#--------------------------------------
+
+_NUMBER = r"(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?"
+
+@lru_cache(maxsize=8)
+def _token_pattern(operators: Tuple[str, ...]) -> "re.Pattern[str]":
+    """Builds the tokenizer for a set of registered operators (longest operator first)."""
+
+    symbols = sorted((op for op in operators if not op.isidentifier()), key=len, reverse=True)
+    alternatives = [rf"(?P<number>{_NUMBER})", r"(?P<name>[A-Za-z_]\w*)", r"(?P<paren>[()])"]
+    if symbols:
+        alternatives.append("(?P<operator>" + "|".join(map(re.escape, symbols)) + ")")
+    return re.compile(r"\s*(?:" + "|".join(alternatives) + ")")
+
+def tokenize(source: str) -> List[Tuple[str, str]]:
+    """
+    Splits an expression into (kind, text) tokens.
+
+    Raises:
+        ValueError: If the expression contains an unknown character or operator.
+    """
+
+    operators = CalculationFactory.calculation_types()
+    pattern = _token_pattern(operators)
+    tokens: List[Tuple[str, str]] = []
+    position = 0
+    source = source.rstrip()
+    while position < len(source):
+        match = pattern.match(source, position)
+        if match is None:
+            raise ValueError(f"Invalid expression: unexpected '{source[position:].strip()}'.")
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == "name" and text in operators:
+            kind = "operator"
+        tokens.append((kind, text))
+        position = match.end()
+    return tokens
+
+class _Parser:
+    """Precedence-climbing parser over a token list."""
+
+    def __init__(self, tokens: List[Tuple[str, str]]) -> None:
+        self.tokens = tokens
+        self.position = 0
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _next(self) -> Tuple[str, str]:
+        token = self._peek()
+        if token is None:
+            raise ValueError("Invalid expression: unexpected end of input.")
+        self.position += 1
+        return token
+
+    def parse(self) -> Node:
+        node = self._expression(1)
+        token = self._peek()
+        if token is not None:
+            raise ValueError(f"Invalid expression: unexpected '{token[1]}'.")
+        return node
+
+    def _expression(self, min_precedence: int) -> Node:
+        left = self._primary()
+        while True:
+            token = self._peek()
+            if token is None or token[0] != "operator":
+                return left
+            precedence = PRECEDENCE.get(token[1], DEFAULT_PRECEDENCE)
+            if precedence < min_precedence:
+                return left
+            self.position += 1
+            next_min = precedence if token[1] in RIGHT_ASSOCIATIVE else precedence + 1
+            left = BinaryOp(token[1], left, self._expression(next_min))
+
+    def _primary(self) -> Node:
+        kind, text = self._next()
+        if kind == "number":
+            return Number(float(text))
+        if kind == "name":
+            return Variable(text)
+        if text == "(":
+            node = self._expression(1)
+            if self._next() != ("paren", ")"):
+                raise ValueError("Invalid expression: expected ')'.")
+            return node
+        if text == "-" and self._peek() is not None and self._peek()[0] == "number":
+            return Number(-float(self._next()[1]))
+        raise ValueError(f"Invalid expression: unexpected '{text}'.")
+
+def parse(source: str) -> Node:
+    """
+    Parses an infix expression into an expression tree.
+
+    Raises:
+        ValueError: If the expression is malformed.
+    """
+
+    return _Parser(tokenize(source)).parse()
+
+def variables_of(node: Node) -> Tuple[str, ...]:
+    """Returns the sorted names of the variables used by an expression."""
+
+    names = set()
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Variable):
+            names.add(node.name)
+        elif isinstance(node, BinaryOp):
+            stack.extend((node.left, node.right))
+    return tuple(sorted(names))
+
+#--------------------------------------
+# Tree-Walking Evaluation
+#--------------------------------------
+
+def evaluate(node: Node, variables: Optional[Mapping[str, float]] = None) -> float:
+    """
+    Evaluates an expression tree, creating and executing one Calculation per operator.
+
+    Raises:
+        UndefinedVariableError: If a variable has no value.
+        ZeroDivisionError: If a division or modulus has a zero divisor.
+    """
+
+    if isinstance(node, Number):
+        return node.value
+    if isinstance(node, Variable):
+        try:
+            return (variables or {})[node.name]
+        except KeyError:
+            raise UndefinedVariableError(f"Undefined variable: '{node.name}'.") from None
+    left = evaluate(node.left, variables)
+    right = evaluate(node.right, variables)
+    return CalculationFactory.create_calculation(left, node.operator, right).execute()
+
+#--------------------------------------
+# Compilation
+#--------------------------------------
+
+# Operation methods that are exactly a Python binary operator.
+_NATIVE_OPERATORS = {
+    Operation.addition: ast.Add,
+    Operation.subtraction: ast.Sub,
+    Operation.multiplication: ast.Mult,
+    Operation.power: ast.Pow,
+}
+
+def scalar_function(calculation_type: str) -> Callable[[float, float], float]:
+    """Returns a function computing one calculation type without creating a Calculation."""
+
+    calculation_class = CalculationFactory.get_calculation_class(calculation_type)
+    if calculation_class is None:
+        # Raises the factory's "Unsupported calculation type" error.
+        CalculationFactory.create_calculation(0.0, calculation_type, 0.0)
+    if calculation_class.operation is not None:
+        return calculation_class.operation
+    return lambda a, b: calculation_class(a, b).execute()
+
+class CompiledExpression:
+    """
+    An expression compiled to a Python function.
+
+    Call with variable values as keyword arguments: 'compiled(x=2.0, y=3.0)'.
+    """
+
+    def __init__(self, source: str, tree: Node) -> None:
+        self.source = source
+        self.tree = tree
+        self.variables: Tuple[str, ...] = variables_of(tree)
+        self.function: Callable[..., float] = self._compile()
+
+    def _compile(self) -> Callable[..., float]:
+        """Generates a lambda over positional variables via 'ast' and 'compile'."""
+
+        parameters = {name: f"_v{index}" for index, name in enumerate(self.variables)}
+        namespace: Dict[str, Callable] = {}
+        functions: Dict[str, str] = {}
+
+        def build(node: Node) -> ast.expr:
+            if isinstance(node, Number):
+                return ast.Constant(node.value)
+            if isinstance(node, Variable):
+                return ast.Name(parameters[node.name], ast.Load())
+            left, right = build(node.left), build(node.right)
+            function = scalar_function(node.operator)
+            native = _NATIVE_OPERATORS.get(function)
+            if native is not None:
+                return ast.BinOp(left, native(), right)
+            if node.operator not in functions:
+                functions[node.operator] = f"_f{len(functions)}"
+                namespace[functions[node.operator]] = function
+            return ast.Call(ast.Name(functions[node.operator], ast.Load()), [left, right], [])
+
+        arguments = ast.arguments(
+            posonlyargs=[], args=[ast.arg(parameters[name]) for name in self.variables],
+            kwonlyargs=[], kw_defaults=[], defaults=[],
+        )
+        tree = ast.Expression(ast.Lambda(arguments, build(self.tree)))
+        code = compile(ast.fix_missing_locations(tree), f"<expression {self.source!r}>", "eval")
+        return eval(code, namespace)
+
+    def __call__(self, **values: float) -> float:
+        try:
+            arguments = [values[name] for name in self.variables]
+        except KeyError as error:
+            raise UndefinedVariableError(f"Undefined variable: '{error.args[0]}'.") from None
+        return self.function(*arguments)
+
+@lru_cache(maxsize=256)
+def _compile_cached(source: str, registry_version: int) -> CompiledExpression:
+    return CompiledExpression(source, parse(source))
+
+def compile_expression(source: str) -> CompiledExpression:
+    """
+    Compiles an expression, reusing the cached function for repeated sources.
+
+    The cache is keyed on the registry version, so registering an operator
+    invalidates previously compiled expressions.
+
+    Raises:
+        ValueError: If the expression is malformed or uses an unsupported operator.
+    """
+
+    return _compile_cached(source, CalculationFactory._version)
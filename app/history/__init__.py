@@ -0,0 +1,279 @@
+"""
+app/history.py
+
+Stores calculation history outside of a REPL session.
+
+Provides:
+    - History: Session history that keeps running result statistics as it grows,
+      sealing older entries into compressed chunks.
+    - HistoryRecord: One stored calculation (operator, operands and recorded result).
+    - export_history: Writes calculations to a CSV export.
+    - load_history: Lazily reads the records of a CSV export.
+
+Values are exported as Python writes them, so a complex power result such as
+'(1.7e-16+2.8j)' loads back as a complex number.
+"""
+
+import csv
+import io
+import lzma
+import struct
+import sys
+import zlib
+from collections.abc import Sequence
+from typing import (Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional,
+                    Tuple, Type, Union, overload)
+from app.calculation import Calculation
+from app.stats import ResultStatistics
+
+# Column order of a history export.
+EXPORT_FIELDS = ("operator", "a", "b", "result")
+
+#--------------------------------------
+# Stored History Record
+#--------------------------------------
+
+class HistoryRecord(NamedTuple):
+    """A stored calculation together with the result it produced when recorded."""
+
+    operator: str
+    a: float
+    b: float
+    result: float   # complex for a negative base to a fractional power
+
+    @classmethod
+    def from_calculation(cls, calculation: Calculation) -> "HistoryRecord":
+        """Builds a record by executing the calculation."""
+        return cls(calculation.operator, calculation.a, calculation.b, calculation.execute())
+
+#--------------------------------------
+# Compressed Chunks
+#--------------------------------------
+
+# Packed record of a sealed entry: (index into the chunk's classes, a, b, result).
+_RECORD = struct.Struct("<Hddd")
+
+# Class index of an entry kept as an object instead (operands that are not floats).
+_UNPACKED = 0xFFFF
+
+# Compression codecs for sealed chunks: name -> (compress, decompress).
+CODECS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "zlib": (zlib.compress, zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+
+# Entries per sealed chunk.
+CHUNK_SIZE = 4096
+
+class _Chunk(NamedTuple):
+    """A sealed run of history entries."""
+
+    classes: Tuple[Type[Calculation], ...]    # calculation class per class index
+    unpacked: Dict[int, Tuple[Calculation, Any]]   # position -> (entry, result) that could not be packed
+    data: Optional[bytes]                     # compressed records, or None when spilled to disk
+    offset: int                               # position of the compressed records in the spill file
+    size: int                                 # length of the compressed records
+
+def _packable(calculation: Calculation) -> bool:
+    """True if a calculation is fully described by its class and float operands."""
+    attributes = getattr(calculation, "__dict__", None)
+    return (type(calculation.a) is float and type(calculation.b) is float
+            and attributes is not None and len(attributes) == 2)
+
+#--------------------------------------
+# Session History
+#--------------------------------------
+
+class History(Sequence):
+    """
+    Calculations performed during a session, in order.
+
+    Behaves like a read-only sequence of Calculation objects. Each entry's
+    result is stored with it ('entries'), so showing the history never executes
+    a calculation again. Appending also records the result in 'stats', so
+    result aggregates are O(1) to read.
+
+    Older entries are sealed into compressed chunks: once 2 * 'chunk_size'
+    entries are held as objects, the oldest 'chunk_size' are packed as binary
+    records (class index, two float64 operands and the float64 result) and
+    compressed with 'codec'. With a 'spill_path' the compressed chunks are
+    written to that file instead of being kept in memory. Reading a sealed
+    entry decompresses its chunk and rebuilds an equal Calculation object; the
+    most recently read chunk stays decompressed, so sequential access
+    decompresses each chunk once.
+    """
+
+    def __init__(self, calculations: Iterable[Calculation] = (), chunk_size: int = CHUNK_SIZE,
+                 codec: str = "zlib", spill_path: Optional[str] = None) -> None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec '{codec}'. Use one of: {', '.join(CODECS)}.")
+        self.chunk_size = chunk_size
+        self.codec = codec
+        self._calculations: List[Calculation] = []
+        self._results: List[Any] = []
+        self._chunks: List[_Chunk] = []
+        self._cached: Tuple[int, bytes] = (-1, b"")
+        self._spill: Optional[BinaryIO] = open(spill_path, "w+b") if spill_path else None
+        self.stats = ResultStatistics()
+        for calculation in calculations:
+            self.append(calculation)
+
+    def append(self, calculation: Calculation, result: Optional[float] = None) -> None:
+        """Appends a calculation; pass 'result' when it was already executed."""
+        if result is None:
+            result = calculation.execute()
+        self._calculations.append(calculation)
+        self._results.append(result)
+        self.stats.record(calculation.operator, result)
+        if len(self._calculations) >= 2 * self.chunk_size:
+            self._seal()
+
+    def _seal(self) -> None:
+        """Packs and compresses the oldest 'chunk_size' entries held as objects."""
+        entries = self._calculations[:self.chunk_size]
+        classes: Dict[Type[Calculation], int] = {}
+        unpacked: Dict[int, Tuple[Calculation, Any]] = {}
+        records = bytearray(_RECORD.size * len(entries))
+        for position, (calculation, result) in enumerate(zip(entries, self._results)):
+            if _packable(calculation) and type(result) is float \
+                    and (type(calculation) in classes or len(classes) < _UNPACKED):
+                index = classes.setdefault(type(calculation), len(classes))
+                _RECORD.pack_into(records, position * _RECORD.size, index,
+                                  calculation.a, calculation.b, result)
+            else:
+                unpacked[position] = (calculation, result)
+                _RECORD.pack_into(records, position * _RECORD.size, _UNPACKED, 0.0, 0.0, 0.0)
+        data = CODECS[self.codec][0](bytes(records))
+        offset = 0
+        if self._spill is not None:
+            offset = self._spill.seek(0, io.SEEK_END)
+            self._spill.write(data)
+            self._spill.flush()
+        self._chunks.append(_Chunk(tuple(classes), unpacked,
+                                   None if self._spill is not None else data, offset, len(data)))
+        del self._calculations[:self.chunk_size]
+        del self._results[:self.chunk_size]
+
+    def _records(self, number: int) -> bytes:
+        """Returns the packed records of sealed chunk 'number', decompressing them unless cached."""
+        if self._cached[0] == number:
+            return self._cached[1]
+        chunk = self._chunks[number]
+        data = chunk.data
+        if data is None:
+            self._spill.seek(chunk.offset)
+            data = self._spill.read(chunk.size)
+        records = CODECS[self.codec][1](data)
+        self._cached = (number, records)
+        return records
+
+    def _entry(self, number: int, position: int) -> Calculation:
+        """Rebuilds one sealed entry."""
+        index, a, b, _ = _RECORD.unpack_from(self._records(number), position * _RECORD.size)
+        chunk = self._chunks[number]
+        return chunk.unpacked[position][0] if index == _UNPACKED else chunk.classes[index](a, b)
+
+    def _chunk(self, number: int) -> Iterator[Tuple[Calculation, Any]]:
+        """Rebuilds the entries of sealed chunk 'number' and their results in order."""
+        chunk = self._chunks[number]
+        classes, unpacked = chunk.classes, chunk.unpacked
+        for position, (index, a, b, result) in enumerate(_RECORD.iter_unpack(self._records(number))):
+            yield unpacked[position] if index == _UNPACKED else (classes[index](a, b), result)
+
+    @property
+    def sealed(self) -> int:
+        """Number of entries in compressed chunks."""
+        return len(self._chunks) * self.chunk_size
+
+    def live(self) -> List[Calculation]:
+        """The most recent entries, still held as Calculation objects."""
+        return list(self._calculations)
+
+    def compressed_bytes(self) -> int:
+        """Bytes of compressed chunk data (in memory or in the spill file)."""
+        return sum(chunk.size for chunk in self._chunks)
+
+    def storage_bytes(self) -> int:
+        """Bytes held in memory for the history, not counting the live Calculation objects."""
+        size = sys.getsizeof(self._calculations) + sys.getsizeof(self._chunks)
+        for chunk in self._chunks:
+            size += sys.getsizeof(chunk.unpacked) + (len(chunk.data) if chunk.data is not None else 0)
+        return size
+
+    def close(self) -> None:
+        """Closes the spill file, if any; sealed entries can no longer be read from it."""
+        if self._spill is not None:
+            self._spill.close()
+
+    def __len__(self) -> int:
+        return self.sealed + len(self._calculations)
+
+    def entries(self) -> Iterator[Tuple[Calculation, Any]]:
+        """Yields each entry with the result it produced when appended, in order."""
+        for number in range(len(self._chunks)):
+            yield from self._chunk(number)
+        yield from list(zip(self._calculations, self._results))
+
+    def __iter__(self) -> Iterator[Calculation]:
+        for calculation, _ in self.entries():
+            yield calculation
+
+    @overload
+    def __getitem__(self, index: int) -> Calculation: ...
+    @overload
+    def __getitem__(self, index: slice) -> List[Calculation]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("history index out of range")
+        sealed = self.sealed
+        if index >= sealed:
+            return self._calculations[index - sealed]
+        return self._entry(index // self.chunk_size, index % self.chunk_size)
+
+#--------------------------------------
+# Export and Load
+#--------------------------------------
+
+def export_history(history: Iterable[Union[Calculation, HistoryRecord]], path: str) -> int:
+    """
+    Writes the history to a CSV export at 'path'.
+
+    Returns:
+        int: Number of records written.
+    """
+
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(EXPORT_FIELDS)
+        for entry in history:
+            if isinstance(entry, Calculation):
+                entry = HistoryRecord.from_calculation(entry)
+            writer.writerow(entry)
+            count += 1
+    return count
+
+def _number(text: str) -> Union[float, complex]:
+    """Reads an exported value: a float, or a complex number such as '(1+2j)'."""
+    try:
+        return float(text)
+    except ValueError:
+        return complex(text)
+
+def load_history(path: str) -> Iterator[HistoryRecord]:
+    """Lazily yields the records of a CSV export written by 'export_history'."""
+
+    with open(path, newline="", encoding="utf-8") as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if header is not None and tuple(header) != EXPORT_FIELDS:
+            raise ValueError(f"Invalid history export header: {header}")
+        for operator, a, b, result in reader:
+            yield HistoryRecord(operator, _number(a), _number(b), _number(result))
@@ -0,0 +1,135 @@
+"""
+app/memory.py
+
+Memory usage report for long-lived REPL sessions.
+
+'memory_report' shows:
+    - Current and peak size of the process (resident set size).
+    - Bytes held by the session history: its list and compressed chunks, and
+      the live Calculation objects (with their operands) it refers to.
+    - Current and peak memory traced by 'tracemalloc', and the source lines
+      that allocated the most of it.
+
+'tracemalloc' slows every allocation down, so it is only started by the first
+report and runs until 'stop_tracing'; allocation sites therefore cover
+allocations made since the first report.
+"""
+
+import os
+import sys
+import tracemalloc
+from typing import Iterable, Optional, Tuple
+from app.calculation import Calculation
+from app.history import History
+
+try:
+    import resource
+except ImportError:   # pragma: no cover - not available on Windows
+    resource = None
+
+# Allocation sites listed in the report.
+TOP = 10
+
+# Frames of these files are not allocation sites of the session.
+_IGNORED = (tracemalloc.__file__, __file__, "<frozen importlib._bootstrap>",
+            "<frozen importlib._bootstrap_external>", "<unknown>")
+
+#--------------------------------------
+# Measurements
+#--------------------------------------
+
+def format_bytes(size: float) -> str:
+    """Formats a byte count as '512 B', '1.5 KiB', '2.0 MiB', ..."""
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+def process_memory() -> Tuple[Optional[int], Optional[int]]:
+    """Current and peak resident set size in bytes (None where unknown)."""
+    current = peak = None
+    try:
+        with open("/proc/self/statm") as statm:
+            current = int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):   # pragma: no cover - not Linux
+        pass
+    if resource is not None:
+        # ru_maxrss is in KiB on Linux and in bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak *= 1 if sys.platform == "darwin" else 1024
+        if current is not None:
+            peak = max(peak, current)   # the peak is sampled less often than statm
+    return current, peak
+
+def calculation_bytes(calculations: Iterable[Calculation]) -> Tuple[int, int]:
+    """
+    Number of distinct Calculation objects and the bytes they hold.
+
+    Counts each object, its attribute dict and its operands once, so objects
+    shared between history entries are not counted twice.
+    """
+
+    seen = set()
+    size = 0
+    count = 0
+    for calculation in calculations:
+        if id(calculation) in seen:
+            continue
+        seen.add(id(calculation))
+        count += 1
+        size += sys.getsizeof(calculation)
+        attributes = getattr(calculation, "__dict__", None)
+        if attributes is not None:
+            size += sys.getsizeof(attributes)
+        for operand in (calculation.a, calculation.b):
+            if id(operand) not in seen:
+                seen.add(id(operand))
+                size += sys.getsizeof(operand)
+    return count, size
+
+#--------------------------------------
+# Report
+#--------------------------------------
+
+def stop_tracing() -> bool:
+    """Stops tracemalloc; returns False if it was not running."""
+    if not tracemalloc.is_tracing():
+        return False
+    tracemalloc.stop()
+    return True
+
+def memory_report(history: History, top: int = TOP) -> str:
+    """Renders the memory report of a session, starting tracemalloc if needed."""
+
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    current, peak = process_memory()
+    count, size = calculation_bytes(history.live())
+    lines = [
+        f"Process memory: {format_bytes(current) if current is not None else 'unknown'} "
+        f"(peak {format_bytes(peak) if peak is not None else 'unknown'})",
+        f"History list: {format_bytes(history.storage_bytes())} for {len(history)} entries "
+        f"({history.sealed} in compressed chunks, {format_bytes(history.compressed_bytes())})",
+        f"Calculation objects: {format_bytes(size)} for {count} distinct objects",
+    ]
+
+    if started:
+        lines.append("Allocation tracing started; run 'memory' again to see allocation sites "
+                     "and 'memory stop' to stop tracing.")
+        return "\n".join(lines)
+
+    traced, traced_peak = tracemalloc.get_traced_memory()
+    lines.append(f"Traced since tracing started: {format_bytes(traced)} "
+                 f"(peak {format_bytes(traced_peak)})")
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, pattern) for pattern in _IGNORED])
+    statistics = snapshot.statistics("lineno")[:top]
+    if statistics:
+        lines.append("Top allocation sites:")
+    for statistic in statistics:
+        frame = statistic.traceback[0]
+        lines.append(f"  {frame.filename}:{frame.lineno}: "
+                     f"{format_bytes(statistic.size)} in {statistic.count} blocks")
+    return "\n".join(lines)
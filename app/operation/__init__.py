@@ -8,11 +8,32 @@ Class 'Operation' encapsulates mathematical methods:
     - division
     - power
 
+Class 'VectorOperation' provides vectorized kernels of the same methods that
+apply one operation element-wise across two equal-length operand sequences.
+
+Class 'CheckedOperation' provides exception-free versions that return the
+result or a 'Failure' (see app.outcome) instead of raising.
+
 Special Handling:
     - Includes the LBYL Principle (Look Before You Leap).
     - Handles division by zero gracefully by raising a ZeroDivisionError.
 """
 
+import math
+from array import array
+from typing import Any, Callable, MutableSequence, Optional, Sequence
+from app.outcome import ErrorCode, Failure, Outcome
+
+# log2 of the largest finite float's magnitude; larger power results overflow.
+_MAX_LOG2 = 1024.0
+
+# Shared failures of the checked methods.
+_DIVISION_BY_ZERO = Failure(ErrorCode.DIVIDE_BY_ZERO, "Cannot divide by zero.")
+_MODULUS_BY_ZERO = Failure(ErrorCode.DIVIDE_BY_ZERO, "Modulus: Cannot divide by zero.")
+_ZERO_TO_NEGATIVE = Failure(ErrorCode.DIVIDE_BY_ZERO, "0.0 cannot be raised to a negative power")
+_POWER_OVERFLOW = Failure(ErrorCode.OVERFLOW, "Power: result too large.")
+_POWER_DOMAIN = Failure(ErrorCode.DOMAIN_ERROR, "Power: a negative base requires an integer exponent.")
+
 class Operation:
     """Encapsulates mathematical operations for two float operands."""
     
@@ -50,4 +71,123 @@ class Operation:
             raise ZeroDivisionError("Modulus: Cannot divide by zero.")
         return a % b
 
-    
\ No newline at end of file
+class VectorOperation:
+    """
+    Vectorized kernels of the 'Operation' methods.
+
+    Each kernel takes two equal-length sequences of operands (list, array.array
+    or memoryview) and returns the element-wise results. When an 'out' buffer is
+    given, the results are written into it as float64 values and it is returned.
+
+    Kernels map the 'Operation' method itself, looked up when called, so they
+    always agree with 'execute' (replay relies on this to detect a changed operator).
+    """
+
+    @staticmethod
+    def _apply(
+        func: Callable[[Any, Any], Any],
+        a: Sequence[float],
+        b: Sequence[float],
+        out: Optional[MutableSequence[float]],
+    ) -> MutableSequence[float]:
+        """Applies 'func' element-wise over 'a' and 'b', writing into 'out' when given."""
+        n = len(a)
+        if n != len(b):
+            raise ValueError(f"Operand length mismatch: {n} != {len(b)}.")
+        if out is None:
+            return list(map(func, a, b))
+        out[:n] = array('d', map(func, a, b))
+        return out
+
+    @staticmethod
+    def addition(a: Sequence[float], b: Sequence[float],
+                 out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Returns the element-wise sums of two operand sequences."""
+        return VectorOperation._apply(Operation.addition, a, b, out)
+
+    @staticmethod
+    def subtraction(a: Sequence[float], b: Sequence[float],
+                    out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Returns the element-wise differences of two operand sequences."""
+        return VectorOperation._apply(Operation.subtraction, a, b, out)
+
+    @staticmethod
+    def multiplication(a: Sequence[float], b: Sequence[float],
+                       out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Returns the element-wise products of two operand sequences."""
+        return VectorOperation._apply(Operation.multiplication, a, b, out)
+
+    @staticmethod
+    def division(a: Sequence[float], b: Sequence[float],
+                 out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Returns the element-wise quotients of two operand sequences."""
+        if 0 in b:
+            raise ZeroDivisionError("Cannot divide by zero.")
+        return VectorOperation._apply(Operation.division, a, b, out)
+
+    @staticmethod
+    def power(a: Sequence[float], b: Sequence[float],
+              out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Returns each operand of 'a' raised to the power of the matching operand of 'b'."""
+        return VectorOperation._apply(Operation.power, a, b, out)
+
+    @staticmethod
+    def modulus(a: Sequence[float], b: Sequence[float],
+                out: Optional[MutableSequence[float]] = None) -> MutableSequence[float]:
+        """Returns the element-wise remainders of two operand sequences."""
+        if 0 in b:
+            raise ZeroDivisionError("Modulus: Cannot divide by zero.")
+        return VectorOperation._apply(Operation.modulus, a, b, out)
+
+class CheckedOperation:
+    """
+    Exception-free versions of the 'Operation' methods.
+
+    Each returns the result, or a 'Failure' for the failures the 'Operation'
+    method would raise, checked before computing.
+    A power whose real result does not exist (a negative base with a
+    fractional exponent) is a domain error rather than a complex result.
+    """
+
+    @staticmethod
+    def addition(a: float, b: float) -> Outcome:
+        """Returns the sum of two operands."""
+        return a + b
+
+    @staticmethod
+    def subtraction(a: float, b: float) -> Outcome:
+        """Returns the difference of two operands."""
+        return a - b
+
+    @staticmethod
+    def multiplication(a: float, b: float) -> Outcome:
+        """Returns the product of two operands."""
+        return a * b
+
+    @staticmethod
+    def division(a: float, b: float) -> Outcome:
+        """Returns the quotient of two operands, or DIVIDE_BY_ZERO."""
+        if b == 0:
+            return _DIVISION_BY_ZERO
+        return a / b
+
+    @staticmethod
+    def power(a: float, b: float) -> Outcome:
+        """Returns 'a' raised to the power of 'b', or DIVIDE_BY_ZERO, DOMAIN_ERROR or OVERFLOW."""
+        if a == 0 and -math.inf < b < 0:
+            return _ZERO_TO_NEGATIVE
+        if isinstance(a, float) or isinstance(b, float):
+            # Integer powers are exact and never overflow; float ones do past 2**1024.
+            if a != 0 and -math.inf < a < math.inf and -math.inf < b < math.inf \
+                    and b * math.log2(abs(a)) > _MAX_LOG2 + 1e-9:
+                return _POWER_OVERFLOW
+            if -math.inf < a < 0 and -math.inf < b < math.inf and b != math.floor(b):
+                return _POWER_DOMAIN
+        return a ** b
+
+    @staticmethod
+    def modulus(a: float, b: float) -> Outcome:
+        """Returns the remainder of operand 'a' and operand 'b', or DIVIDE_BY_ZERO."""
+        if b == 0:
+            return _MODULUS_BY_ZERO
+        return a % b
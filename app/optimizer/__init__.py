@@ -0,0 +1,193 @@
+"""
+app/optimizer.py
+
+Constant folding and common-subexpression elimination for expression batches.
+
+'optimize_batch' turns a batch of expressions into one shared DAG:
+    - Identical subexpressions anywhere in the batch become a single node
+      (hash-consing), so '2 ** 64' appearing thousands of times is one node.
+    - Nodes whose operands are all constants are executed once, at optimization
+      time, and replaced by their result.
+
+Evaluating the optimized batch then executes each distinct remaining
+Calculation once and shares its result between all expressions using it.
+"""
+
+import math
+from typing import Dict, Hashable, Iterable, List, Mapping, NamedTuple, Optional, Tuple, Union
+from app.calculation import CalculationFactory
+from app.expression import Node, Number, Variable, parse
+from app.variables import UndefinedVariableError
+
+Value = Union[float, Exception]
+
+#--------------------------------------
+# DAG Nodes
+#--------------------------------------
+
+class Constant(NamedTuple):
+    """A literal or folded value (an Exception when folding failed)."""
+
+    value: Value
+
+class Input(NamedTuple):
+    """A variable supplied at evaluation time."""
+
+    name: str
+
+class Operator(NamedTuple):
+    """A registered operator over two earlier nodes (indices into the DAG)."""
+
+    operator: str
+    left: int
+    right: int
+
+DagNode = Union[Constant, Input, Operator]
+
+#--------------------------------------
+# Optimized Batch
+#--------------------------------------
+
+class OptimizedBatch:
+    """
+    A batch of expressions sharing one DAG.
+
+    Attributes:
+        nodes: Distinct nodes in evaluation order (operands before operators).
+        roots: DAG index of each expression's result, in batch order.
+        tree_size: Number of nodes of all the expressions before optimization.
+        folded: Number of distinct operator nodes computed at optimization time.
+    """
+
+    def __init__(self) -> None:
+        self.nodes: List[DagNode] = []
+        self.roots: List[int] = []
+        self.tree_size: int = 0
+        self.folded: int = 0
+        self._index: Dict[Hashable, int] = {}
+
+    def _intern(self, key: Hashable, node: DagNode) -> int:
+        """Returns the index of an identical node, adding 'node' if there is none."""
+        index = self._index.get(key)
+        if index is None:
+            index = self._index[key] = len(self.nodes)
+            self.nodes.append(node)
+        return index
+
+    def _constant(self, value: Value) -> int:
+        if isinstance(value, Exception):
+            return self._intern(("error", id(value)), Constant(value))
+        # Keep 0.0 and -0.0 apart; NaN never equals itself and is simply not shared.
+        if isinstance(value, complex):   # e.g. a negative base to a fractional power
+            key = ("complex", value.real, math.copysign(1.0, value.real),
+                   value.imag, math.copysign(1.0, value.imag))
+        else:
+            key = ("constant", value, math.copysign(1.0, value))
+        return self._intern(key, Constant(value))
+
+    def add(self, tree: Node) -> int:
+        """Adds an expression tree to the batch and returns its root index."""
+
+        self.tree_size += 1
+        if isinstance(tree, Number):
+            return self._constant(tree.value)
+        if isinstance(tree, Variable):
+            return self._intern(("input", tree.name), Input(tree.name))
+
+        left = self.add(tree.left)
+        right = self.add(tree.right)
+        key = ("operator", tree.operator, left, right)
+        if key in self._index:
+            return self._index[key]
+
+        left_node, right_node = self.nodes[left], self.nodes[right]
+        for operand, node in ((left, left_node), (right, right_node)):
+            if isinstance(node, Constant) and isinstance(node.value, Exception):
+                # An operand that failed to fold makes the whole node fail the same way.
+                self._index[key] = operand
+                return operand
+        if isinstance(left_node, Constant) and isinstance(right_node, Constant):
+            self.folded += 1
+            value = _execute(tree.operator, left_node.value, right_node.value)
+            index = self._constant(value)
+            self._index[key] = index
+            return index
+        return self._intern(key, Operator(tree.operator, left, right))
+
+    @property
+    def operator_count(self) -> int:
+        """Number of Calculations executed per evaluation."""
+        return sum(isinstance(node, Operator) for node in self.nodes)
+
+    def evaluate(self, variables: Optional[Mapping[str, float]] = None) -> List[Value]:
+        """
+        Evaluates every expression, executing each distinct Calculation once.
+
+        Returns:
+            One result per expression, or the Exception that prevented it.
+        """
+
+        variables = variables or {}
+        values: List[Value] = []
+        for node in self.nodes:
+            if isinstance(node, Constant):
+                values.append(node.value)
+            elif isinstance(node, Input):
+                if node.name in variables:
+                    values.append(variables[node.name])
+                else:
+                    values.append(UndefinedVariableError(f"Undefined variable: '{node.name}'."))
+            else:
+                values.append(_execute(node.operator, values[node.left], values[node.right]))
+        return [values[root] for root in self.roots]
+
+#--------------------------------------
+# Helper Functions
+#--------------------------------------
+
+def _execute(operator: str, a: Value, b: Value) -> Value:
+    """
+    Executes one Calculation, propagating operand errors and capturing its own.
+
+    TypeError is captured too: a complex operand (e.g. a folded '-8 ** 0.5')
+    has no '%', and it must fail only its own expression.
+    """
+
+    for operand in (a, b):
+        if isinstance(operand, Exception):
+            return operand
+    try:
+        return CalculationFactory.create_calculation(a, operator, b).execute()
+    except (ValueError, ArithmeticError, TypeError) as error:
+        return error
+
+#--------------------------------------
+# Batch Optimization
+#--------------------------------------
+
+def optimize_batch(expressions: Iterable[Union[str, Node]]) -> OptimizedBatch:
+    """
+    Builds an OptimizedBatch from expression texts or trees.
+
+    Expressions that fail to parse get a Constant holding the ValueError, so
+    the batch keeps one result per input expression.
+    """
+
+    batch = OptimizedBatch()
+    for expression in expressions:
+        try:
+            tree = parse(expression) if isinstance(expression, str) else expression
+        except ValueError as error:
+            batch.roots.append(batch._constant(error))
+            continue
+        batch.roots.append(batch.add(tree))
+    return batch
+
+def evaluate_batch(
+    expressions: Iterable[Union[str, Node]],
+    variables: Optional[Mapping[str, float]] = None,
+) -> Tuple[List[Value], OptimizedBatch]:
+    """Optimizes and evaluates a batch, returning the results and the optimized batch."""
+
+    batch = optimize_batch(expressions)
+    return batch.evaluate(variables), batch
@@ -0,0 +1,96 @@
+"""
+app/outcome.py
+
+Result-or-error values for high-volume evaluation.
+
+Batch paths evaluate calculations with 'Calculation.evaluate', which returns
+an 'Outcome' instead of raising: the result itself, or a 'Failure' holding an
+'ErrorCode' and a message. Successes are not wrapped and common failures are
+shared constants, so neither allocates; checking for the common failures up
+front (zero divisors, power overflow) avoids raising and catching an
+exception per failing row.
+
+'ErrorCounts' tallies the error codes of a batch, and 'json_result' writes a
+result as a valid JSON value.
+"""
+
+import math
+from collections import Counter
+from enum import Enum
+from typing import Any, Iterable, NamedTuple, Optional
+
+class ErrorCode(str, Enum):
+    """Error codes of a failed evaluation; each compares equal to its string value."""
+
+    INVALID_INPUT = "invalid_input"
+    UNSUPPORTED_OPERATOR = "unsupported_operator"
+    DIVIDE_BY_ZERO = "divide_by_zero"
+    OVERFLOW = "overflow"
+    DOMAIN_ERROR = "domain_error"
+    CALCULATION_ERROR = "calculation_error"
+    RESOURCE_LIMIT = "resource_limit"
+    TIMEOUT = "timeout"
+    INTERRUPTED = "interrupted"
+
+    def __str__(self) -> str:
+        return self.value
+
+class Failure(NamedTuple):
+    """A failed evaluation."""
+
+    code: ErrorCode
+    message: str
+
+# The result of an evaluation, or a Failure.
+Outcome = Any
+
+def is_failure(outcome: Outcome) -> bool:
+    """True if an outcome is a Failure rather than a result."""
+    return type(outcome) is Failure
+
+def json_result(result: Outcome) -> Any:
+    """
+    Returns a result as a JSON value: finite numbers as they are, others as text.
+
+    Complex results (e.g. a negative base to a fractional power) are not JSON
+    numbers, and inf and nan would be written as the invalid 'Infinity' and 'NaN'.
+    """
+    if result is None or isinstance(result, int) or (isinstance(result, float) and math.isfinite(result)):
+        return result
+    return str(result)
+
+def classify(error: Exception) -> ErrorCode:
+    """Maps an exception raised by a calculation to its error code."""
+    if isinstance(error, ZeroDivisionError):
+        return ErrorCode.DIVIDE_BY_ZERO
+    if isinstance(error, OverflowError):
+        return ErrorCode.OVERFLOW
+    if isinstance(error, ValueError):
+        return ErrorCode.DOMAIN_ERROR
+    if isinstance(error, (MemoryError, RecursionError)):
+        return ErrorCode.RESOURCE_LIMIT
+    return ErrorCode.CALCULATION_ERROR
+
+#--------------------------------------
+# Error Counts
+#--------------------------------------
+
+class ErrorCounts(Counter):
+    """Number of failures per error code in a batch."""
+
+    @classmethod
+    def of(cls, codes: Iterable[Optional[ErrorCode]]) -> "ErrorCounts":
+        """Counts the codes that are not None."""
+        return cls(code for code in codes if code is not None)
+
+    @property
+    def errors(self) -> int:
+        """Total number of failures."""
+        return sum(self.values())
+
+    def summary(self) -> str:
+        """One line such as '3 errors (divide_by_zero: 2, overflow: 1)'."""
+        if not self:
+            return "0 errors"
+        details = ", ".join(f"{code}: {count}" for code, count in sorted(self.items()))
+        return f"{self.errors} error{'s' if self.errors != 1 else ''} ({details})"
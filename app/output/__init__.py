@@ -0,0 +1,162 @@
+"""
+app/output.py
+
+Buffered output for REPL and batch results.
+
+'OutputWriter' collects rendered lines and writes them to the stream in one
+call when the buffer reaches a size threshold, when the oldest buffered line
+is older than a time threshold, or when the REPL is about to wait for input
+on a terminal. Piped output therefore costs one write call per batch of
+lines instead of one per line. With piped input the buffer is also flushed
+when no input is ready, since reading would block: a program driving the
+REPL through pipes gets each result before it sends the next line.
+
+With 'json_lines=True' each line is a JSON object instead of plain text:
+results are '{"name": ..., "calculation": ..., "result": ...}' and any other
+message is '{"message": ...}'. Prompts are not written in this mode.
+"""
+
+import io
+import json
+import select
+import sys
+import time
+from typing import Iterable, List, Optional, TextIO, Union
+from app.calculation import Calculation
+from app.outcome import ErrorCounts, json_result
+from app.stream import StreamError, StreamResult
+
+#--------------------------------------
+# Helper Functions
+#--------------------------------------
+
+def _input_ready() -> bool:
+    """True if stdin has a line (or EOF) ready, so reading it will not block."""
+    try:
+        ready, _, _ = select.select([sys.stdin], [], [], 0)
+    except io.UnsupportedOperation:   # not a file (e.g. StringIO): reading never blocks
+        return True
+    except (OSError, ValueError):     # e.g. pipes on Windows: assume it may block
+        return False
+    return bool(ready)
+
+#--------------------------------------
+# Output Writer
+#--------------------------------------
+
+class OutputWriter:
+    """Buffers rendered lines and flushes them on size, time or input."""
+
+    def __init__(self, stream: Optional[TextIO] = None, json_lines: bool = False,
+                 max_bytes: int = 64 * 1024, max_delay: float = 0.1) -> None:
+        """
+        Args:
+            stream: Stream to write to; defaults to 'sys.stdout' at flush time.
+            json_lines: Emit JSON objects instead of plain text.
+            max_bytes: Flush once this many characters are buffered.
+            max_delay: Flush once the oldest buffered line is this many seconds old.
+        """
+
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1.")
+        if max_delay < 0:
+            raise ValueError("max_delay must not be negative.")
+        self.stream = stream
+        self.json_lines = json_lines
+        self.max_bytes = max_bytes
+        self.max_delay = max_delay
+        self._lines: List[str] = []
+        self._size = 0
+        self._since = 0.0
+        self.writes = 0
+
+    def _append(self, text: str) -> None:
+        """Buffers rendered text and flushes if a threshold is reached."""
+        if not self._lines:
+            self._since = time.monotonic()
+        self._lines.append(text)
+        self._size += len(text)
+        if self._size >= self.max_bytes or time.monotonic() - self._since >= self.max_delay:
+            self.flush()
+
+    def line(self, message: object) -> None:
+        """Writes a message line; like print(), any object is written as str(message)."""
+        text = str(message)
+        self._append((json.dumps({"message": text}) if self.json_lines else text) + "\n")
+
+    def result(self, calculation: Union[Calculation, str], result: float,
+               name: Optional[str] = None) -> None:
+        """
+        Writes a result line: 'Result: <calculation>' or 'Result: <name> = <calculation>'.
+
+        A Calculation is rendered with 'result', never executed again.
+        """
+        text = calculation.describe(result) if isinstance(calculation, Calculation) else str(calculation)
+        if self.json_lines:
+            self._append(json.dumps({"name": name, "calculation": text,
+                                     "result": json_result(result)}) + "\n")
+        elif name is None:
+            self._append(f"Result: {text}\n")
+        else:
+            self._append(f"Result: {name} = {text}\n")
+
+    def error(self, code: str, message: str, index: Optional[int] = None) -> None:
+        """Writes an error line for a batch item."""
+        if self.json_lines:
+            self._append(json.dumps({"index": index, "error": code, "message": message}) + "\n")
+        elif index is None:
+            self._append(f"Error: {message}\n")
+        else:
+            self._append(f"Error: item {index}: {message}\n")
+
+    def flush(self) -> None:
+        """Writes all buffered lines in a single call."""
+        if self._lines:
+            stream = self.stream if self.stream is not None else sys.stdout
+            stream.write("".join(self._lines))
+            stream.flush()
+            self.writes += 1
+            self._lines.clear()
+            self._size = 0
+
+    def read_input(self, prompt: str) -> str:
+        """
+        Reads a line of input after showing 'prompt'.
+
+        On a terminal the buffer is flushed first, so the user sees every
+        result before being asked for more. With piped input the prompt is
+        buffered in order with the output, and the buffer is flushed only if
+        no input is ready yet (reading would block).
+        """
+
+        if sys.stdin.isatty():
+            self.flush()
+            return input(prompt)
+        if not self.json_lines:
+            self._append(prompt)
+        if not _input_ready():
+            self.flush()
+        return input("")
+
+#--------------------------------------
+# Batch Output
+#--------------------------------------
+
+def write_results(outcomes: Iterable[Union[StreamResult, StreamError]],
+                  writer: OutputWriter) -> ErrorCounts:
+    """
+    Writes the outcomes of 'evaluate_stream' and flushes at the end.
+
+    Returns:
+        ErrorCounts: The number of outcomes that were errors, per error code.
+    """
+
+    errors = ErrorCounts()
+    for outcome in outcomes:
+        if outcome.ok:
+            writer.result(outcome.calculation, outcome.result)
+        else:
+            errors[outcome.code] += 1
+            writer.error(outcome.code, outcome.message, outcome.index)
+    writer.flush()
+    return errors
@@ -0,0 +1,119 @@
+"""
+app/parallel.py
+
+Multiprocess batch evaluation over shared memory.
+
+Operands, operator codes and results live in 'multiprocessing.shared_memory'
+blocks. Workers receive only the block names and an index range, attach to the
+blocks and evaluate their range in place with the vectorized kernels (see
+'app.columnar.evaluate_runs'), so no operand or result data is pickled.
+"""
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from multiprocessing import shared_memory
+from typing import List, Optional, Sequence, Tuple, Union
+from app.columnar import ColumnarReport, encode_operators, evaluate_runs
+from app.outcome import ErrorCounts
+
+# Minimum rows per worker task, so small batches are not split needlessly.
+MIN_CHUNK = 1 << 15
+
+#--------------------------------------
+# Worker
+#--------------------------------------
+
+def _evaluate_range(names: Tuple[str, str, str, str], start: int, stop: int) -> Tuple[int, ErrorCounts]:
+    """Worker task: evaluates rows [start, stop) of the shared blocks in place."""
+
+    with ExitStack() as stack:
+        # Workers share the parent's resource tracker; only the parent unlinks the blocks.
+        blocks = [shared_memory.SharedMemory(name=name) for name in names]
+        for block in blocks:
+            stack.callback(block.close)
+        a_block, b_block, op_block, out_block = blocks
+        a = stack.enter_context(a_block.buf.cast('d'))
+        b = stack.enter_context(b_block.buf.cast('d'))
+        out = stack.enter_context(out_block.buf.cast('d'))
+        ops = stack.enter_context(op_block.buf[start:stop])
+        return evaluate_runs(ops, a[start:stop], b[start:stop], out[start:stop], offset=start)
+
+#--------------------------------------
+# Parallel Evaluation
+#--------------------------------------
+
+def split_ranges(rows: int, parts: int, min_chunk: int = MIN_CHUNK) -> List[Tuple[int, int]]:
+    """Splits [0, rows) into at most 'parts' contiguous ranges of at least 'min_chunk' rows."""
+
+    parts = max(1, min(parts, rows // max(min_chunk, 1) or 1))
+    size, remainder = divmod(rows, parts)
+    ranges, start = [], 0
+    for part in range(parts):
+        stop = start + size + (1 if part < remainder else 0)
+        if stop > start:
+            ranges.append((start, stop))
+        start = stop
+    return ranges
+
+def evaluate_parallel(
+    a: Sequence[float],
+    operators: Union[str, Sequence[str]],
+    b: Sequence[float],
+    workers: Optional[int] = None,
+    min_chunk: int = MIN_CHUNK,
+) -> Tuple[array, ColumnarReport]:
+    """
+    Evaluates 'a[i] operators[i] b[i]' for every row across worker processes.
+
+    Args:
+        a, b: Operand values.
+        operators: One calculation type for every row, or one per row.
+        workers: Number of worker processes (default: CPU count).
+        min_chunk: Minimum rows per worker task.
+
+    Returns:
+        The float64 results (NaN for failing rows) and a ColumnarReport.
+
+    Raises:
+        ValueError: Mismatched lengths or an operator without a code.
+    """
+
+    rows = len(a)
+    ops = encode_operators([operators] * rows if isinstance(operators, str) else operators)
+    if len(b) != rows or len(ops) != rows:
+        raise ValueError(f"Length mismatch: a={rows}, b={len(b)}, operators={len(ops)}.")
+    results = array('d', [0.0]) * rows
+    if rows == 0:
+        return results, ColumnarReport(0, 0, 0, ErrorCounts())
+
+    with ExitStack() as stack:
+        blocks = []
+        for size in (8 * rows, 8 * rows, rows, 8 * rows):
+            block = shared_memory.SharedMemory(create=True, size=size)
+            stack.callback(block.unlink)
+            stack.callback(block.close)
+            blocks.append(block)
+        a_block, b_block, op_block, out_block = blocks
+
+        # One copy of the inputs into shared memory; workers then share them.
+        with a_block.buf.cast('d') as view:
+            view[:] = a if isinstance(a, array) and a.typecode == 'd' else array('d', a)
+        with b_block.buf.cast('d') as view:
+            view[:] = b if isinstance(b, array) and b.typecode == 'd' else array('d', b)
+        op_block.buf[:rows] = ops
+
+        names = tuple(block.name for block in blocks)
+        ranges = split_ranges(rows, workers or os.cpu_count() or 1, min_chunk)
+        with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+            futures = [pool.submit(_evaluate_range, names, start, stop) for start, stop in ranges]
+            counts = [future.result() for future in futures]
+
+        with out_block.buf.cast('d') as view:
+            results[:] = array('d', view)
+    vectorized = sum(count[0] for count in counts)
+    errors = ErrorCounts()
+    for count in counts:
+        errors.update(count[1])
+    return results, ColumnarReport(rows, vectorized, errors.errors, errors)
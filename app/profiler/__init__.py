@@ -0,0 +1,132 @@
+"""
+app/profiler.py
+
+In-session profiling of the REPL calculator with cProfile.
+
+'SessionProfiler' profiles the REPL loop between 'start' and 'stop' and
+reports where the time went:
+    - A stage summary: calls and cumulative time of parsing, factory dispatch,
+      'execute', 'Calculation.__str__' and writing output.
+    - The top functions by internal time, as printed by 'pstats'.
+
+Calculations execute on worker threads (see app.runner). Before Python 3.12
+a profile only sees its own thread, so 'wrap' profiles each executed function
+with a profile of its own and all of them are merged into the report. From
+3.12 cProfile is built on sys.monitoring: the session profile sees every
+thread and no second profile can run beside it, so 'wrap' leaves functions
+as they are. Time spent waiting for the user to type is excluded with 'paused'.
+"""
+
+import cProfile
+import io
+import pstats
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Functions reported in the stage summary: stage -> (module path, function names).
+STAGES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "parse": ("app/parser", ("parse_tokens",)),
+    "dispatch": ("app/calculation", ("create_calculation",)),
+    "execute": ("app/calculation", ("execute",)),
+    "__str__": ("app/calculation", ("describe",)),   # what __str__ renders with
+    "output": ("app/output", ("line", "result", "flush")),
+}
+
+# Functions listed in the report.
+TOP = 15
+
+# From Python 3.12 one cProfile profile covers all threads, and only one can be active.
+_PROFILES_ALL_THREADS = sys.version_info >= (3, 12)
+
+class SessionProfiler:
+    """Profiles the REPL thread and the calculations it runs between 'start' and 'stop'."""
+
+    def __init__(self) -> None:
+        self._main: Optional[cProfile.Profile] = None
+        self._workers: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        """True between 'start' and 'stop'."""
+        return self._main is not None
+
+    def start(self) -> None:
+        """Starts profiling the calling thread."""
+        if self.active:
+            raise ValueError("The profiler is already running. Type 'profile stop' to see the report.")
+        main = cProfile.Profile()
+        main.enable()   # ValueError if another profiler is active (Python 3.12+)
+        self._workers = []
+        self._main = main
+
+    def wrap(self, function: Callable[[], float]) -> Callable[[], float]:
+        """Returns 'function' profiled wherever it runs (unchanged when not profiling)."""
+        if not self.active or _PROFILES_ALL_THREADS:
+            return function
+
+        def profiled() -> float:
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                return function()
+            finally:
+                profile.disable()
+                # Only profiles that ran are merged; one that failed to enable raised above.
+                with self._lock:
+                    self._workers.append(profile)
+
+        return profiled
+
+    @contextmanager
+    def paused(self) -> Iterator[None]:
+        """Leaves the block out of the profile (e.g. waiting for input)."""
+        main = self._main
+        if main is None:
+            yield
+            return
+        main.disable()
+        try:
+            yield
+        finally:
+            main.enable()
+
+    def stop(self, top: int = TOP) -> str:
+        """Stops profiling and returns the report."""
+        if self._main is None:
+            raise ValueError("The profiler is not running. Type 'profile start' first.")
+        self._main.disable()
+        with self._lock:
+            profiles = [self._main, *self._workers]
+        self._main = None
+        return report(pstats.Stats(*profiles), top)
+
+    def cancel(self) -> None:
+        """Stops profiling without a report (e.g. when the session ends)."""
+        if self._main is not None:
+            self._main.disable()
+            self._main = None
+
+def stage_times(stats: pstats.Stats) -> Dict[str, Tuple[int, float]]:
+    """Calls and cumulative seconds per stage in STAGES."""
+    totals = {stage: (0, 0.0) for stage in STAGES}
+    for (filename, _, function), (_, calls, _, cumulative, _) in stats.stats.items():
+        path = filename.replace("\\", "/")
+        for stage, (module, functions) in STAGES.items():
+            if function in functions and module in path:
+                count, seconds = totals[stage]
+                totals[stage] = (count + calls, seconds + cumulative)
+    return totals
+
+def report(stats: pstats.Stats, top: int = TOP) -> str:
+    """Renders the stage summary and the top functions of a profile."""
+    lines = [f"{'stage':<10} {'calls':>8} {'cumulative ms':>14}"]
+    for stage, (calls, seconds) in stage_times(stats).items():
+        lines.append(f"{stage:<10} {calls:>8} {seconds * 1000:>14.3f}")
+    stream = io.StringIO()
+    stats.stream = stream
+    stats.strip_dirs().sort_stats("tottime").print_stats(top)
+    lines.append(stream.getvalue().strip("\n"))
+    return "\n".join(lines)
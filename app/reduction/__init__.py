@@ -0,0 +1,160 @@
+"""
+app/reduction.py
+
+N-ary reductions ('sum', 'prod') over any number of operands.
+
+Operands are streamed in fixed-size chunks so arbitrarily long inputs, such as
+a column of a large file, are reduced in constant memory without creating a
+Calculation per element.
+
+Accuracy:
+    - 'sum' adds each chunk with math.fsum (exactly rounded) and combines the
+      chunk sums and their rounding residuals with Neumaier compensated summation.
+    - 'prod' multiplies each chunk with math.prod and combines the chunk
+      products with 'Operation.multiplication'.
+"""
+
+import math
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List, Type
+from app.operation import Operation
+
+# Number of operands reduced per chunk.
+CHUNK_SIZE = 4096
+
+#--------------------------------------
+# Accumulators
+#--------------------------------------
+
+class SumAccumulator:
+    """Running sum with Neumaier compensation."""
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self._total: float = 0.0
+        self._compensation: float = 0.0
+
+    def _add(self, value: float) -> None:
+        """Neumaier step: keeps the low-order bits lost by 'total + value'."""
+        total = self._total + value
+        if abs(self._total) >= abs(value):
+            self._compensation += (self._total - total) + value
+        else:
+            self._compensation += (value - total) + self._total
+        self._total = total
+
+    def add(self, value: float) -> None:
+        """Adds one operand."""
+        self._add(value)
+        self.count += 1
+
+    def add_chunk(self, chunk: List[float]) -> None:
+        """Adds a chunk of operands."""
+        try:
+            total = math.fsum(chunk)
+            # fsum rounds once; carry the rounding residual into the compensation too.
+            residual = math.fsum(chain(chunk, (-total,)))
+        except (OverflowError, ValueError):
+            # fsum rejects intermediate overflow and inf - inf; fall back per operand.
+            for value in chunk:
+                self._add(value)
+        else:
+            self._add(total)
+            self._add(residual)
+        self.count += len(chunk)
+
+    @property
+    def result(self) -> float:
+        """The compensated sum of all operands added so far."""
+        if not math.isfinite(self._total):
+            return self._total
+        return self._total + self._compensation
+
+class ProductAccumulator:
+    """Running product."""
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self._total: float = 1.0
+
+    def add(self, value: float) -> None:
+        """Multiplies in one operand."""
+        self._total = Operation.multiplication(self._total, value)
+        self.count += 1
+
+    def add_chunk(self, chunk: List[float]) -> None:
+        """Multiplies in a chunk of operands."""
+        self._total = Operation.multiplication(self._total, math.prod(chunk))
+        self.count += len(chunk)
+
+    @property
+    def result(self) -> float:
+        """The product of all operands added so far."""
+        return self._total
+
+# Reduction name -> accumulator class
+REDUCTIONS: Dict[str, Type] = {
+    "sum": SumAccumulator,
+    "prod": ProductAccumulator,
+}
+
+#--------------------------------------
+# Streaming Helpers
+#--------------------------------------
+
+def chunked(values: Iterable[float], chunk_size: int = CHUNK_SIZE) -> Iterator[List[float]]:
+    """Yields successive lists of at most 'chunk_size' operands."""
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+    iterator = iter(values)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def read_column(path: str, column: int = 0) -> Iterator[float]:
+    """
+    Lazily yields the numbers in one column (0-based) of a text or CSV file.
+
+    Columns are separated by commas if the line contains one, otherwise by
+    whitespace. Blank lines are skipped.
+
+    Raises:
+        ValueError: If a line has no such column or its value is not a number.
+    """
+
+    with open(path, encoding="utf-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            fields = line.split(",") if "," in line else line.split()
+            try:
+                yield float(fields[column])
+            except (IndexError, ValueError):
+                raise ValueError(
+                    f"Line {line_number}: expected a number in column {column + 1}."
+                ) from None
+
+#--------------------------------------
+# Reduction
+#--------------------------------------
+
+def reduce_values(name: str, values: Iterable[float], chunk_size: int = CHUNK_SIZE) -> float:
+    """
+    Reduces any iterable of operands with the named reduction.
+
+    Raises:
+        ValueError: If the reduction is not supported.
+    """
+
+    accumulator_class = REDUCTIONS.get(name)
+    if accumulator_class is None:
+        available = ', '.join(REDUCTIONS)
+        raise ValueError(f"Unsupported reduction: '{name}'. Available reductions: '{available}'")
+
+    accumulator = accumulator_class()
+    for chunk in chunked(values, chunk_size):
+        accumulator.add_chunk(chunk)
+    return accumulator.result
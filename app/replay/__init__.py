@@ -0,0 +1,123 @@
+"""
+app/replay.py
+
+Replays a stored history against the current operator implementations.
+
+Entries are grouped by operator and each group is re-executed with one call to
+the operator's vectorized kernel instead of one 'execute()' per entry. Groups
+without a kernel, or whose kernel raises, fall back to per-entry execution so
+every entry still gets its own result or error.
+"""
+
+import cmath
+import math
+from typing import Dict, Iterable, List, NamedTuple, Union
+from app.calculation import CalculationFactory
+from app.history import HistoryRecord
+
+#--------------------------------------
+# Replay Report
+#--------------------------------------
+
+class ReplayDifference(NamedTuple):
+    """An entry whose replayed result differs from its recorded result."""
+
+    index: int
+    operator: str
+    a: float
+    b: float
+    recorded: float
+    replayed: Union[float, str]   # error message when the replay raised
+
+class ReplayReport(NamedTuple):
+    """Summary of a replay."""
+
+    total: int
+    vectorized: int
+    differences: List[ReplayDifference]
+
+    @property
+    def matched(self) -> int:
+        """Number of entries whose replayed result matches the recorded one."""
+        return self.total - len(self.differences)
+
+#--------------------------------------
+# Helper Functions
+#--------------------------------------
+
+def _same(recorded: float, replayed: float, rel_tol: float, abs_tol: float) -> bool:
+    """Compares results, treating two NaNs as equal and comparing complex results as complex."""
+    if isinstance(recorded, float) and isinstance(replayed, float) \
+            and math.isnan(recorded) and math.isnan(replayed):
+        return True
+    isclose = cmath.isclose if isinstance(recorded, complex) or isinstance(replayed, complex) \
+        else math.isclose
+    try:
+        return isclose(recorded, replayed, rel_tol=rel_tol, abs_tol=abs_tol)
+    except TypeError:
+        return recorded == replayed
+
+def _execute_each(operator: str, a_values: List[float], b_values: List[float]) -> List[Union[float, str]]:
+    """Executes a group one calculation at a time, recording errors as messages."""
+    results: List[Union[float, str]] = []
+    for a, b in zip(a_values, b_values):
+        try:
+            results.append(CalculationFactory.create_calculation(a, operator, b).execute())
+        except Exception as e:
+            results.append(str(e))
+    return results
+
+#--------------------------------------
+# Replay
+#--------------------------------------
+
+def replay_history(
+    records: Iterable[HistoryRecord],
+    rel_tol: float = 0.0,
+    abs_tol: float = 0.0,
+) -> ReplayReport:
+    """
+    Re-executes stored records and reports differences from the recorded results.
+
+    Args:
+        records: Stored records, e.g. from 'load_history'.
+        rel_tol: Relative tolerance used to compare results.
+        abs_tol: Absolute tolerance used to compare results.
+
+    Returns:
+        ReplayReport: Entry count, vectorized entry count and differences in entry order.
+    """
+
+    # Group entries by operator: operator -> (indices, a operands, b operands, recorded results)
+    groups: Dict[str, tuple] = {}
+    total = 0
+    for index, record in enumerate(records):
+        group = groups.get(record.operator)
+        if group is None:
+            group = groups[record.operator] = ([], [], [], [])
+        group[0].append(index)
+        group[1].append(record.a)
+        group[2].append(record.b)
+        group[3].append(record.result)
+        total += 1
+
+    vectorized = 0
+    differences: List[ReplayDifference] = []
+    for operator, (indices, a_values, b_values, recorded) in groups.items():
+        kernel = CalculationFactory.get_kernel(operator)
+        replayed = None
+        if kernel is not None:
+            try:
+                replayed = kernel(a_values, b_values)
+                vectorized += len(indices)
+            except Exception:
+                replayed = None
+        if replayed is None:
+            replayed = _execute_each(operator, a_values, b_values)
+
+        for index, a, b, old, new in zip(indices, a_values, b_values, recorded, replayed):
+            if isinstance(new, str) or not _same(old, new, rel_tol, abs_tol):
+                differences.append(ReplayDifference(index, operator, a, b, old, new))
+
+    differences.sort(key=lambda difference: difference.index)
+    return ReplayReport(total, vectorized, differences)
@@ -0,0 +1,117 @@
+"""
+app/runner.py
+
+Executes calculations on worker threads with a per-calculation timeout.
+
+'CalculationRunner' hands each calculation to a small pool of daemon worker
+threads and waits for the result. A calculation that does not finish in time,
+or whose wait is interrupted with Ctrl-C, is abandoned: the caller gets control
+back immediately while the worker keeps running it in the background (Python
+threads cannot be killed). A replacement worker is started so the pool keeps
+its capacity, and the abandoned worker retires once its calculation ends.
+Workers are daemon threads, so an abandoned calculation never delays exit.
+"""
+
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from queue import SimpleQueue
+from typing import Callable, Optional, Tuple
+from app.calculation import Calculation
+
+# Seconds a REPL calculation may run before it is abandoned.
+DEFAULT_TIMEOUT = 5.0
+
+class CalculationTimeoutError(TimeoutError):
+    """Raised when a calculation does not finish within the runner's timeout."""
+
+Job = Tuple[Optional[Future], Optional[Callable[[], float]]]
+
+class CalculationRunner:
+    """
+    Runs calculations on a pool of daemon worker threads.
+
+    Args:
+        timeout: Seconds to wait for each calculation (None waits forever).
+        workers: Number of worker threads kept ready.
+    """
+
+    def __init__(self, timeout: Optional[float] = DEFAULT_TIMEOUT, workers: int = 2) -> None:
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout must be positive or None.")
+        if workers < 1:
+            raise ValueError("workers must be at least 1.")
+        self.timeout = timeout
+        self.workers = workers
+        self.abandoned = 0
+        self._jobs: "SimpleQueue[Job]" = SimpleQueue()
+        self._lock = threading.Lock()
+        self._running = 0      # worker threads alive, including ones running abandoned jobs
+        self._closed = False
+        for _ in range(workers):
+            self._spawn()
+
+    def _spawn(self) -> None:
+        """Starts one worker thread."""
+        with self._lock:
+            self._running += 1
+        threading.Thread(target=self._work, name="calculation-worker", daemon=True).start()
+
+    def _work(self) -> None:
+        """Worker loop: runs queued jobs until closed or surplus."""
+        while True:
+            future, function = self._jobs.get()
+            if future is None:
+                break
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(function())
+                except BaseException as error:   # delivered to the waiting caller
+                    future.set_exception(error)
+            with self._lock:
+                # A worker that ran an abandoned job was replaced; the surplus retires.
+                if self._closed or self._running > self.workers:
+                    break
+        with self._lock:
+            self._running -= 1
+
+    def _abandon(self, future: Future) -> None:
+        """Gives up on a job, replacing its worker if the job had started."""
+        if not future.cancel() and not future.done():
+            self.abandoned += 1
+            self._spawn()
+
+    def run(self, calculation: Calculation) -> float:
+        """
+        Executes a calculation on a worker and returns its result.
+
+        Raises:
+            CalculationTimeoutError: The calculation did not finish in time.
+            KeyboardInterrupt: The wait was interrupted; the calculation is abandoned.
+            Exception: Whatever 'execute' raised (e.g. ZeroDivisionError).
+        """
+
+        return self.call(calculation.execute)
+
+    def call(self, function: Callable[[], float]) -> float:
+        """Like 'run', for any function of no arguments (e.g. a profiled 'execute')."""
+
+        future: Future = Future()
+        self._jobs.put((future, function))
+        try:
+            return future.result(self.timeout)
+        except FutureTimeoutError:
+            self._abandon(future)
+            raise CalculationTimeoutError(
+                f"Calculation timed out after {self.timeout:g} seconds and was abandoned."
+            ) from None
+        except KeyboardInterrupt:
+            self._abandon(future)
+            raise
+
+    def close(self) -> None:
+        """Stops the idle workers; workers still running abandoned jobs stop when done."""
+        with self._lock:
+            self._closed = True
+            running = self._running
+        for _ in range(running):
+            self._jobs.put((None, None))
@@ -0,0 +1,249 @@
+"""
+app/sandbox.py
+
+Isolated worker processes for untrusted calculations and expressions.
+
+'SandboxPool' keeps a number of pre-forked worker processes warm. Each worker
+runs under a memory limit (RLIMIT_AS) and a per-job CPU-time limit
+(RLIMIT_CPU), so hostile inputs such as giant integer powers or deeply nested
+expressions fail inside the worker instead of taking down the caller:
+    - Running out of memory or recursion depth returns a RESOURCE_LIMIT failure.
+    - Exceeding the CPU limit kills the worker (SIGXCPU); the caller gets a
+      RESOURCE_LIMIT failure.
+    - Not answering within the wall-clock timeout kills the worker; the caller
+      gets a TIMEOUT failure.
+
+Workers are recycled after 'max_jobs' jobs or after any limit breach, and a
+replacement is started at once so a warm worker is always ready. Results are
+returned as Outcomes (see app.outcome): the value, or a Failure.
+
+Limits use the 'resource' module and are skipped where it is unavailable.
+"""
+
+import multiprocessing
+import os
+import queue
+import signal
+from multiprocessing.connection import Connection
+from typing import Any, Mapping, Optional, Tuple
+from app.calculation import CalculationFactory
+from app.expression import evaluate, parse
+from app.outcome import ErrorCode, Failure, Outcome, classify
+
+try:
+    import resource
+except ImportError:   # pragma: no cover - not available on Windows
+    resource = None
+
+# Default limits per worker.
+MEMORY_LIMIT = 256 * 1024 * 1024    # bytes of address space beyond the worker's start size
+CPU_LIMIT = 2                       # CPU seconds per job
+TIMEOUT = 5.0                       # wall-clock seconds per job
+MAX_JOBS = 1000                     # jobs before a worker is recycled
+
+# Message sent to a worker: ('calc', a, type, b) or ('expr', source, variables).
+Job = Tuple[Any, ...]
+
+#--------------------------------------
+# Worker Process
+#--------------------------------------
+
+# The functions below run inside the worker processes, where coverage is not
+# measured; '_run' is also tested in-process.
+
+def _address_space() -> int:   # pragma: no cover - worker process
+    """Current virtual memory size of this process in bytes (0 if unknown)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+def _limit_memory(memory_limit: Optional[int]) -> None:   # pragma: no cover - worker process
+    """Caps the worker's address space at its current size plus 'memory_limit'."""
+    if resource is not None and memory_limit is not None:
+        limit = _address_space() + memory_limit
+        resource.setrlimit(resource.RLIMIT_AS, (limit, resource.getrlimit(resource.RLIMIT_AS)[1]))
+
+def _limit_cpu(cpu_limit: Optional[int]) -> None:   # pragma: no cover - worker process
+    """Allows the next job 'cpu_limit' more CPU seconds before SIGXCPU."""
+    if resource is not None and cpu_limit is not None:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        used = int(usage.ru_utime + usage.ru_stime) + 1
+        hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+        soft = used + cpu_limit
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+def _run(job: Job) -> Outcome:
+    """Evaluates one job: ('calc', a, type, b) or ('expr', source, variables)."""
+    try:
+        if job[0] == "calc":
+            _, a, calculation_type, b = job
+            calculation_class = CalculationFactory.get_calculation_class(calculation_type)
+            if calculation_class is None:
+                return Failure(ErrorCode.UNSUPPORTED_OPERATOR,
+                               CalculationFactory.unsupported_message(calculation_type))
+            return calculation_class(a, b).evaluate()
+        _, source, variables = job
+        try:
+            tree = parse(source)
+        except ValueError as error:
+            return Failure(ErrorCode.INVALID_INPUT, str(error))
+        return evaluate(tree, variables)
+    except Exception as error:   # MemoryError and RecursionError are limit breaches
+        return Failure(classify(error), str(error) or type(error).__name__)
+
+def _serve(connection: Connection, memory_limit: Optional[int], cpu_limit: Optional[int]) -> None:   # pragma: no cover - worker process
+    """Worker main loop: applies the limits, then answers jobs until told to stop."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)   # Ctrl-C is the parent's to handle
+    _limit_memory(memory_limit)
+    while True:
+        job = connection.recv()
+        if job is None:
+            break
+        _limit_cpu(cpu_limit)
+        outcome = _run(job)
+        connection.send(outcome)
+        if type(outcome) is Failure and outcome.code is ErrorCode.RESOURCE_LIMIT:
+            break   # the parent recycles this worker
+    connection.close()
+
+class _Worker:
+    """Parent-side handle of one worker process."""
+
+    def __init__(self, context, memory_limit: Optional[int], cpu_limit: Optional[int]) -> None:
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child, memory_limit, cpu_limit),
+                                       daemon=True)
+        self.process.start()
+        child.close()
+        self.jobs = 0
+
+    def stop(self) -> None:
+        """Asks the worker to exit, killing it if it does not."""
+        try:
+            self.connection.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(0.5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+
+#--------------------------------------
+# Sandbox Pool
+#--------------------------------------
+
+class SandboxPool:
+    """
+    Evaluates calculations and expressions in limited, recycled worker processes.
+
+    Args:
+        workers: Number of warm worker processes.
+        max_jobs: Jobs a worker runs before it is recycled.
+        memory_limit: Bytes of extra address space per worker (None: unlimited).
+        cpu_limit: CPU seconds per job (None: unlimited).
+        timeout: Wall-clock seconds to wait for each job.
+
+    Safe to use from several threads; each job holds one worker while it runs.
+    """
+
+    def __init__(self, workers: int = 2, max_jobs: int = MAX_JOBS,
+                 memory_limit: Optional[int] = MEMORY_LIMIT, cpu_limit: Optional[int] = CPU_LIMIT,
+                 timeout: float = TIMEOUT) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1.")
+        if max_jobs < 1:
+            raise ValueError("max_jobs must be at least 1.")
+        if timeout <= 0:
+            raise ValueError("timeout must be positive.")
+        self.max_jobs = max_jobs
+        self.memory_limit = memory_limit
+        self.cpu_limit = cpu_limit
+        self.timeout = timeout
+        self.started = 0
+        self.recycled = 0
+        self._context = multiprocessing.get_context()
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._closed = False
+        for _ in range(workers):
+            self._idle.put(self._start())
+
+    def _start(self) -> _Worker:
+        """Starts a worker process."""
+        self.started += 1
+        return _Worker(self._context, self.memory_limit, self.cpu_limit)
+
+    def _recycle(self, worker: _Worker) -> None:
+        """Stops a worker and puts a fresh one in its place."""
+        self.recycled += 1
+        worker.stop()
+        if not self._closed:
+            self._idle.put(self._start())
+
+    def _submit(self, job: Job) -> Outcome:
+        """Runs a job on an idle worker, recycling the worker when needed."""
+        if self._closed:
+            raise ValueError("The sandbox pool is closed.")
+        worker = self._idle.get()
+        worker.jobs += 1
+        outcome: Optional[Outcome] = None
+        try:
+            try:
+                worker.connection.send(job)
+                if not worker.connection.poll(self.timeout):
+                    worker.process.kill()
+                    outcome = Failure(ErrorCode.TIMEOUT,
+                                      f"Sandbox job timed out after {self.timeout:g} seconds.")
+                else:
+                    outcome = worker.connection.recv()
+            except (EOFError, OSError):
+                outcome = self._died(worker)
+        finally:
+            # Any other exception (an unpicklable job, Ctrl-C while waiting) leaves
+            # 'outcome' unset; the worker may still owe a reply, so it is replaced.
+            if outcome is None \
+                    or (type(outcome) is Failure
+                        and outcome.code in (ErrorCode.RESOURCE_LIMIT, ErrorCode.TIMEOUT)) \
+                    or worker.jobs >= self.max_jobs:
+                self._recycle(worker)
+            else:
+                self._idle.put(worker)
+        return outcome
+
+    @staticmethod
+    def _died(worker: _Worker) -> Failure:
+        """Describes a worker that exited while running a job."""
+        worker.process.join(1)
+        if worker.process.exitcode == -signal.SIGXCPU:
+            return Failure(ErrorCode.RESOURCE_LIMIT, "Sandbox CPU limit exceeded.")
+        return Failure(ErrorCode.RESOURCE_LIMIT,
+                       f"Sandbox worker exited unexpectedly (exit code {worker.process.exitcode}).")
+
+    def evaluate(self, a: float, calculation_type: str, b: float) -> Outcome:
+        """Evaluates 'a <calculation_type> b' in a worker; returns the result or a Failure."""
+        return self._submit(("calc", a, calculation_type, b))
+
+    def evaluate_expression(self, source: str,
+                            variables: Optional[Mapping[str, float]] = None) -> Outcome:
+        """Parses and evaluates an expression in a worker; returns the result or a Failure."""
+        return self._submit(("expr", source, dict(variables or {})))
+
+    def close(self) -> None:
+        """Stops all idle workers."""
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.stop()
+
+    def __enter__(self) -> "SandboxPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
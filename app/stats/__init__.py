@@ -0,0 +1,109 @@
+"""
+app/stats.py
+
+Running statistics over calculation results.
+
+Aggregates are updated incrementally as each result is recorded (Welford's
+algorithm for mean and variance), so reading them is O(1) at any time.
+Results that are not finite real numbers are counted but not aggregated: one
+'inf' would otherwise make the mean and variance 'nan' for good.
+"""
+
+import math
+from typing import Dict, Optional
+
+#--------------------------------------
+# Running Statistics
+#--------------------------------------
+
+class RunningStats:
+    """Count, mean, variance, min and max of a stream of values."""
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.mean: float = 0.0
+        self._m2: float = 0.0
+        self.minimum: Optional[float] = None
+        self.maximum: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        """Adds one value (Welford update)."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    @property
+    def variance(self) -> float:
+        """Population variance (0.0 for fewer than two values)."""
+        return self._m2 / self.count if self.count > 1 else 0.0
+
+    @property
+    def sample_variance(self) -> float:
+        """Sample variance (0.0 for fewer than two values)."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        """Population standard deviation."""
+        return math.sqrt(self.variance)
+
+class ResultStatistics:
+    """Running statistics of calculation results, overall and per operator."""
+
+    def __init__(self) -> None:
+        self.overall = RunningStats()
+        self.by_operator: Dict[str, RunningStats] = {}
+        self.skipped: int = 0      # results that are not real numbers (e.g. complex powers)
+        self.non_finite: int = 0   # inf and nan results (e.g. an overflowing product)
+
+    def record(self, operator: str, result: float) -> None:
+        """Records the result of one calculation."""
+
+        if isinstance(result, complex):
+            self.skipped += 1
+            return
+        if isinstance(result, float) and not math.isfinite(result):
+            self.non_finite += 1
+            return
+        self.overall.add(result)
+        stats = self.by_operator.get(operator)
+        if stats is None:
+            stats = self.by_operator[operator] = RunningStats()
+        stats.add(result)
+
+    def summary(self) -> str:
+        """Human-readable summary of the aggregates."""
+
+        overall = self.overall
+        if overall.count == 0:
+            skipped = []
+            if self.skipped:
+                skipped.append(f"{self.skipped} non-real")
+            if self.non_finite:
+                skipped.append(f"{self.non_finite} inf or nan")
+            if skipped:
+                return f"No finite real calculation results yet ({', '.join(skipped)})."
+            return "No calculation results yet."
+        lines = [
+            "Result Statistics:",
+            f"    count    : {overall.count}",
+            f"    mean     : {overall.mean}",
+            f"    variance : {overall.variance}",
+            f"    stdev    : {overall.stdev}",
+            f"    min      : {overall.minimum}",
+            f"    max      : {overall.maximum}",
+            "    per operator:",
+        ]
+        for operator, stats in self.by_operator.items():
+            lines.append(f"        {operator:<3}: count={stats.count} mean={stats.mean} "
+                         f"min={stats.minimum} max={stats.maximum}")
+        if self.skipped:
+            lines.append(f"    skipped (non-real results): {self.skipped}")
+        if self.non_finite:
+            lines.append(f"    skipped (inf or nan results): {self.non_finite}")
+        return "\n".join(lines)
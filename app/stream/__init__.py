@@ -0,0 +1,137 @@
+"""
+app/stream.py
+
+Streaming evaluation of calculations.
+
+'evaluate_stream' takes any iterable of '(a, operator, b)' tuples or text lines
+('<number1> <operator> <number2>') and lazily yields one result or structured
+error per item. Items are consumed one at a time, so memory use stays constant
+and the generator can be chained with other generators over very large inputs.
+
+Calculations are evaluated with 'Calculation.evaluate', so failing items
+(e.g. zero divisors) are reported without raising an exception per item.
+
+With a Tracer (see app.tracing), the parse, dispatch and execute stages of
+each item are recorded as spans in the "batch" category.
+"""
+
+from typing import Iterable, Iterator, NamedTuple, Optional, Tuple, Union
+from app.calculation import Calculation, CalculationFactory
+from app.outcome import ErrorCode, ErrorCounts, Failure
+from app.parser import INVALID_INPUT, INVALID_INPUT_MESSAGE, UNSUPPORTED_OPERATOR, Operand, parse_tokens
+from app.tracing import Tracer, now
+
+# Error codes reported by StreamError (INVALID_INPUT and UNSUPPORTED_OPERATOR come from app.parser).
+DIVIDE_BY_ZERO = ErrorCode.DIVIDE_BY_ZERO
+OVERFLOW = ErrorCode.OVERFLOW
+DOMAIN_ERROR = ErrorCode.DOMAIN_ERROR
+CALCULATION_ERROR = ErrorCode.CALCULATION_ERROR
+
+StreamItem = Union[str, Tuple[float, str, float]]
+
+#--------------------------------------
+# Stream Outcomes
+#--------------------------------------
+
+class StreamResult(NamedTuple):
+    """A successfully executed calculation."""
+
+    index: int
+    calculation: Calculation
+    result: float
+
+    ok = True
+
+class StreamError(NamedTuple):
+    """An item that could not be evaluated."""
+
+    index: int
+    item: StreamItem
+    code: str
+    message: str
+
+    ok = False
+
+#--------------------------------------
+# Helper Functions
+#--------------------------------------
+
+def _numeric(name: Optional[str], a: Operand, b: Operand) -> bool:
+    """True if a parsed line is a plain calculation: numeric operands and no assignment."""
+    return name is None and type(a) is not str and type(b) is not str
+
+def parse_line(line: str) -> Tuple[float, str, float]:
+    """
+    Parses '<number1> <operator> <number2>' into its operands and operator.
+
+    Raises:
+        ValueError: If the line is not in the expected format or the operator is unsupported.
+    """
+
+    name, a, operator, b, error, message = parse_tokens(line.split())
+    if error is not None:
+        raise ValueError(message)
+    if not _numeric(name, a, b):
+        raise ValueError(INVALID_INPUT_MESSAGE)
+    return a, operator, b
+
+#--------------------------------------
+# Streaming Evaluation
+#--------------------------------------
+
+def evaluate_stream(items: Iterable[StreamItem],
+                    tracer: Optional[Tracer] = None) -> Iterator[Union[StreamResult, StreamError]]:
+    """
+    Lazily evaluates each item, yielding a StreamResult or a StreamError.
+
+    Blank text lines are skipped but still counted in 'index', which is the
+    zero-based position of the item in the input.
+
+    With a 'tracer', each item's stages are recorded as spans.
+    """
+
+    start = 0
+    for index, item in enumerate(items):
+        if tracer is not None:
+            start = now()
+        if isinstance(item, str):
+            tokens = item.split()
+            name, a, operator, b, error, message = parse_tokens(tokens)
+            if tracer is not None:
+                start = tracer.complete("parse", start, "batch")
+            if error is not None:
+                if tokens:
+                    yield StreamError(index, item, error, message)
+                continue
+            if not _numeric(name, a, b):
+                yield StreamError(index, item, INVALID_INPUT, INVALID_INPUT_MESSAGE)
+                continue
+        else:
+            try:
+                a, operator, b = item
+            except (TypeError, ValueError):
+                yield StreamError(index, item, INVALID_INPUT, INVALID_INPUT_MESSAGE)
+                continue
+
+        try:
+            calculation = CalculationFactory.create_calculation(a, operator, b)
+        except ValueError as ve:
+            yield StreamError(index, item, UNSUPPORTED_OPERATOR, str(ve))
+            continue
+        except TypeError:   # unhashable operator in a tuple, e.g. ['+']
+            yield StreamError(index, item, INVALID_INPUT, INVALID_INPUT_MESSAGE)
+            continue
+        if tracer is not None:
+            start = tracer.complete("dispatch", start, "batch")
+
+        outcome = calculation.evaluate()
+        if tracer is not None:
+            tracer.complete("execute", start, "batch")
+        if type(outcome) is Failure:
+            yield StreamError(index, item, outcome.code, outcome.message)
+        else:
+            yield StreamResult(index, calculation, outcome)
+
+def count_errors(outcomes: Iterable[Union[StreamResult, StreamError]]) -> ErrorCounts:
+    """Consumes 'evaluate_stream' outcomes and returns the number of errors per code."""
+    return ErrorCounts.of(None if outcome.ok else outcome.code for outcome in outcomes)
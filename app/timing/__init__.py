@@ -0,0 +1,123 @@
+"""
+app/timing.py
+
+Micro-benchmarks of a single calculation, for the REPL 'timeit' command.
+
+'time_calculation' evaluates '<a> <operator> <b>' 'n' times on each path and
+returns per-call latency statistics in nanoseconds:
+    - factory: 'CalculationFactory.create_calculation' and 'execute', as the REPL runs it.
+    - evaluate: 'Calculation.evaluate' on a prebuilt calculation (the exception-free path).
+    - vectorized: the operator's 'VectorOperation' kernel over 'n' operand pairs,
+      per element (only for operators with a kernel).
+
+Calls on the first two paths are timed one at a time, with the cost of reading
+the clock subtracted, so the statistics describe the spread between calls.
+The vectorized path is timed per kernel call over REPEAT runs.
+"""
+
+import time
+from array import array
+from typing import Callable, List, NamedTuple, Sequence
+from app.calculation import CalculationFactory
+
+# Default number of calls per path.
+DEFAULT_CALLS = 10_000
+
+# Kernel runs on the vectorized path.
+REPEAT = 5
+
+class Timing(NamedTuple):
+    """Per-call latency statistics of one path, in nanoseconds."""
+
+    path: str
+    calls: int
+    minimum: float
+    median: float
+    p95: float
+    mean: float
+
+#--------------------------------------
+# Helper Functions
+#--------------------------------------
+
+def _timing(path: str, samples: List[float]) -> Timing:
+    """Summarizes latency samples."""
+    samples.sort()
+    last = len(samples) - 1
+    return Timing(path, len(samples), samples[0], samples[last // 2],
+                  samples[int(last * 0.95)], sum(samples) / len(samples))
+
+def _clock_overhead(calls: int) -> int:
+    """Smallest time measured around nothing: the cost of reading the clock."""
+    clock = time.perf_counter_ns
+    overhead = min(-clock() + clock() for _ in range(min(calls, 1000)))
+    return max(overhead, 0)
+
+def _per_call(function: Callable[[], object], calls: int) -> List[float]:
+    """Times 'calls' calls of 'function' one at a time, minus the clock overhead."""
+    clock = time.perf_counter_ns
+    overhead = _clock_overhead(calls)
+    samples = []
+    append = samples.append
+    for _ in range(calls):
+        start = clock()
+        function()
+        append(max(clock() - start - overhead, 0))
+    return samples
+
+def _per_element(kernel: Callable, a: Sequence[float], b: Sequence[float]) -> List[float]:
+    """Times REPEAT kernel runs over 'a' and 'b'; returns nanoseconds per element."""
+    out = array('d', bytes(8 * len(a)))
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter_ns()
+        kernel(a, b, out)
+        samples.append((time.perf_counter_ns() - start) / len(a))
+    return samples
+
+#--------------------------------------
+# Timing
+#--------------------------------------
+
+def time_calculation(a: float, calculation_type: str, b: float,
+                     calls: int = DEFAULT_CALLS) -> List[Timing]:
+    """
+    Times a calculation on each path; nothing is recorded in any history.
+
+    Raises:
+        ValueError: If the operator is unsupported, 'calls' is below one, or the
+            calculation fails (there is no result to time).
+    """
+
+    if calls < 1:
+        raise ValueError("The number of calls must be at least 1.")
+    calculation = CalculationFactory.create_calculation(a, calculation_type, b)
+    try:
+        calculation.execute()
+    except Exception as error:
+        raise ValueError(f"Cannot time a failing calculation: {error}") from None
+
+    create = CalculationFactory.create_calculation
+    timings = [
+        _timing("factory", _per_call(lambda: create(a, calculation_type, b).execute(), calls)),
+        _timing("evaluate", _per_call(calculation.evaluate, calls)),
+    ]
+    kernel = CalculationFactory.get_kernel(calculation_type)
+    if kernel is not None:
+        try:
+            samples = _per_element(kernel, array('d', [a]) * calls, array('d', [b]) * calls)
+        except (OverflowError, ValueError, TypeError):   # results that are not float64 (e.g. complex)
+            pass
+        else:
+            timings.append(_timing("vectorized", samples))
+    return timings
+
+def format_timings(expression: str, timings: Sequence[Timing]) -> str:
+    """Renders timings as a table, one row per path."""
+    lines = [f"timeit {expression}: {timings[0].calls} calls",
+             f"{'path':<11} {'min ns':>9} {'median ns':>10} {'p95 ns':>9} {'mean ns':>9}"]
+    for timing in timings:
+        note = " (per element)" if timing.path == "vectorized" else ""
+        lines.append(f"{timing.path:<11} {timing.minimum:>9.0f} {timing.median:>10.0f} "
+                     f"{timing.p95:>9.0f} {timing.mean:>9.0f}{note}")
+    return "\n".join(lines)
@@ -0,0 +1,119 @@
+"""
+app/tracing.py
+
+Optional tracing of the stages of an evaluation.
+
+A 'Tracer' records spans (parse, dispatch, execute, ...) with start times and
+durations, and writes them as a Chrome trace file: JSON that can be opened in
+chrome://tracing or https://ui.perfetto.dev. Each span is a complete ('X')
+event on the thread that recorded it.
+
+Two ways to record:
+    - 'span(name)' is a context manager, for code that runs once per user input.
+    - 'complete(name, start)' records a span that started at 'start' (from
+      'now()') and returns its end time, so consecutive stages share one clock
+      read. Hot loops guard it with 'if tracer is not None', which is all that
+      tracing costs them when it is off.
+
+'NULL_TRACER' accepts the same calls and records nothing, so code that runs
+once per input can call 'span' unconditionally.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, TextIO
+
+# Clock used for span timestamps, in nanoseconds.
+now = time.perf_counter_ns
+
+#--------------------------------------
+# Spans
+#--------------------------------------
+
+class _Span:
+    """Context manager recording one span on exit."""
+
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: Dict[str, Any]) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self) -> "_Span":
+        self.start = now()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.complete(self.name, self.start, self.category, self.args)
+
+class _NullSpan:
+    """Context manager that records nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+#--------------------------------------
+# Tracers
+#--------------------------------------
+
+class Tracer:
+    """Records spans in memory and writes them as a Chrome trace."""
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self.events: List[Dict[str, Any]] = []
+        self._pid = os.getpid()
+
+    def span(self, name: str, category: str = "calculator", **args: Any) -> _Span:
+        """Returns a context manager recording a span around its block."""
+        return _Span(self, name, category, args)
+
+    def complete(self, name: str, start: int, category: str = "calculator",
+                 args: Optional[Dict[str, Any]] = None) -> int:
+        """Records a span from 'start' (a 'now()' value) until now; returns the end time."""
+        end = now()
+        event = {"name": name, "cat": category, "ph": "X", "ts": start / 1000,
+                 "dur": (end - start) / 1000, "pid": self._pid, "tid": threading.get_ident()}
+        if args:
+            event["args"] = args
+        self.events.append(event)   # list.append is atomic, so threads may share a tracer
+        return end
+
+    def dump(self, stream: TextIO) -> None:
+        """Writes the recorded spans to 'stream' in Chrome trace format."""
+        json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, stream)
+
+    def write(self, path: str) -> None:
+        """Writes the recorded spans to a trace file at 'path'."""
+        with open(path, "w", encoding="utf-8") as trace_file:
+            self.dump(trace_file)
+
+class NullTracer:
+    """Tracer that records nothing; used when tracing is off."""
+
+    enabled = False
+
+    def span(self, name: str, category: str = "calculator", **args: Any) -> _NullSpan:
+        """Returns a shared context manager that does nothing."""
+        return _NULL_SPAN
+
+    def complete(self, name: str, start: int, category: str = "calculator",
+                 args: Optional[Dict[str, Any]] = None) -> int:
+        """Records nothing; returns the current time like 'Tracer.complete'."""
+        return now()
+
+NULL_TRACER = NullTracer()
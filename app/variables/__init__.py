@@ -0,0 +1,235 @@
+"""
+app/variables.py
+
+Named variables and 'ans' for the REPL calculator.
+
+A Workspace keeps the definition ('<operand> <operator> <operand>') and the
+Calculation of every variable, plus a dependency graph between variables.
+When a variable is redefined only the variables that depend on it, directly
+or transitively, are recomputed, in dependency order.
+
+Calculations are executed with the Workspace's 'execute' function, so the
+REPL can run recomputations on its CalculationRunner (with its timeout and
+Ctrl-C abandonment) like any other calculation.
+"""
+
+from collections import deque
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple, Union
+from app.calculation import Calculation, CalculationFactory
+from app.parser import parse_operand
+from app.reduction import REDUCTIONS
+
+# Name that always refers to the most recent result.
+ANS = "ans"
+
+# Names the REPL reads as commands when they start a line, so they cannot be assigned.
+RESERVED = frozenset((ANS, "timeit", *REDUCTIONS))
+
+#--------------------------------------
+# Errors
+#--------------------------------------
+
+class UndefinedVariableError(ValueError):
+    """Raised when an operand names a variable that has no value."""
+
+class CircularDefinitionError(ValueError):
+    """Raised when a definition would make a variable depend on itself."""
+
+#--------------------------------------
+# Definitions
+#--------------------------------------
+
+class Definition(NamedTuple):
+    """
+    The expression a variable was assigned: '<a> <operator> <b>'.
+
+    Operands are tokens; once bound, an 'ans' operand is replaced by the value
+    it had, so recomputation never reads a later 'ans'.
+    """
+
+    a: Union[str, float]
+    operator: str
+    b: Union[str, float]
+
+class Update(NamedTuple):
+    """Outcome of recomputing a dependent variable."""
+
+    name: str
+    calculation: Optional[Calculation]
+    error: Optional[Exception]
+
+#--------------------------------------
+# Workspace
+#--------------------------------------
+
+class Workspace:
+    """
+    Variables of a REPL session and the dependencies between them.
+
+    Args:
+        execute: Executes a calculation and returns its result (None: its own 'execute').
+    """
+
+    def __init__(self, execute: Optional[Callable[[Calculation], float]] = None) -> None:
+        self.execute = execute
+        self.ans: Optional[float] = None
+        self.values: Dict[str, float] = {}
+        self.definitions: Dict[str, Definition] = {}
+        self.calculations: Dict[str, Calculation] = {}
+        # variable -> variables whose definition uses it (dict used as an ordered set)
+        self._dependents: Dict[str, Dict[str, None]] = {}
+
+    @staticmethod
+    def is_valid_name(name: str) -> bool:
+        """Returns True if 'name' can be assigned to."""
+        return name.isidentifier() and name not in RESERVED
+
+    def resolve(self, token: Union[str, float]) -> float:
+        """
+        Returns the value of an operand: a number, 'ans' or a variable name.
+
+        Raises:
+            UndefinedVariableError: If the token names a variable without a value.
+        """
+
+        if not isinstance(token, str):
+            return token
+        if token == ANS and self.ans is not None:
+            return self.ans
+        if token in self.values:
+            return self.values[token]
+        value = parse_operand(token)   # names are not tried with float(), which would raise
+        if type(value) is float:
+            return value
+        raise UndefinedVariableError(f"Undefined variable: '{token}'.")
+
+    def _dependencies(self, definition: Definition) -> Set[str]:
+        """Variable names used by a definition ('ans' is a snapshot, not a dependency)."""
+        return {token for token in (definition.a, definition.b)
+                if isinstance(token, str) and token != ANS and token.isidentifier()}
+
+    @staticmethod
+    def _snapshot(definition: Definition, calculation: Calculation) -> Definition:
+        """Replaces 'ans' operands with the values the calculation was created with."""
+        if definition.a == ANS:
+            definition = definition._replace(a=calculation.a)
+        if definition.b == ANS:
+            definition = definition._replace(b=calculation.b)
+        return definition
+
+    def dependents(self, name: str) -> List[str]:
+        """Returns every variable that depends on 'name', directly or transitively."""
+
+        found: Dict[str, None] = {}
+        queue = deque([name])
+        while queue:
+            for dependent in self._dependents.get(queue.popleft(), {}):
+                if dependent not in found:
+                    found[dependent] = None
+                    queue.append(dependent)
+        return list(found)
+
+    def _calculate(self, definition: Definition) -> Tuple[Calculation, float]:
+        """Creates the calculation of a definition and executes it with 'execute'."""
+        calculation = CalculationFactory.create_calculation(
+            self.resolve(definition.a), definition.operator, self.resolve(definition.b)
+        )
+        if self.execute is None:
+            return calculation, calculation.execute()
+        return calculation, self.execute(calculation)
+
+    def _store(self, name: str, definition: Definition,
+               calculation: Calculation, result: float) -> None:
+        """Records a variable's definition, calculation and value."""
+        self.definitions[name] = definition
+        self.calculations[name] = calculation
+        self.values[name] = result
+
+    def assign(self, name: str, a: str, operator: str, b: str) -> Tuple[Calculation, float, List[Update]]:
+        """
+        Assigns '<a> <operator> <b>' to 'name' and recomputes its dependents.
+
+        The workspace is left unchanged if the assignment itself fails.
+
+        Returns:
+            The new calculation, its result and the updates of dependent variables.
+
+        Raises:
+            ValueError: Invalid name, circular definition or unsupported operator.
+            UndefinedVariableError: An operand has no value.
+            ZeroDivisionError: The calculation divides by zero.
+        """
+
+        definition = Definition(a, operator, b)
+        self._check(name, definition)
+        calculation, result = self._calculate(definition)
+        return calculation, result, self.bind(name, definition, calculation, result)
+
+    def _check(self, name: str, definition: Definition) -> List[str]:
+        """Validates a definition of 'name' and returns the variables depending on it."""
+
+        if name in RESERVED:
+            raise ValueError(f"Invalid variable name: '{name}' is a reserved word.")
+        if not self.is_valid_name(name):
+            raise ValueError(f"Invalid variable name: '{name}'.")
+        dependencies = self._dependencies(definition)
+        affected = self.dependents(name)
+        if name in dependencies or dependencies.intersection(affected):
+            raise CircularDefinitionError(f"Circular definition: '{name}' would depend on itself.")
+        return affected
+
+    def bind(self, name: str, definition: Definition,
+             calculation: Calculation, result: float) -> List[Update]:
+        """
+        Binds an already executed calculation to 'name' and recomputes its dependents.
+
+        Returns:
+            The updates of dependent variables, in the order they were recomputed.
+
+        Raises:
+            ValueError: Invalid name or circular definition (the workspace is unchanged).
+        """
+
+        affected = self._check(name, definition)
+        definition = self._snapshot(definition, calculation)
+
+        # Replace the dependency edges of the previous definition.
+        previous = self.definitions.get(name)
+        if previous is not None:
+            for dependency in self._dependencies(previous):
+                self._dependents.get(dependency, {}).pop(name, None)
+        for dependency in self._dependencies(definition):
+            self._dependents.setdefault(dependency, {})[name] = None
+
+        self._store(name, definition, calculation, result)
+        self.ans = result
+        return self._recompute(affected)
+
+    def _recompute(self, affected: List[str]) -> List[Update]:
+        """Recomputes the affected variables in dependency order."""
+
+        affected_set = set(affected)
+        pending = {name: len(self._dependencies(self.definitions[name]) & affected_set)
+                   for name in affected}
+        ready = deque(name for name in affected if pending[name] == 0)
+        updates: List[Update] = []
+
+        while ready:
+            name = ready.popleft()
+            definition = self.definitions[name]
+            try:
+                calculation, result = self._calculate(definition)
+            except (ValueError, ArithmeticError, TimeoutError, InterruptedError) as error:
+                # The variable keeps its definition but has no value until fixed.
+                self.values.pop(name, None)
+                self.calculations.pop(name, None)
+                updates.append(Update(name, None, error))
+            else:
+                self._store(name, definition, calculation, result)
+                updates.append(Update(name, calculation, None))
+
+            for dependent in self._dependents.get(name, {}):
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    ready.append(dependent)
+        return updates
@@ -0,0 +1,49 @@
+"""
+benchmarks/bench_audit.py
+
+Caller-side cost of auditing a calculation: AuditLog.record (queue, background
+writer) against rendering and writing each record synchronously.
+
+Usage:
+    python -m benchmarks.bench_audit
+"""
+
+import os
+import tempfile
+import time
+from typing import Tuple
+from app.audit import BLOCK, AuditLog, _render
+from app.calculation import CalculationFactory
+
+def synchronous(path: str, calculation, records: int) -> float:
+    """Seconds per record when each record is written and flushed by the caller."""
+    with open(path, "a", encoding="utf-8") as log:
+        start = time.perf_counter()
+        for _ in range(records):
+            log.write(_render((time.time(), calculation.operator, calculation.a, calculation.b,
+                               3.0, 1e-6)))
+            log.flush()
+        return (time.perf_counter() - start) / records
+
+def queued(path: str, calculation, records: int) -> Tuple[float, int]:
+    """Seconds per record spent in AuditLog.record, and the number of writes it took."""
+    with AuditLog(path, queue_size=records, policy=BLOCK) as audit:
+        start = time.perf_counter()
+        for _ in range(records):
+            audit.record(calculation, 3.0, 1e-6)
+        elapsed = time.perf_counter() - start
+    return elapsed / records, audit.writes
+
+def main(records: int = 100_000) -> None:
+    """Prints the caller-side time per record for both approaches."""
+
+    calculation = CalculationFactory.create_calculation(1.0, '+', 2.0)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "audit.jsonl")
+        sync = synchronous(path, calculation, records)
+        print(f"synchronous write+flush: {sync * 1e9:>7.0f} ns/record")
+        background, writes = queued(path, calculation, records)
+        print(f"AuditLog.record:         {background * 1e9:>7.0f} ns/record ({writes} writes)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+benchmarks/bench_chunked.py
+
+Compares whole-array evaluation (one full-size temporary per operator) with
+chunked evaluation, reporting time and peak traced memory.
+
+Usage:
+    python -m benchmarks.bench_chunked [elements]
+"""
+
+import sys
+import time
+import tracemalloc
+from array import array
+from app.chunked import evaluate_arrays
+from app.operation import VectorOperation
+
+SOURCE = "a * b + c % d"
+
+def naive(a, b, c, d) -> array:
+    """Evaluates SOURCE with full-size temporaries."""
+    product = VectorOperation.multiplication(a, b, out=array('d', [0.0]) * len(a))
+    remainder = VectorOperation.modulus(c, d, out=array('d', [0.0]) * len(a))
+    return VectorOperation.addition(product, remainder, out=array('d', [0.0]) * len(a))
+
+def measure(label: str, function) -> None:
+    """Prints the wall time of one call and, in a second traced call, its peak allocation."""
+    started = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<10} {elapsed:>8.3f}s  peak {peak / 2**20:>8.1f} MiB")
+
+def main(elements: int = 2_000_000) -> None:
+    a = array('d', (float(i) for i in range(elements)))
+    b = array('d', [1.5]) * elements
+    c = array('d', (float(i % 97) for i in range(elements)))
+    d = array('d', [7.0]) * elements
+    print(f"{SOURCE} over {elements:,} elements")
+    measure("naive", lambda: naive(a, b, c, d))
+    measure("chunked", lambda: evaluate_arrays(SOURCE, {"a": a, "b": b, "c": c, "d": d}))
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000)
@@ -0,0 +1,68 @@
+"""
+benchmarks/bench_history.py
+
+Compression ratio and access latency of History's compressed chunks, on a
+skewed REPL-like session: a few operators dominate and operands are mostly
+small whole numbers.
+
+Usage:
+    python -m benchmarks.bench_history
+"""
+
+import random
+import time
+import tracemalloc
+from app.calculation import CalculationFactory
+from app.history import CHUNK_SIZE, History, _RECORD
+
+OPERATORS = ['+', '-', '*', '/', '**', '%']
+WEIGHTS = [40, 20, 20, 10, 5, 5]
+
+def session(entries: int, seed: int = 1):
+    """Builds a skewed list of calculations."""
+    rng = random.Random(seed)
+    calculations = []
+    for operator in rng.choices(OPERATORS, WEIGHTS, k=entries):
+        a = float(min(int(rng.paretovariate(1.2)), 1000))
+        b = float(min(int(rng.paretovariate(1.2)), 10)) if rng.random() < 0.9 else rng.uniform(1, 10)
+        calculations.append(CalculationFactory.create_calculation(a, operator, b))
+    return calculations
+
+def access(history: History, rng: random.Random, lookups: int = 2000) -> tuple:
+    """Microseconds per random sealed lookup and per entry of a full iteration."""
+    indexes = [rng.randrange(history.sealed) for _ in range(lookups)]
+    start = time.perf_counter()
+    for index in indexes:
+        history[index]
+    random_us = (time.perf_counter() - start) / lookups * 1e6
+    start = time.perf_counter()
+    count = sum(1 for _ in history)
+    return random_us, (time.perf_counter() - start) / count * 1e6
+
+def main(entries: int = 200_000) -> None:
+    """Prints bytes per entry and access latency per storage option."""
+
+    tracemalloc.start()
+    calculations = session(entries)
+    objects = tracemalloc.get_traced_memory()[0] / entries
+    tracemalloc.stop()
+    print(f"{entries} entries; Calculation objects: {objects:.0f} B/entry, "
+          f"packed records: {_RECORD.size} B/entry")
+    print(f"{'codec':<6} {'compressed B/entry':>19} {'ratio vs packed':>16} "
+          f"{'random lookup us':>17} {'iteration us/entry':>19}")
+    rng = random.Random(2)
+    for codec in ("zlib", "lzma"):
+        history = History(calculations, codec=codec)
+        compressed = history.compressed_bytes() / history.sealed
+        random_us, iterate_us = access(history, rng)
+        print(f"{codec:<6} {compressed:>19.2f} {_RECORD.size / compressed:>15.1f}x "
+              f"{random_us:>17.1f} {iterate_us:>19.2f}")
+    plain = History(calculations, chunk_size=entries)
+    start = time.perf_counter()
+    for index in (rng.randrange(entries) for _ in range(2000)):
+        plain[index]
+    print(f"uncompressed random lookup: {(time.perf_counter() - start) / 2000 * 1e6:.2f} us "
+          f"(chunk size {CHUNK_SIZE})")
+
+if __name__ == "__main__":
+    main()
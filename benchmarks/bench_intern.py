@@ -0,0 +1,67 @@
+"""
+benchmarks/bench_intern.py
+
+Memory saved by interning repeated calculations, on skewed REPL-like inputs
+where a small set of (operator, a, b) triples makes up most of a session,
+and the cost of creating calculations with interning on.
+
+Usage:
+    python -m benchmarks.bench_intern
+"""
+
+import random
+import timeit
+import tracemalloc
+from app.calculation import CalculationFactory
+from app.history import History
+
+OPERATORS = ['+', '-', '*', '/', '**', '%']
+
+def triples(entries: int, distinct: int, seed: int = 1) -> list:
+    """'entries' triples drawn with Zipf-like weights from 'distinct' possible ones."""
+    rng = random.Random(seed)
+    pool = [(float(rng.randint(1, 100)), rng.choice(OPERATORS), float(rng.randint(1, 9)))
+            for _ in range(distinct)]
+    weights = [1 / rank for rank in range(1, distinct + 1)]
+    return rng.choices(pool, weights, k=entries)
+
+def history_bytes(inputs: list, interning: bool) -> tuple:
+    """Bytes allocated by a session history of 'inputs', and its distinct objects."""
+    CalculationFactory.set_interning(interning)
+    tracemalloc.start()
+    history = History(chunk_size=len(inputs))   # keep every entry live
+    for a, operator, b in inputs:
+        calculation = CalculationFactory.create_calculation(a, operator, b)
+        history.append(calculation, calculation.execute())
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    distinct = len({id(calculation) for calculation in history.live()})
+    CalculationFactory.set_interning(False)
+    return size, distinct
+
+def creation_ns(interning: bool, inputs: list) -> float:
+    """Nanoseconds per create_calculation call."""
+    CalculationFactory.set_interning(interning)
+    create = CalculationFactory.create_calculation
+    seconds = min(timeit.repeat(lambda: [create(a, op, b) for a, op, b in inputs],
+                                number=1, repeat=5))
+    CalculationFactory.set_interning(False)
+    return seconds / len(inputs) * 1e9
+
+def main(entries: int = 100_000) -> None:
+    """Prints bytes per history entry with and without interning, and creation cost."""
+
+    print(f"{'distinct triples':>16} {'plain B/entry':>14} {'interned B/entry':>17} "
+          f"{'saved':>6} {'objects':>8}")
+    for distinct in (100, 1_000, 10_000):
+        inputs = triples(entries, distinct)
+        plain, _ = history_bytes(inputs, False)
+        interned, objects = history_bytes(inputs, True)
+        print(f"{distinct:>16} {plain / entries:>14.1f} {interned / entries:>17.1f} "
+              f"{1 - interned / plain:>6.0%} {objects:>8}")
+    inputs = triples(entries, 1_000)
+    print(f"create_calculation: {creation_ns(False, inputs):.0f} ns plain, "
+          f"{creation_ns(True, inputs):.0f} ns interned")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+benchmarks/bench_outcome.py
+
+Compares raising and catching ZeroDivisionError per failing calculation with
+the exception-free Calculation.evaluate, for batches with a growing share of
+zero divisors.
+
+Usage:
+    python -m benchmarks.bench_outcome
+"""
+
+import timeit
+from app.calculation import CalculationFactory
+from app.outcome import ErrorCounts, Failure, classify
+
+def with_exceptions(calculations) -> ErrorCounts:
+    """Executes each calculation, catching its exception."""
+    counts = ErrorCounts()
+    for calculation in calculations:
+        try:
+            calculation.execute()
+        except ArithmeticError as error:
+            counts[classify(error)] += 1
+    return counts
+
+def with_outcomes(calculations) -> ErrorCounts:
+    """Evaluates each calculation into an Outcome."""
+    counts = ErrorCounts()
+    for calculation in calculations:
+        outcome = calculation.evaluate()
+        if type(outcome) is Failure:
+            counts[outcome.code] += 1
+    return counts
+
+def main(rows: int = 10_000, repeat: int = 5) -> None:
+    """Prints the best time per calculation for each share of zero divisors."""
+
+    print(f"{'zero divisors':<14} {'exceptions':>12} {'outcomes':>12} {'speedup':>8}")
+    for share in (0.0, 0.1, 0.5, 0.9):
+        failing = int(rows * share)
+        calculations = [CalculationFactory.create_calculation(float(i), '/', 0.0 if i < failing else 2.0)
+                        for i in range(rows)]
+        raising = min(timeit.repeat(lambda: with_exceptions(calculations), repeat=repeat, number=1))
+        checked = min(timeit.repeat(lambda: with_outcomes(calculations), repeat=repeat, number=1))
+        print(f"{share:<14.0%} {raising / rows * 1e9:>10.0f}ns {checked / rows * 1e9:>10.0f}ns "
+              f"{raising / checked:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+benchmarks/bench_output.py
+
+Compares one print() per result with OutputWriter when writing to a pipe-like
+unbuffered file, reporting time and write calls.
+
+Usage:
+    python -m benchmarks.bench_output
+"""
+
+import io
+import os
+import time
+from app.calculation import CalculationFactory
+from app.output import OutputWriter
+
+def main(lines: int = 100_000) -> None:
+    """Prints the time and number of write calls for each approach."""
+
+    calculations = [CalculationFactory.create_calculation(float(i), '+', 1.0) for i in range(1000)]
+    with open(os.devnull, "w", buffering=1) as line_buffered:
+        start = time.perf_counter()
+        for i in range(lines):
+            print(f"Result: {calculations[i % 1000]}", file=line_buffered)
+        per_line = time.perf_counter() - start
+
+    with open(os.devnull, "wb", buffering=0) as raw:
+        stream = io.TextIOWrapper(raw, write_through=True)
+        writer = OutputWriter(stream)
+        start = time.perf_counter()
+        for i in range(lines):
+            writer.result(calculations[i % 1000], 0.0)
+        writer.flush()
+        batched = time.perf_counter() - start
+        stream.detach()
+
+    print(f"{'approach':<22} {'time':>10} {'writes':>8}")
+    print(f"{'print per line':<22} {per_line * 1e3:>8.1f}ms {lines:>8}")
+    print(f"{'OutputWriter':<22} {batched * 1e3:>8.1f}ms {writer.writes:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+benchmarks/bench_parallel.py
+
+Compares shared-memory parallel evaluation with a pickle-based process pool
+that ships operand lists to workers and result lists back.
+
+Usage:
+    python -m benchmarks.bench_parallel [elements] [workers]
+"""
+
+import os
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from app.parallel import evaluate_parallel, split_ranges
+from app.columnar import encode_operators, evaluate_runs
+
+def _pickled_task(a, ops, b):
+    """Worker of the pickle-based pool: evaluates a copied chunk and returns it."""
+    out = array('d', [0.0]) * len(a)
+    evaluate_runs(ops, a, b, out)
+    return out.tolist()
+
+def pickled(a, operator, b, workers):
+    """Evaluates with operand and result data pickled to and from the workers."""
+    ops = encode_operators([operator] * len(a))
+    ranges = split_ranges(len(a), workers)
+    with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+        futures = [pool.submit(_pickled_task, a[start:stop], ops[start:stop], b[start:stop])
+                   for start, stop in ranges]
+        return [value for future in futures for value in future.result()]
+
+def main(elements: int = 2_000_000, workers: int = os.cpu_count() or 1) -> None:
+    a = [float(i) for i in range(elements)]
+    b = [1.0 + i % 7 for i in range(elements)]
+    print(f"a / b over {elements:,} elements with {workers} workers")
+    for label, function in (
+        ("pickle pool", lambda: pickled(a, '/', b, workers)),
+        ("shared mem", lambda: evaluate_parallel(a, '/', b, workers=workers)),
+    ):
+        started = time.perf_counter()
+        function()
+        print(f"{label:<12} {time.perf_counter() - started:>8.3f}s")
+
+if __name__ == "__main__":
+    arguments = [int(value) for value in sys.argv[1:3]]
+    main(*arguments)
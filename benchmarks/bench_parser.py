@@ -0,0 +1,93 @@
+"""
+benchmarks/bench_parser.py
+
+Compares the previous REPL parse step (split, tuple unpacking and float()
+inside try/except, with the factory raising for unknown operators) with
+the current one (parse_tokens, then a lookup for name operands) on mixes of
+valid and invalid lines. "numbers" has no name operands, so no line of it
+raised in the previous step either; it is not faster, and measures at
+parity (about 0.96x-1.15x between runs). The speed-up of "valid" comes from
+its lines with variable names and 'ans'.
+
+Usage:
+    python -m benchmarks.bench_parser
+"""
+
+import timeit
+from app.calculation import CalculationFactory
+from app.parser import parse_tokens
+from app.variables import ANS, UndefinedVariableError, Workspace
+
+NUMBERS = ["8 + 2", "-1.5 * 3e2", "x = 10 / 4", "7 % 3"]
+VALID = ["8 + 2", "-1.5 * 3e2", "x = 10 / 4", "x ** 0.5", "ans % 3", "2 - x"]
+INVALID = ["8 +", "eight + 2", "2 // 3", "1 + 2 + 3", "x + $", "help me"]
+
+class PreviousWorkspace(Workspace):
+    """Workspace with 'resolve' as it was before the parser: float() first, so every name raised once."""
+
+    def resolve(self, token: str) -> float:
+        try:
+            return float(token)
+        except ValueError:
+            pass
+        if token == ANS and self.ans is not None:
+            return self.ans
+        if token in self.values:
+            return self.values[token]
+        raise UndefinedVariableError(f"Undefined variable: '{token}'.")
+
+def split_parse(text: str, workspace: Workspace):
+    """The previous parse step, where every failure is an exception."""
+    tokens = text.split()
+    name = None
+    if len(tokens) == 5 and tokens[1] == "=":
+        name, tokens = tokens[0], tokens[2:]
+    try:
+        a_str, operator, b_str = tokens
+        a, b = workspace.resolve(a_str), workspace.resolve(b_str)
+        if CalculationFactory.get_calculation_class(operator) is None:
+            raise ValueError(CalculationFactory.unsupported_message(operator))
+    except UndefinedVariableError:
+        return None
+    except ValueError:
+        return None
+    return name, a, operator, b
+
+def fast_parse(text: str, workspace: Workspace):
+    """The REPL parse step: parse_tokens, then variable lookup for name operands only."""
+    name, a, operator, b, error, _ = parse_tokens(text.split())
+    if error is not None:
+        return None
+    try:
+        return (name, a if type(a) is float else workspace.resolve(a),
+                operator, b if type(b) is float else workspace.resolve(b))
+    except UndefinedVariableError:
+        return None
+
+def main(repeat: int = 7, number: int = 20000) -> None:
+    """Prints the best time per line for each mix of inputs and parser."""
+
+    previous, workspace = PreviousWorkspace(), Workspace()
+    for space in (previous, workspace):
+        space.values["x"] = 2.5
+        space.ans = 7.0
+    mixes = {
+        "numbers": NUMBERS,
+        "valid": VALID,
+        "50% invalid": VALID[:3] + INVALID[:3],
+        "invalid": INVALID,
+    }
+    print(f"{'mix':<14} {'split/float':>12} {'parse_tokens':>12} {'speedup':>8}")
+    for label, lines in mixes.items():
+        count = number * len(lines)
+        old = new = float("inf")
+        for _ in range(repeat):   # alternate the two so drift affects both alike
+            old = min(old, timeit.timeit(lambda: [split_parse(line, previous) for line in lines],
+                                         number=number))
+            new = min(new, timeit.timeit(lambda: [fast_parse(line, workspace) for line in lines],
+                                         number=number))
+        print(f"{label:<14} {old / count * 1e6:>10.2f}us {new / count * 1e6:>10.2f}us "
+              f"{old / new:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
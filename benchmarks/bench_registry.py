@@ -0,0 +1,68 @@
+"""
+benchmarks/bench_registry.py
+
+Multi-threaded stress benchmark of CalculationFactory.create_calculation,
+with the registry open (while another thread keeps registering types) and
+frozen.
+
+Usage:
+    python -m benchmarks.bench_registry
+"""
+
+import itertools
+import threading
+import time
+from app.calculation import AddCalculation, CalculationFactory
+
+OPERATORS = ['+', '-', '*', '/', '**', '%']
+
+# Unique names for the types registered while the benchmark runs.
+_names = (f"bench{index}" for index in itertools.count())
+
+def _create(calls: int, failures: list) -> None:
+    """Worker: creates 'calls' calculations, recording any unexpected error."""
+    try:
+        for index in range(calls):
+            CalculationFactory.create_calculation(2.0, OPERATORS[index % 6], 3.0)
+    except Exception as error:   # the benchmark reports it rather than dying silently
+        failures.append(error)
+
+def stress(threads: int, calls: int, register: bool) -> float:
+    """Runs 'threads' creators (plus a registering thread if asked); returns calls per second."""
+
+    failures: list = []
+    stop = threading.Event()
+
+    def keep_registering() -> None:
+        while not stop.wait(0.001):
+            CalculationFactory.register_calculation(next(_names))(AddCalculation)
+
+    workers = [threading.Thread(target=_create, args=(calls, failures)) for _ in range(threads)]
+    registrar = threading.Thread(target=keep_registering) if register else None
+    start = time.perf_counter()
+    if registrar is not None:
+        registrar.start()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    if registrar is not None:
+        registrar.join()
+    if failures:
+        raise failures[0]
+    return threads * calls / elapsed
+
+def main(calls: int = 100_000) -> None:
+    """Prints create_calculation throughput per thread count, open and frozen."""
+
+    print(f"{'threads':>7} {'open + registering':>20} {'frozen':>12}")
+    open_rates = {threads: stress(threads, calls, register=True) for threads in (1, 4, 16)}
+    CalculationFactory.freeze()
+    for threads, open_rate in open_rates.items():
+        frozen_rate = stress(threads, calls, register=False)
+        print(f"{threads:>7} {open_rate / 1e6:>15.2f}M/s {frozen_rate / 1e6:>9.2f}M/s")
+
+if __name__ == "__main__":
+    main()
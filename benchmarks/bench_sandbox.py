@@ -0,0 +1,47 @@
+"""
+benchmarks/bench_sandbox.py
+
+Latency of a sandboxed calculation on a warm pooled worker versus forking a
+fresh worker for every job.
+
+Usage:
+    python -m benchmarks.bench_sandbox
+"""
+
+import time
+from app.sandbox import SandboxPool
+
+def warm(jobs: int) -> float:
+    """Seconds per job on one warm, reused worker."""
+    with SandboxPool(workers=1) as pool:
+        pool.evaluate(1.0, '+', 1.0)
+        start = time.perf_counter()
+        for index in range(jobs):
+            pool.evaluate(float(index), '*', 2.0)
+        return (time.perf_counter() - start) / jobs
+
+def cold(jobs: int) -> float:
+    """Seconds per job when every job gets a freshly forked worker."""
+    start = time.perf_counter()
+    for index in range(jobs):
+        with SandboxPool(workers=1) as pool:
+            pool.evaluate(float(index), '*', 2.0)
+    return (time.perf_counter() - start) / jobs
+
+def recycled(jobs: int) -> float:
+    """Seconds per job when a worker is recycled after every job, with a warm spare."""
+    with SandboxPool(workers=2, max_jobs=1) as pool:
+        start = time.perf_counter()
+        for index in range(jobs):
+            pool.evaluate(float(index), '*', 2.0)
+        return (time.perf_counter() - start) / jobs
+
+def main(jobs: int = 200) -> None:
+    """Prints per-job latency for each strategy."""
+
+    for label, measure in (("warm worker", warm), ("recycled, warm spare", recycled),
+                           ("fork per job", cold)):
+        print(f"{label:>22}: {measure(jobs) * 1e6:>9.1f} us/job")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+benchmarks/bench_tracing.py
+
+Cost of tracing on the batch path: evaluate_stream over text lines with
+tracing off and on, and the cost of a REPL-style span with the null tracer.
+
+Usage:
+    python -m benchmarks.bench_tracing
+"""
+
+import timeit
+from collections import deque
+from app.stream import evaluate_stream
+from app.tracing import NULL_TRACER, Tracer
+
+LINES = [f"{index} {'+-*/'[index % 4]} 3" for index in range(10_000)]
+
+def run(tracer) -> None:
+    """Evaluates every line, discarding the outcomes."""
+    deque(evaluate_stream(LINES, tracer), maxlen=0)
+
+def null_span() -> None:
+    """One disabled span, as the REPL records per stage."""
+    with NULL_TRACER.span("parse"):
+        pass
+
+def main(repeat: int = 5) -> None:
+    """Prints the best time per line with tracing off and on."""
+
+    off = min(timeit.repeat(lambda: run(None), number=1, repeat=repeat)) / len(LINES)
+    on = min(timeit.repeat(lambda: run(Tracer()), number=1, repeat=repeat)) / len(LINES)
+    span = min(timeit.repeat(null_span, number=100_000, repeat=repeat)) / 100_000
+    print(f"evaluate_stream, tracing off: {off * 1e9:>7.0f} ns/line")
+    print(f"evaluate_stream, tracing on:  {on * 1e9:>7.0f} ns/line (3 spans)")
+    print(f"REPL span with NULL_TRACER:   {span * 1e9:>7.0f} ns")
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,53 @@
 main.py
 
 Allows users to perform mathematical operations interactively with the REPL calculator.
+
+Options:
+    --json-lines           Write results and messages as JSON Lines.
+    --timeout N            Abandon a calculation after N seconds (0: no limit).
+    --trace PATH           Record parse/dispatch/execute spans to a Chrome trace file.
+    --audit-log PATH       Log every calculation to a rotating JSON Lines file.
+    --audit-policy POLICY  'drop' (default) or 'block' when the audit queue is full.
+    --intern               Share one immutable instance per repeated calculation.
 """
 
+import argparse
+from app.audit import DROP, POLICIES, AuditLog
+from app.calculation import CalculationFactory
 from app.calculator import calculator # Import the calculator function
+from app.output import OutputWriter
+from app.runner import DEFAULT_TIMEOUT
+from app.tracing import Tracer
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="REPL calculator.")
+    parser.add_argument("--json-lines", action="store_true",
+                        help="write results and messages as JSON Lines")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="seconds before a calculation is abandoned (0: no limit)")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="write a Chrome trace (chrome://tracing, Perfetto) of each stage")
+    parser.add_argument("--audit-log", metavar="PATH",
+                        help="log every calculation to a rotating JSON Lines file")
+    parser.add_argument("--audit-policy", choices=POLICIES, default=DROP,
+                        help="when the audit queue is full: drop records or block")
+    parser.add_argument("--intern", action="store_true",
+                        help="share one immutable instance per repeated calculation")
+    args = parser.parse_args()
+    tracer = Tracer() if args.trace else None
+    audit = AuditLog(args.audit_log, policy=args.audit_policy) if args.audit_log else None
+
     # Run the REPL calculator
     # This block will execute only when main.py is executed.
-    calculator()
+    # All calculation types are registered on import; no more can be added at runtime.
+    CalculationFactory.freeze()
+    CalculationFactory.set_interning(args.intern)
+    try:
+        calculator(OutputWriter(json_lines=args.json_lines), timeout=args.timeout or None,
+                   tracer=tracer, audit=audit)
+    finally:
+        if audit is not None:
+            audit.close()
+        # The calculator leaves with sys.exit, so the trace is written on the way out
+        if tracer is not None:
+            tracer.write(args.trace)
@@ -18,8 +18,10 @@ from app.calculation import (
 def reset_calculation_factory():
     """Fixture to reset CalculationFactory's registered calculations before each test."""
 
-    # Clear existing registrations
-    CalculationFactory._calculations.clear()
+    # Clear existing registrations and unfreeze the registry
+    CalculationFactory._calculations = {}
+    CalculationFactory._frozen = False
+    CalculationFactory.set_interning(False)
 
     # Re-register the default calculations
     CalculationFactory.register_calculation('+')(AddCalculation)
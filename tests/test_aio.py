@@ -0,0 +1,175 @@
+"""
+tests/test_aio.py
+
+Tests the asyncio evaluation API.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from app.aio import AsyncCalculator, evaluate, is_expensive
+from app.calculation import CalculationFactory
+from app.outcome import ErrorCode
+from app.tracing import Tracer
+
+class RecordingExecutor(ThreadPoolExecutor):
+    """Thread pool that counts submitted jobs."""
+
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.submitted = 0
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(fn, *args, **kwargs)
+
+@pytest.mark.parametrize("a, calc_type, b, expected", [
+    (2, '**', 10, False),
+    (2, '**', 1 << 20, True),
+    (2.0, '**', 1e6, False),
+    (1, '**', 1 << 20, False),
+    (2, '**', -(1 << 20), False),
+    (1 << (1 << 17), '%', 7, True),
+    (10, '%', 7, False),
+    (1 << (1 << 17), '+', 1, False),
+], ids=["small-power", "big-int-power", "float-power", "unit-base", "negative-exponent",
+        "huge-modulus", "small-modulus", "huge-addition"])
+def test_is_expensive(a, calc_type, b, expected):
+    """Test the cost prediction for cheap and expensive calculations."""
+
+    calculation = CalculationFactory.create_calculation(a, calc_type, b)
+    assert is_expensive(calculation) is expected
+
+def test_cheap_calculation_runs_inline():
+    """Test that cheap calculations are not submitted to the executor."""
+
+    # Arrange
+    with RecordingExecutor() as executor:
+        calculator = AsyncCalculator(executor=executor)
+
+        # Act
+        result = asyncio.run(calculator.evaluate(8.0, '+', 2.0))
+
+    # Assert
+    assert result == 10.0
+    assert executor.submitted == 0
+
+def test_expensive_calculation_is_offloaded():
+    """Test that expensive calculations run on the executor."""
+
+    # Arrange
+    with RecordingExecutor() as executor:
+        calculator = AsyncCalculator(executor=executor, expensive_bits=64)
+
+        # Act
+        result = asyncio.run(calculator.evaluate(3, '**', 100))
+
+    # Assert
+    assert result == 3 ** 100
+    assert executor.submitted == 1
+
+def test_errors_propagate():
+    """Test that factory and execution errors are raised to the awaiting coroutine."""
+
+    with pytest.raises(ZeroDivisionError):
+        asyncio.run(evaluate(8.0, '/', 0.0))
+    with pytest.raises(ValueError):
+        asyncio.run(evaluate(8.0, '//', 2.0))
+
+def test_evaluate_outcome_does_not_raise():
+    """Test that evaluate_outcome returns error codes instead of raising."""
+
+    # Arrange
+    async def run():
+        with RecordingExecutor() as executor:
+            calculator = AsyncCalculator(executor=executor, expensive_bits=64)
+            return await asyncio.gather(
+                calculator.evaluate_outcome(8.0, '/', 2.0),
+                calculator.evaluate_outcome(8.0, '/', 0.0),
+                calculator.evaluate_outcome(8.0, '//', 2.0),
+                calculator.evaluate_outcome(3, '**', 100),
+            )
+
+    # Act
+    ok, zero, unsupported, offloaded = asyncio.run(run())
+
+    # Assert
+    assert ok == 4.0
+    assert zero.code == ErrorCode.DIVIDE_BY_ZERO
+    assert unsupported.code == ErrorCode.UNSUPPORTED_OPERATOR
+    assert offloaded == 3 ** 100
+
+def test_tracer_records_server_spans():
+    """Test dispatch and execute spans, including an offloaded execute and a failure."""
+
+    # Arrange
+    tracer = Tracer()
+
+    async def run():
+        with RecordingExecutor() as executor:
+            calculator = AsyncCalculator(executor=executor, expensive_bits=64, tracer=tracer)
+            await calculator.evaluate(8.0, '+', 2.0)
+            await calculator.evaluate(3, '**', 100)
+            await calculator.evaluate_outcome(8.0, '/', 0.0)
+            await calculator.evaluate_outcome(3, '**', 100)
+            await calculator.evaluate_outcome(8.0, '//', 2.0)
+
+    # Act
+    asyncio.run(run())
+
+    # Assert
+    spans = [(event["name"], event["args"].get("offloaded")) for event in tracer.events]
+    assert spans == [
+        ("dispatch", None), ("execute", False),
+        ("dispatch", None), ("execute", True),
+        ("dispatch", None), ("execute", False),
+        ("dispatch", None), ("execute", True),
+        ("dispatch", None),
+    ]
+    assert {event["cat"] for event in tracer.events} == {"server"}
+
+def test_invalid_concurrency():
+    """Test that a concurrency limit below one is rejected."""
+
+    with pytest.raises(ValueError):
+        AsyncCalculator(max_concurrency=0)
+
+def test_concurrency_limit_and_cancellation():
+    """Test that queued offloads respect the limit and cancellation frees the slot."""
+
+    # Arrange
+    release = threading.Event()
+    running = []
+
+    def slow_execute(self):
+        running.append(self.b)
+        release.wait(5)
+        return 0
+
+    async def scenario(calculator):
+        first = asyncio.create_task(calculator.evaluate(2, '**', 200))
+        second = asyncio.create_task(calculator.evaluate(2, '**', 300))
+        await asyncio.sleep(0.05)
+        started_before_cancel = list(running)
+        second.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await second
+        release.set()
+        await first
+        return started_before_cancel
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        calculator = AsyncCalculator(executor=executor, max_concurrency=1, expensive_bits=64)
+        power_class = type(CalculationFactory.create_calculation(2, '**', 2))
+        original = power_class.execute
+        power_class.execute = slow_execute
+        try:
+            # Act
+            started = asyncio.run(scenario(calculator))
+        finally:
+            power_class.execute = original
+
+    # Assert
+    assert started == [200]
+    assert running == [200]
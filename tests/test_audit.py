@@ -0,0 +1,186 @@
+"""
+tests/test_audit.py
+
+Tests the asynchronous audit log.
+"""
+
+import json
+import threading
+import time
+import pytest
+from app.audit import BLOCK, DROP, AuditLog
+from app.calculation import CalculationFactory
+from app.outcome import ErrorCode, Failure
+
+def reject_constant(name: str):
+    """Fails on 'Infinity', '-Infinity' and 'NaN', which strict JSON readers reject."""
+    raise ValueError(f"Invalid JSON constant: {name}")
+
+def read_records(path) -> list:
+    """Reads the JSON Lines records of a log file as a strict JSON reader would."""
+    return [json.loads(line, parse_constant=reject_constant) for line in path.read_text().splitlines()]
+
+def test_records_results_and_failures(tmp_path):
+    """Test the fields written for results, failures, complex and inf results."""
+
+    # Arrange
+    path = tmp_path / "audit.jsonl"
+    add = CalculationFactory.create_calculation(1.0, '+', 2.0)
+    divide = CalculationFactory.create_calculation(1.0, '/', 0.0)
+    power = CalculationFactory.create_calculation(-8.0, '**', 0.5)
+    overflow = CalculationFactory.create_calculation(1e308, '*', 10.0)
+
+    # Act
+    with AuditLog(str(path)) as audit:
+        audit.record(add, 3.0, 0.001)
+        audit.record(divide, Failure(ErrorCode.DIVIDE_BY_ZERO, "Cannot divide by zero."), 0.002)
+        audit.record(power, power.execute(), 0.003)
+        audit.record(overflow, overflow.execute(), 0.004)
+
+    # Assert
+    first, second, third, fourth = read_records(path)
+    assert {key: first[key] for key in ("operator", "a", "b", "result", "latency", "error")} == {
+        "operator": '+', "a": 1.0, "b": 2.0, "result": 3.0, "latency": 0.001, "error": None,
+    }
+    assert second["result"] is None and second["error"] == "divide_by_zero"
+    assert second["message"] == "Cannot divide by zero."
+    assert isinstance(third["result"], str)
+    assert fourth["result"] == "inf"
+    assert first["time"] <= second["time"] <= third["time"]
+    assert audit.written == 4 and audit.dropped == 0
+
+def test_rotation_keeps_backups(tmp_path):
+    """Test that the log rotates before growing past max_bytes and keeps 'backups' files."""
+
+    # Arrange
+    path = tmp_path / "audit.jsonl"
+    calculation = CalculationFactory.create_calculation(1.0, '+', 2.0)
+
+    # Act: one record per log session, so each is a separate write
+    for _ in range(20):
+        with AuditLog(str(path), max_bytes=300, backups=2) as audit:
+            audit.record(calculation, 3.0, 0.001)
+
+    # Assert
+    files = sorted(file.name for file in tmp_path.iterdir())
+    assert files == ["audit.jsonl", "audit.jsonl.1", "audit.jsonl.2"]
+    assert all(file.stat().st_size <= 300 for file in tmp_path.iterdir())
+    assert len(read_records(path.with_name("audit.jsonl.1"))) > 0
+
+def test_rotation_without_backups(tmp_path):
+    """Test that with no backups the log is truncated instead."""
+
+    # Arrange
+    path = tmp_path / "audit.jsonl"
+    path.write_text("x" * 100)
+    calculation = CalculationFactory.create_calculation(1.0, '+', 2.0)
+
+    # Act
+    with AuditLog(str(path), max_bytes=120, backups=0) as audit:
+        audit.record(calculation, 3.0, 0.001)
+
+    # Assert
+    assert [file.name for file in tmp_path.iterdir()] == ["audit.jsonl"]
+    assert len(read_records(path)) == 1
+
+def test_failed_rotation_keeps_writing(tmp_path, monkeypatch):
+    """Test that a failed rename keeps appending to the log instead of dropping every later batch."""
+
+    # Arrange
+    path = tmp_path / "audit.jsonl"
+    path.write_text(json.dumps({"old": "x" * 90}) + "\n")
+    calculation = CalculationFactory.create_calculation(1.0, '+', 2.0)
+
+    def failing_replace(source, destination):
+        raise OSError("rename failed")
+
+    monkeypatch.setattr("app.audit.os.replace", failing_replace)
+
+    # Act: each record is its own batch
+    with AuditLog(str(path), max_bytes=120, backups=2) as audit:
+        for count in range(1, 4):
+            audit.record(calculation, 3.0, 0.001)
+            while audit.written < count:
+                time.sleep(0.001)
+
+    # Assert
+    assert [file.name for file in tmp_path.iterdir()] == ["audit.jsonl"]
+    assert len(read_records(path)) == 4
+    assert audit.written == 3 and audit.dropped == 0 and audit.writes == 3
+    assert str(audit.error) == "rename failed"
+
+@pytest.mark.parametrize("policy, dropped", [(DROP, 3), (BLOCK, 0)])
+def test_full_queue_policy(tmp_path, monkeypatch, policy, dropped):
+    """Test that a full queue drops records or blocks the caller until there is room."""
+
+    # Arrange
+    release = threading.Event()
+    writing = threading.Event()
+    original = AuditLog._write
+
+    def slow_write(self, data, count):
+        writing.set()
+        release.wait()
+        original(self, data, count)
+
+    monkeypatch.setattr(AuditLog, "_write", slow_write)
+    calculation = CalculationFactory.create_calculation(1.0, '+', 2.0)
+    audit = AuditLog(str(tmp_path / "audit.jsonl"), queue_size=1, policy=policy)
+    audit.record(calculation, 3.0, 0.0)
+    writing.wait()                           # the writer holds record 1; record 2 fills the queue
+
+    # Act
+    producer = threading.Thread(target=lambda: [audit.record(calculation, 3.0, 0.0)
+                                                for _ in range(4)])
+    producer.start()
+    producer.join(0.2)
+    blocked = producer.is_alive()
+    release.set()
+    producer.join()
+    audit.close()
+
+    # Assert
+    assert blocked is (policy == BLOCK)
+    assert audit.dropped == dropped
+    assert audit.written == 5 - dropped
+
+def test_write_error_is_counted(tmp_path, monkeypatch):
+    """Test that a failing disk does not stop the writer; lost records are counted."""
+
+    # Arrange
+    audit = AuditLog(str(tmp_path / "audit.jsonl"))
+
+    def failing_write(data):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(audit._file, "write", failing_write)
+    calculation = CalculationFactory.create_calculation(1.0, '+', 2.0)
+
+    # Act
+    audit.record(calculation, 3.0, 0.0)
+    audit.close()
+
+    # Assert
+    assert audit.dropped == 1 and audit.written == 0
+    assert str(audit.error) == "disk full"
+
+@pytest.mark.parametrize("arguments", [
+    {"policy": "wait"}, {"max_bytes": 0}, {"backups": -1}, {"queue_size": 0},
+])
+def test_rejects_bad_arguments(tmp_path, arguments):
+    """Test argument validation."""
+
+    with pytest.raises(ValueError):
+        AuditLog(str(tmp_path / "audit.jsonl"), **arguments)
+
+def test_closed_log_rejects_records(tmp_path):
+    """Test that recording after close raises, and closing twice is harmless."""
+
+    # Arrange
+    audit = AuditLog(str(tmp_path / "audit.jsonl"))
+    audit.close()
+    audit.close()
+
+    # Act and Assert
+    with pytest.raises(ValueError, match="closed"):
+        audit.record(CalculationFactory.create_calculation(1.0, '+', 2.0), 3.0, 0.0)
@@ -6,9 +6,12 @@ Tests both positive and negative scenarios for the Calculation classes and Calcu
 Ensures that calculations execute correctly, factory creates appropriate instances, and error handling behaves as expected.
 """
 
+import gc
+import pickle
+import threading
 import pytest
 from unittest.mock import patch
-from app.operation import Operation
+from app.operation import Operation, VectorOperation
 from app.calculation import (
     CalculationFactory, 
     AddCalculation,
@@ -17,7 +20,8 @@ from app.calculation import (
     DivideCalculation,
     PowerCalculation,
     ModulusCalculation,
-    Calculation
+    Calculation,
+    RegistryFrozenError
 )
 
 #-------------------------------------------
@@ -868,4 +872,153 @@ def test_calculation_str_parameterized(
     calc_str = str(calc)
 
     # Assert: Verify the string representation matches the expected format
-    assert calc_str == expected_str
\ No newline at end of file
+    assert calc_str == expected_str
+
+#-------------------------------------------
+# Test Kernel Lookup
+#-------------------------------------------
+
+def test_factory_get_kernel():
+    """Test that the factory returns the vectorized kernel registered for an operator."""
+
+    assert CalculationFactory.get_kernel('+') is VectorOperation.addition
+    assert CalculationFactory.get_kernel('%') is VectorOperation.modulus
+
+def test_factory_get_kernel_unknown_or_missing():
+    """Test that unknown operators and calculations without a kernel return None."""
+
+    # Arrange
+    @CalculationFactory.register_calculation('max')
+    class MaxCalculation(Calculation):
+        operator = 'max'
+
+        def execute(self) -> float:
+            return max(self.a, self.b)
+
+    # Act and Assert
+    assert CalculationFactory.get_kernel('max') is None
+    assert CalculationFactory.get_kernel('//') is None
+
+#-------------------------------------------
+# Test Registry Freezing and Thread Safety
+#-------------------------------------------
+
+def test_factory_freeze_rejects_registration():
+    """Test that a frozen registry serves lookups but rejects registrations clearly."""
+
+    # Arrange
+    CalculationFactory.freeze()
+    CalculationFactory.freeze()
+
+    # Act and Assert
+    assert CalculationFactory.is_frozen()
+    assert CalculationFactory.create_calculation(2.0, '*', 3.0).execute() == 6.0
+    with pytest.raises(RegistryFrozenError, match="registry is frozen"):
+        CalculationFactory.register_calculation('max')(AddCalculation)
+    with pytest.raises(TypeError):
+        CalculationFactory._calculations['max'] = AddCalculation
+    assert 'max' not in CalculationFactory.calculation_types()
+
+def test_factory_concurrent_registration():
+    """Test that concurrent registrations neither lose types nor register a type twice."""
+
+    # Arrange
+    start = threading.Barrier(8)
+    duplicates = []
+
+    def register(worker: int) -> None:
+        start.wait()
+        for index in range(50):
+            CalculationFactory.register_calculation(f"op{worker}_{index}")(AddCalculation)
+            try:
+                CalculationFactory.register_calculation("shared")(AddCalculation)
+            except ValueError:
+                duplicates.append(worker)
+
+    threads = [threading.Thread(target=register, args=(worker,)) for worker in range(8)]
+
+    # Act
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Assert
+    assert len(CalculationFactory.calculation_types()) == 6 + 8 * 50 + 1
+    assert len(duplicates) == 8 * 50 - 1
+
+def test_factory_interning_shares_instances():
+    """Test that repeated float calculations share one immutable instance while interning is on."""
+
+    # Arrange
+    CalculationFactory.set_interning(True)
+
+    # Act
+    first = CalculationFactory.create_calculation(1.0, '+', 2.0)
+    second = CalculationFactory.create_calculation(1.0, '+', 2.0)
+    other = CalculationFactory.create_calculation(1.0, '-', 2.0)
+
+    # Assert
+    assert first is second and first is not other
+    assert isinstance(first, AddCalculation)
+    assert str(first) == "AddCalculation: 1.0 + 2.0 = 3.0"
+    assert repr(first) == "AddCalculation(a=1.0, b=2.0)"
+    assert CalculationFactory.interned_count() == 2
+    with pytest.raises(AttributeError, match="immutable"):
+        first.a = 5.0
+    with pytest.raises(AttributeError, match="immutable"):
+        del first.b
+
+def test_factory_interning_keeps_distinct_operands_apart():
+    """Test that -0.0, ints and complex operands are never mixed up with other instances."""
+
+    # Arrange
+    CalculationFactory.set_interning(True)
+
+    # Act
+    negative_zero = CalculationFactory.create_calculation(-0.0, '*', 2.0)
+    zero = CalculationFactory.create_calculation(0.0, '*', 2.0)
+    ints = CalculationFactory.create_calculation(1, '+', 2)
+    floats = CalculationFactory.create_calculation(1.0, '+', 2.0)
+
+    # Assert
+    assert str(negative_zero).endswith("= -0.0") and str(zero).endswith("= 0.0")
+    assert ints is not CalculationFactory.create_calculation(1, '+', 2)
+    assert ints.execute() == 3 and type(ints.execute()) is int
+    assert floats is not ints
+    ints.a = 5                                  # not shared, so still mutable
+
+def test_factory_interning_is_weak_and_optional():
+    """Test that unused shared instances are dropped and turning interning off clears the table."""
+
+    # Arrange
+    CalculationFactory.set_interning(True)
+    kept = CalculationFactory.create_calculation(3.0, '*', 4.0)
+    CalculationFactory.create_calculation(5.0, '*', 6.0)
+    gc.collect()
+
+    # Act
+    alive = CalculationFactory.interned_count()
+    CalculationFactory.set_interning(False)
+
+    # Assert
+    assert alive == 1
+    assert CalculationFactory.interned_count() == 0
+    assert CalculationFactory.create_calculation(3.0, '*', 4.0) is not kept
+    assert type(CalculationFactory.create_calculation(3.0, '*', 4.0)) is MultiplyCalculation
+
+def test_shared_instances_pickle_and_follow_registration():
+    """Test pickling a shared instance, and that re-registering an operator is respected."""
+
+    # Arrange
+    CalculationFactory.set_interning(True)
+    shared = CalculationFactory.create_calculation(2.0, '**', 3.0)
+
+    # Act
+    copy = pickle.loads(pickle.dumps(shared))
+    CalculationFactory._calculations = {'**': MultiplyCalculation}
+    replaced = CalculationFactory.create_calculation(2.0, '**', 3.0)
+
+    # Assert
+    assert type(copy) is PowerCalculation and copy.execute() == 8.0
+    assert isinstance(replaced, MultiplyCalculation) and replaced.execute() == 6.0
@@ -3,9 +3,17 @@ tests/test_calculator.py
 
 Tests REPL calculator functionality and user experience.
 """
+import json
+import threading
+import tracemalloc
 import pytest
 from io import StringIO
+from app.calculation import Calculation, CalculationFactory
 from app.calculator import display_help, display_history, calculator
+from app.audit import AuditLog
+from app.output import OutputWriter
+from app.runner import CalculationTimeoutError
+from app.tracing import Tracer
 
 def test_display_help(capsys):
     """Tests display_help function to ensure it prints out the correct help message."""
@@ -33,9 +41,29 @@ def test_display_help(capsys):
         **  : First operand to the power of the second.
         %   : Remainder of first operand divided by second.
 
+    Variables:
+        <name> = <number1> <operator> <number2>
+        - Store the result in a variable. Variables and 'ans' (the last result)
+          can be used in place of numbers. Redefining a variable recomputes
+          only the variables that depend on it. 'ans', 'sum', 'prod' and
+          'timeit' cannot be used as names.
+
+    Reductions:
+        sum <number1> <number2> ...  : Adds any number of operands.
+        prod <number1> <number2> ... : Multiplies any number of operands.
+        sum file <path> [column]     : Reduces a column (starting at 1) of a text or CSV file.
+
     Special Commands:
         help    : Displays this help message.
         history : Shows the history of calculations.
+        stats results : Shows count, mean, variance, min and max of results.
+        profile start : Starts profiling this session.
+        profile stop  : Stops profiling and shows where the time went.
+        memory        : Shows memory use; starts allocation tracing on first use.
+        memory stop   : Stops allocation tracing.
+        timeit <number1> <operator> <number2> [n]
+                      : Times n calls (default 10000) of a calculation on each
+                        evaluation path, without adding it to the history.
         exit    : Exits the calculator.
 
     Examples:
@@ -45,6 +73,9 @@ def test_display_help(capsys):
         4 / 2
         2 ** 2
         8 % 2
+        x = 3 * 4
+        x + ans
+        sum 1 2 3 4
     """
 
     assert captured.out.strip() == expected_output.strip()
@@ -365,3 +396,464 @@ def test_calculator_history_command(monkeypatch, capsys):
 
 
 
+
+def test_calculator_variables_and_ans(monkeypatch, capsys):
+    """Test assignments, 'ans' and recomputation of dependent variables in the REPL."""
+
+    # Arrange
+    user_input = (
+        "x = 3 * 4\n"
+        "y = x + 1\n"
+        "ans * 2\n"
+        "x = 1 + 1\n"
+        "history\n"
+        "exit\n"
+    )
+    monkeypatch.setattr("sys.stdin", StringIO(user_input))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator()
+
+    # Assert
+    captured = capsys.readouterr()
+    assert "Result: x = MultiplyCalculation: 3.0 * 4.0 = 12.0" in captured.out
+    assert "Result: y = AddCalculation: 12.0 + 1.0 = 13.0" in captured.out
+    assert "Result: MultiplyCalculation: 13.0 * 2.0 = 26.0" in captured.out
+    assert "Updated: y = AddCalculation: 2.0 + 1.0 = 3.0" in captured.out
+    assert "5. AddCalculation: 2.0 + 1.0 = 3.0" in captured.out
+
+def test_calculator_recomputation_keeps_ans_snapshot(monkeypatch, capsys):
+    """Test that a recomputed variable keeps the 'ans' value it was defined with."""
+
+    # Arrange
+    monkeypatch.setattr("sys.stdin", StringIO("y = 1 + 1\nx = ans + y\ny = 10 + 0\nexit\n"))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator()
+
+    # Assert
+    captured = capsys.readouterr()
+    assert "Result: x = AddCalculation: 2.0 + 2.0 = 4.0" in captured.out
+    assert "Updated: x = AddCalculation: 2.0 + 10.0 = 12.0" in captured.out
+
+def test_calculator_variable_errors(monkeypatch, capsys):
+    """Test undefined variables, circular definitions, reserved names and failed recomputation in the REPL."""
+
+    # Arrange
+    user_input = (
+        "z + 1\n"
+        "x = 2 + 0\n"
+        "x = x + 1\n"
+        "y = 1 / x\n"
+        "x = 0 + 0\n"
+        "sum = 1 + 2\n"
+        "timeit = 1 + 2\n"
+        "exit\n"
+    )
+    monkeypatch.setattr("sys.stdin", StringIO(user_input))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator()
+
+    # Assert
+    captured = capsys.readouterr()
+    assert "Undefined variable: 'z'." in captured.out
+    assert "Circular definition: 'x' would depend on itself." in captured.out
+    assert "Updated: y could not be recomputed: Cannot divide by zero." in captured.out
+    assert "Invalid variable name: 'sum' is a reserved word." in captured.out
+    assert "Invalid variable name: 'timeit' is a reserved word." in captured.out
+    assert "Undefined variable: '='" not in captured.out
+
+def test_calculator_reductions(monkeypatch, capsys, tmp_path):
+    """Test n-ary sum and prod over operands and over a file column."""
+
+    # Arrange
+    data = tmp_path / "Data.csv"
+    data.write_text("1,0.1\n2,0.2\n3,0.3\n")
+    user_input = (
+        "x = 2 + 0\n"
+        "sum 1 2 3 x\n"
+        "prod ans 2\n"
+        f"sum file {data} 2\n"
+        f"prod file {data}\n"
+        "history\n"
+        "exit\n"
+    )
+    monkeypatch.setattr("sys.stdin", StringIO(user_input))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator()
+
+    # Assert
+    captured = capsys.readouterr()
+    assert "Result: sum = 8.0" in captured.out
+    assert "Result: prod = 16.0" in captured.out
+    assert "Result: sum = 0.6" in captured.out
+    assert "Result: prod = 6.0" in captured.out
+    assert "2. " not in captured.out
+
+@pytest.mark.parametrize("command, message", [
+    ("sum 1 two", "Undefined variable: 'two'."),
+    ("sum file", "Invalid input. Please use the format: sum file <path> [column]"),
+    ("sum file data.csv 0", "Column numbers start at 1."),
+    ("sum file missing.csv", "No such file or directory"),
+])
+def test_calculator_reduction_errors(monkeypatch, capsys, command, message):
+    """Test that reduction errors are reported and the REPL continues."""
+
+    # Arrange
+    monkeypatch.setattr("sys.stdin", StringIO(f"{command}\nexit\n"))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator()
+
+    # Assert
+    captured = capsys.readouterr()
+    assert message in captured.out
+    assert "Exiting REPL calculator. Goodbye!" in captured.out
+
+def test_calculator_stats_results(monkeypatch, capsys):
+    """Test the 'stats results' command before and after calculations."""
+
+    # Arrange
+    user_input = "stats results\n2 + 2\n3 * 2\n1 + 1\nstats results\nexit\n"
+    monkeypatch.setattr("sys.stdin", StringIO(user_input))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator()
+
+    # Assert
+    captured = capsys.readouterr()
+    assert "No calculation results yet." in captured.out
+    assert "count    : 3" in captured.out
+    assert "mean     : 4.0" in captured.out
+    assert "max      : 6.0" in captured.out
+    assert "+  : count=2 mean=3.0 min=2.0 max=4.0" in captured.out
+
+def test_calculator_factory_value_error(monkeypatch, capsys):
+    """Test that a ValueError raised while creating a calculation is reported."""
+
+    # Arrange
+    def mock_create_calculation(a, operator, b):
+        raise ValueError("Mock creation error")
+
+    monkeypatch.setattr('app.calculation.CalculationFactory.create_calculation', mock_create_calculation)
+    monkeypatch.setattr('sys.stdin', StringIO('8.0 + 2.0\nexit\n'))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator()
+
+    # Assert
+    captured = capsys.readouterr()
+    assert "Mock creation error" in captured.out
+    assert "Type 'help' for a list of supported operations." in captured.out
+
+def test_calculator_json_lines_output(monkeypatch, capsys):
+    """Test that the calculator writes JSON Lines through a JSON OutputWriter."""
+
+    # Arrange
+    monkeypatch.setattr('sys.stdin', StringIO('x = 3 * 4\n1 / 0\nhelp\nhistory\nexit\n'))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator(OutputWriter(json_lines=True))
+
+    # Assert
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert {"name": "x", "calculation": "MultiplyCalculation: 3.0 * 4.0 = 12.0",
+            "result": 12.0} in records
+    assert {"message": "Cannot divide by zero."} in records
+    assert "REPL Calculator Help" in records[-4]["message"]
+    assert records[-3:-1] == [{"message": "Calculation History:"},
+                              {"message": "1. MultiplyCalculation: 3.0 * 4.0 = 12.0"}]
+    assert records[-1] == {"message": "Exiting REPL calculator. Goodbye!"}
+
+def test_calculator_executes_each_calculation_once(monkeypatch, capsys):
+    """Test that results, recomputations and history lines never execute a calculation on the REPL thread."""
+
+    # Arrange
+    threads = []
+
+    @CalculationFactory.register_calculation('count')
+    class CountCalculation(Calculation):
+        operator = 'count'
+
+        def execute(self) -> float:
+            threads.append(threading.current_thread())
+            return self.a + self.b
+
+    monkeypatch.setattr('sys.stdin', StringIO('2 count 3\nx = 1 count 1\ny = x count 1\nx = 2 count 2\nhistory\nexit\n'))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator()
+
+    # Assert
+    captured = capsys.readouterr()
+    assert "Result: CountCalculation: 2.0 count 3.0 = 5.0" in captured.out
+    assert "Updated: y = CountCalculation: 4.0 count 1.0 = 5.0" in captured.out
+    assert "5. CountCalculation: 4.0 count 1.0 = 5.0" in captured.out
+    # Four inputs and one recomputation of 'y', all on workers; none while rendering
+    assert len(threads) == 5
+    assert not any(thread is threading.main_thread() for thread in threads)
+
+def test_calculator_abandons_runaway_calculation(monkeypatch, capsys):
+    """Test that a calculation past the timeout is abandoned and the session continues."""
+
+    # Arrange
+    release = threading.Event()
+
+    @CalculationFactory.register_calculation('wait')
+    class WaitCalculation(Calculation):
+        operator = 'wait'
+
+        def execute(self) -> float:
+            release.wait()
+            return self.a
+
+    monkeypatch.setattr('sys.stdin', StringIO('1 + 1\n1 wait 2\n2 * 3\nhistory\nexit\n'))
+
+    # Act
+    try:
+        with pytest.raises(SystemExit):
+            calculator(timeout=0.05)
+    finally:
+        release.set()
+
+    # Assert
+    captured = capsys.readouterr()
+    assert "Calculation timed out after 0.05 seconds and was abandoned." in captured.out
+    assert "Result: MultiplyCalculation: 2.0 * 3.0 = 6.0" in captured.out
+    assert "2. MultiplyCalculation: 2.0 * 3.0 = 6.0" in captured.out
+
+def test_calculator_interrupt_abandons_calculation(monkeypatch, capsys):
+    """Test that Ctrl-C during a calculation abandons it instead of ending the session."""
+
+    # Arrange
+    def interrupted(self, calculation):
+        raise KeyboardInterrupt()
+    monkeypatch.setattr('app.runner.CalculationRunner.run', interrupted)
+    monkeypatch.setattr('sys.stdin', StringIO('2 ** 3\nexit\n'))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator()
+
+    # Assert
+    captured = capsys.readouterr()
+    assert "Calculation interrupted and abandoned." in captured.out
+    assert "Exiting REPL calculator. Goodbye!" in captured.out
+
+def test_calculator_interrupted_recomputation(monkeypatch, capsys):
+    """Test that Ctrl-C during a recomputation leaves that variable undefined and keeps the session."""
+
+    # Arrange
+    def interrupted(self, calculation):
+        if calculation.a == 5.0:   # 'y' recomputed from the new 'x'
+            raise KeyboardInterrupt()
+        return calculation.execute()
+    monkeypatch.setattr('app.runner.CalculationRunner.run', interrupted)
+    monkeypatch.setattr('sys.stdin', StringIO('x = 1 + 1\ny = x * 3\nx = 0 + 5\ny + 1\nexit\n'))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator()
+
+    # Assert
+    captured = capsys.readouterr()
+    assert "Updated: y could not be recomputed: Calculation interrupted and abandoned." in captured.out
+    assert "Undefined variable: 'y'." in captured.out
+    assert "Exiting REPL calculator. Goodbye!" in captured.out
+
+def test_calculator_traces_stages(monkeypatch):
+    """Test that a tracer records a span for each stage of a calculation."""
+
+    # Arrange
+    tracer = Tracer()
+    monkeypatch.setattr('sys.stdin', StringIO('x = 2 * 3\nsum 1 2\n1 / 0\nexit\n'))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator(OutputWriter(StringIO()), tracer=tracer)
+
+    # Assert
+    assert [event["name"] for event in tracer.events] == [
+        "parse", "resolve", "dispatch", "execute", "output",
+        "reduction",
+        "parse", "resolve", "dispatch", "execute",
+    ]
+    assert tracer.events[3]["args"] == {"operator": '*'}
+    assert tracer.events[-1]["args"] == {"operator": '/', "error": "ZeroDivisionError"}
+
+def test_calculator_audits_calculations(monkeypatch, tmp_path):
+    """Test that every executed calculation is audited with its outcome."""
+
+    # Arrange
+    @CalculationFactory.register_calculation('bad')
+    class BadCalculation(Calculation):
+        operator = 'bad'
+
+        def execute(self) -> float:
+            raise TypeError("bad operands")
+
+    def interrupted(self, calculation):
+        if calculation.operator == '-':
+            raise KeyboardInterrupt()
+        return calculation.execute()
+
+    monkeypatch.setattr('app.runner.CalculationRunner.run', interrupted)
+    monkeypatch.setattr('sys.stdin', StringIO('1 + 2\n1 / 0\n1 bad 2\n1 - 1\nexit\n'))
+    path = tmp_path / "audit.jsonl"
+    audit = AuditLog(str(path))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator(OutputWriter(StringIO()), audit=audit)
+    audit.close()
+
+    # Assert
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [(record["operator"], record["result"], record["error"]) for record in records] == [
+        ('+', 3.0, None), ('/', None, "divide_by_zero"), ('bad', None, "calculation_error"),
+        ('-', None, "interrupted"),
+    ]
+    assert all(record["latency"] >= 0 for record in records)
+
+def test_calculator_audits_recomputations(monkeypatch, tmp_path):
+    """Test that recomputed dependent variables are audited with their outcomes."""
+
+    # Arrange
+    def run(self, calculation):
+        if calculation.a == 0.0 and calculation.operator == '-':
+            raise KeyboardInterrupt()
+        if calculation.a == 0.0 and calculation.operator == '%':
+            raise CalculationTimeoutError("Calculation timed out after 5 seconds and was abandoned.")
+        return calculation.execute()
+
+    monkeypatch.setattr('app.runner.CalculationRunner.run', run)
+    monkeypatch.setattr('sys.stdin', StringIO(
+        'y = 1 + 1\nx = y * 3\nw = 6 / x\nv = y - 7\nu = y % 9\ny = 0 + 0\nexit\n'))
+    path = tmp_path / "audit.jsonl"
+    audit = AuditLog(str(path))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator(OutputWriter(StringIO()), audit=audit)
+    audit.close()
+
+    # Assert
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [(record["operator"], record["a"], record["result"], record["error"])
+            for record in records[6:]] == [
+        ('*', 0.0, 0.0, None), ('-', 0.0, None, "interrupted"), ('%', 0.0, None, "timeout"),
+        ('/', 6.0, None, "divide_by_zero"),
+    ]
+    assert len(records) == 10
+
+def test_calculator_profile_commands(monkeypatch, capsys):
+    """Test profiling a session in place, including calculations on the worker threads."""
+
+    # Arrange
+    monkeypatch.setattr('sys.stdin', StringIO(
+        'profile stop\nprofile start\nprofile start\n2 * 3\n1 / 0\nprofile stop\n'
+        'profile start\nexit\n'))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator()
+
+    # Assert
+    captured = capsys.readouterr()
+    assert "The profiler is not running." in captured.out
+    assert "Profiling started." in captured.out
+    assert "The profiler is already running." in captured.out
+    stages = captured.out[captured.out.index("stage "):].splitlines()[1:6]
+    assert [line.split()[:2] for line in stages][:4] == [
+        ["parse", "2"], ["dispatch", "2"], ["execute", "2"], ["__str__", "1"],
+    ]
+    assert stages[4].startswith("output")
+
+def test_calculator_memory_commands(monkeypatch, capsys):
+    """Test the memory report and that exiting stops the tracing it started."""
+
+    # Arrange
+    monkeypatch.setattr('sys.stdin', StringIO(
+        '1 + 2\nmemory\nmemory\nmemory stop\nmemory stop\nmemory\nexit\n'))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator()
+
+    # Assert
+    captured = capsys.readouterr()
+    assert captured.out.count("Calculation objects:") == 3
+    assert "Top allocation sites:" in captured.out
+    assert "Allocation tracing stopped." in captured.out
+    assert "Allocation tracing is not running." in captured.out
+    assert not tracemalloc.is_tracing()
+
+def test_calculator_timeit_command(monkeypatch, capsys):
+    """Test timing a calculation with variables, input errors, and no history entry."""
+
+    # Arrange
+    monkeypatch.setattr('sys.stdin', StringIO(
+        'x = 2 * 3\ntimeit x ** 2 50\ntimeit 1 / 0\ntimeit 1 +\ntimeit 1 + 1 z\n'
+        'timeit 1 // 2\ntimeit y + 1\nhistory\nexit\n'))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator()
+
+    # Assert
+    captured = capsys.readouterr()
+    assert "timeit x ** 2: 50 calls" in captured.out
+    assert "Cannot time a failing calculation: Cannot divide by zero." in captured.out
+    assert "Please use the format: timeit <number1> <operator> <number2> [n]" in captured.out
+    assert "The number of calls must be a whole number." in captured.out
+    assert "Unsupported calculation type: '//'" in captured.out
+    assert "Undefined variable: 'y'." in captured.out
+    assert "2. " not in captured.out[captured.out.index("Calculation History:"):]
+
+def test_calculator_timeit_timeout(monkeypatch, capsys):
+    """Test that a timing run past the timeout is abandoned."""
+
+    # Arrange
+    release = threading.Event()
+    monkeypatch.setattr('app.calculator.time_calculation', lambda *args: release.wait())
+    monkeypatch.setattr('sys.stdin', StringIO('timeit 1 + 2\nexit\n'))
+
+    # Act
+    try:
+        with pytest.raises(SystemExit):
+            calculator(timeout=0.05)
+    finally:
+        release.set()
+
+    # Assert
+    captured = capsys.readouterr()
+    assert "Calculation timed out after 0.05 seconds and was abandoned." in captured.out
+
+def test_calculator_timeit_interrupt(monkeypatch, capsys):
+    """Test that Ctrl-C during a timing run abandons it instead of ending the session."""
+
+    # Arrange
+    def interrupted(self, function):
+        raise KeyboardInterrupt()
+    monkeypatch.setattr('app.runner.CalculationRunner.call', interrupted)
+    monkeypatch.setattr('sys.stdin', StringIO('timeit 1 + 2\nexit\n'))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator()
+
+    # Assert
+    captured = capsys.readouterr()
+    assert "Timing interrupted and abandoned." in captured.out
+    assert "Exiting REPL calculator. Goodbye!" in captured.out
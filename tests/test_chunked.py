@@ -0,0 +1,97 @@
+"""
+tests/test_chunked.py
+
+Tests chunked evaluation of expressions over arrays.
+"""
+
+from array import array
+import pytest
+from app.calculation import Calculation, CalculationFactory
+from app.chunked import _ChunkEvaluator, evaluate_arrays
+from app.expression import parse
+from app.variables import UndefinedVariableError
+
+def reference(a, b, c, d):
+    """Element-wise 'a * b + c % d' computed one element at a time."""
+    return [w * x + y % z for w, x, y, z in zip(a, b, c, d)]
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 4, 10, 1000])
+def test_evaluate_arrays_matches_element_wise(chunk_size):
+    """Test that every chunk size, including a short last chunk, gives the same results."""
+
+    # Arrange
+    a = array('d', range(10))
+    b = [2.0] * 10
+    c = array('d', range(1, 11))
+    d = memoryview(array('d', [3.0] * 10))
+
+    # Act
+    result = evaluate_arrays("a * b + c % d", {"a": a, "b": b, "c": c, "d": d}, chunk_size=chunk_size)
+
+    # Assert
+    assert isinstance(result, array) and result.typecode == 'd'
+    assert list(result) == reference(a, b, c, d)
+
+def test_evaluate_arrays_constants_and_out_buffer():
+    """Test constants broadcast across the arrays and results written into 'out'."""
+
+    # Arrange
+    x = array('d', [1.0, 2.0, 3.0])
+    out = array('d', [0.0] * 3)
+
+    # Act
+    result = evaluate_arrays(parse("(x + 1) ** 2"), {"x": x}, chunk_size=2, out=out)
+
+    # Assert
+    assert result is out
+    assert list(out) == [4.0, 9.0, 16.0]
+
+def test_evaluate_arrays_single_variable_and_constant():
+    """Test expressions without an operator."""
+
+    assert list(evaluate_arrays("x", {"x": [1.0, 2.0]})) == [1.0, 2.0]
+    assert list(evaluate_arrays("7", {})) == [7.0]
+
+def test_scratch_buffers_are_reused():
+    """Test that a chain of operators needs only a couple of scratch buffers."""
+
+    # Arrange
+    tree = parse("((((x + 1) * 2) - 3) / 4) + ((x * x) - (x + 1))")
+    evaluator = _ChunkEvaluator({"x": [1.0, 2.0, 3.0, 4.0]}, chunk_size=2)
+
+    # Act
+    for start in (0, 2):
+        evaluator.apply(tree, start, start + 2, array('d', [0.0, 0.0]))
+
+    # Assert
+    assert evaluator.allocated <= 3
+
+def test_custom_operator_without_kernel():
+    """Test that operators without a kernel are applied element-wise."""
+
+    # Arrange
+    @CalculationFactory.register_calculation('max')
+    class MaxCalculation(Calculation):
+        operator = 'max'
+
+        def execute(self) -> float:
+            return max(self.a, self.b)
+
+    # Act
+    result = evaluate_arrays("a max b", {"a": [1.0, 5.0], "b": [3.0, 2.0]}, chunk_size=1)
+
+    # Assert
+    assert list(result) == [3.0, 5.0]
+
+@pytest.mark.parametrize("source, arrays, kwargs, error", [
+    ("a + b", {"a": [1.0], "b": [1.0, 2.0]}, {}, ValueError),
+    ("a + 1", {"a": [1.0]}, {"out": array('d', [0.0] * 2)}, ValueError),
+    ("a + 1", {"a": [1.0]}, {"chunk_size": 0}, ValueError),
+    ("a + z", {"a": [1.0]}, {}, UndefinedVariableError),
+    ("a / b", {"a": [1.0, 2.0], "b": [1.0, 0.0]}, {}, ZeroDivisionError),
+])
+def test_evaluate_arrays_errors(source, arrays, kwargs, error):
+    """Test invalid arguments and zero divisors."""
+
+    with pytest.raises(error):
+        evaluate_arrays(source, arrays, **kwargs)
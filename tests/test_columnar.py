@@ -0,0 +1,139 @@
+"""
+tests/test_columnar.py
+
+Tests binary columnar batches evaluated through memory-mapped files.
+"""
+
+import math
+from array import array
+import pytest
+from app.calculation import Calculation, CalculationFactory
+from app.columnar import OPERATOR_CODES, evaluate_columns, write_columns
+
+@pytest.fixture
+def paths(tmp_path):
+    """Paths of the a, b, op and output column files."""
+    return tuple(str(tmp_path / name) for name in ("a.bin", "b.bin", "op.bin", "out.bin"))
+
+def read_results(path):
+    """Reads a float64 output column."""
+    with open(path, "rb") as file:
+        return list(array('d', file.read()))
+
+def test_write_and_evaluate_columns(paths):
+    """Test that runs of each operator are evaluated by kernels into the output file."""
+
+    # Arrange
+    a_path, b_path, op_path, out_path = paths
+    records = [(1.0, '+', 2.0), (3.0, '+', 4.0), (8.0, '/', 2.0), (2.0, '**', 10.0),
+               (7.0, '%', 3.0), (9.0, '-', 1.0), (2.0, '*', 4.0)]
+
+    # Act
+    written = write_columns(a_path, b_path, op_path, records)
+    report = evaluate_columns(a_path, b_path, op_path, out_path)
+
+    # Assert
+    assert written == 7
+    assert report == (7, 7, 0, {})
+    assert read_results(out_path) == [3.0, 7.0, 4.0, 1024.0, 1.0, 8.0, 8.0]
+
+def test_int64_operand_columns(paths):
+    """Test int64 operand columns."""
+
+    # Arrange
+    a_path, b_path, op_path, out_path = paths
+    write_columns(a_path, b_path, op_path, [(7, '/', 2), (7, '%', 4)], typecodes=('q', 'q'))
+
+    # Act
+    evaluate_columns(a_path, b_path, op_path, out_path, typecodes=('q', 'q'))
+
+    # Assert
+    assert read_results(out_path) == [3.5, 3.0]
+
+def test_int64_power_too_large_for_float64(paths):
+    """Test that an exact int64 power beyond float64 is an overflow row."""
+
+    # Arrange
+    a_path, b_path, op_path, out_path = paths
+    write_columns(a_path, b_path, op_path, [(10, '**', 400), (2, '**', 10)], typecodes=('q', 'q'))
+
+    # Act
+    report = evaluate_columns(a_path, b_path, op_path, out_path, typecodes=('q', 'q'))
+
+    # Assert
+    results = read_results(out_path)
+    assert math.isnan(results[0]) and results[1] == 1024.0
+    assert report.error_codes == {"overflow": 1}
+
+def test_failing_rows_are_nan(paths):
+    """Test that zero divisors and non-real powers mark only their own rows."""
+
+    # Arrange
+    a_path, b_path, op_path, out_path = paths
+    records = [(8.0, '/', 2.0), (8.0, '/', 0.0), (1.0, '%', 0.0), (-8.0, '**', 0.5), (4.0, '**', 0.5)]
+    write_columns(a_path, b_path, op_path, records)
+
+    # Act
+    report = evaluate_columns(a_path, b_path, op_path, out_path)
+
+    # Assert
+    results = read_results(out_path)
+    assert report.errors == 3 and report.vectorized == 0
+    assert report.error_codes == {"divide_by_zero": 2, "domain_error": 1}
+    assert results[0] == 4.0 and results[4] == 2.0
+    assert all(math.isnan(value) for value in results[1:4])
+
+def test_operator_without_kernel(paths, monkeypatch):
+    """Test that a coded operator without a kernel is evaluated row by row."""
+
+    # Arrange
+    @CalculationFactory.register_calculation('max')
+    class MaxCalculation(Calculation):
+        operator = 'max'
+
+        def execute(self) -> float:
+            return max(self.a, self.b)
+
+    monkeypatch.setitem(OPERATOR_CODES, 6, 'max')
+    a_path, b_path, op_path, out_path = paths
+    write_columns(a_path, b_path, op_path, [(1.0, 'max', 3.0), (5.0, 'max', 2.0)])
+
+    # Act
+    report = evaluate_columns(a_path, b_path, op_path, out_path)
+
+    # Assert
+    assert report == (2, 0, 0, {})
+    assert read_results(out_path) == [3.0, 5.0]
+
+def test_empty_batch(paths):
+    """Test that an empty batch produces an empty output file."""
+
+    # Arrange
+    a_path, b_path, op_path, out_path = paths
+    write_columns(a_path, b_path, op_path, [])
+
+    # Act and Assert
+    assert evaluate_columns(a_path, b_path, op_path, out_path) == (0, 0, 0, {})
+    assert read_results(out_path) == []
+
+def test_invalid_columns(paths):
+    """Test mismatched lengths, unknown operator codes and uncoded operators."""
+
+    # Arrange
+    a_path, b_path, op_path, out_path = paths
+    write_columns(a_path, b_path, op_path, [(1.0, '+', 2.0)])
+    with open(a_path, "ab") as file:
+        file.write(array('d', [1.0]).tobytes())
+
+    # Act and Assert
+    with pytest.raises(ValueError, match="Column length mismatch"):
+        evaluate_columns(a_path, b_path, op_path, out_path)
+
+    write_columns(a_path, b_path, op_path, [(1.0, '+', 2.0)])
+    with open(op_path, "wb") as file:
+        file.write(bytes([42]))
+    with pytest.raises(ValueError, match="Row 0: unknown operator code 42."):
+        evaluate_columns(a_path, b_path, op_path, out_path)
+
+    with pytest.raises(ValueError, match="No operator code"):
+        write_columns(a_path, b_path, op_path, [(1.0, '//', 2.0)])
@@ -0,0 +1,102 @@
+"""
+tests/test_csvmode.py
+
+Tests column-wise evaluation of CSV files.
+"""
+
+from io import StringIO
+import pytest
+from app.csvmode import evaluate_csv, main
+from app.variables import UndefinedVariableError
+
+CSV_INPUT = "colA,colB,name\n8,2,x\n1,0,y\nfoo,3,z\n9,3,w\n"
+
+def test_evaluate_csv_appends_result_column():
+    """Test that the result column is appended and failing rows are marked."""
+
+    # Arrange
+    source, target = StringIO(CSV_INPUT), StringIO()
+
+    # Act
+    report = evaluate_csv(source, target, "colA / colB", chunk_size=2)
+
+    # Assert
+    assert report == (4, 2)
+    assert target.getvalue() == (
+        "colA,colB,name,result\n"
+        "8,2,x,4.0\n"
+        "1,0,y,#DIV/0!\n"
+        "foo,3,z,#VALUE!\n"
+        "9,3,w,3.0\n"
+    )
+
+def test_evaluate_csv_full_expression_and_column_name():
+    """Test full expressions and a custom result column name."""
+
+    # Arrange
+    source = StringIO("price,cost,qty\n10,4,3\n5,5,2\n")
+    target = StringIO()
+
+    # Act
+    evaluate_csv(source, target, "(price - cost) * qty", result_column="profit")
+
+    # Assert
+    assert target.getvalue() == "price,cost,qty,profit\n10,4,3,18.0\n5,5,2,0.0\n"
+
+def test_evaluate_csv_other_errors_and_short_rows():
+    """Test non-real results, overflow and rows missing an operand cell."""
+
+    # Arrange
+    source = StringIO("a,b\n-8,0.5\n4\n4,0.5\n10,1000\n")
+    target = StringIO()
+
+    # Act
+    report = evaluate_csv(source, target, "a ** b")
+
+    # Assert
+    assert report.errors == 3
+    assert target.getvalue() == "a,b,result\n-8,0.5,#ERROR!\n4,#VALUE!\n4,0.5,2.0\n10,1000,#ERROR!\n"
+
+@pytest.mark.parametrize("csv_input, expression, error", [
+    ("", "a + b", ValueError),
+    ("a,b\n1,2\n", "a + c", UndefinedVariableError),
+    ("a,b\n1,2\n", "a +", ValueError),
+])
+def test_evaluate_csv_invalid(csv_input, expression, error):
+    """Test empty input, unknown columns and malformed expressions."""
+
+    with pytest.raises(error):
+        evaluate_csv(StringIO(csv_input), StringIO(), expression)
+
+def test_main_writes_output_file(tmp_path, capsys):
+    """Test the command line with an output file."""
+
+    # Arrange
+    source = tmp_path / "in.csv"
+    output = tmp_path / "out.csv"
+    source.write_text(CSV_INPUT)
+
+    # Act
+    status = main([str(source), "colA * colB", "-o", str(output), "--column", "product"])
+
+    # Assert
+    assert status == 0
+    assert output.read_text().splitlines()[1] == "8,2,x,16.0"
+    assert "4 rows evaluated, 1 errors." in capsys.readouterr().err
+
+def test_main_standard_output_and_errors(tmp_path, capsys):
+    """Test the command line writing to standard output and reporting failures."""
+
+    # Arrange
+    source = tmp_path / "in.csv"
+    source.write_text(CSV_INPUT)
+
+    # Act
+    status = main([str(source), "colA - colB"])
+    missing = main([str(tmp_path / "missing.csv"), "a + b"])
+
+    # Assert
+    captured = capsys.readouterr()
+    assert status == 0 and missing == 1
+    assert "9,3,w,6.0" in captured.out
+    assert "No such file or directory" in captured.err
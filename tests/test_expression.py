@@ -0,0 +1,149 @@
+"""
+tests/test_expression.py
+
+Tests parsing, tree-walking evaluation and compilation of infix expressions.
+"""
+
+import pytest
+from app.calculation import Calculation, CalculationFactory
+from app.expression import (
+    BinaryOp,
+    CompiledExpression,
+    Number,
+    Variable,
+    compile_expression,
+    evaluate,
+    parse,
+    tokenize,
+    variables_of,
+)
+from app.variables import UndefinedVariableError
+
+#-------------------------------------------
+# Parsing
+#-------------------------------------------
+
+def test_tokenize_longest_operator_first():
+    """Test that '**' is one token and not two '*' tokens."""
+
+    assert tokenize("2**x") == [("number", "2"), ("operator", "**"), ("name", "x")]
+
+def test_parse_precedence_and_associativity():
+    """Test operator precedence, left associativity and right-associative '**'."""
+
+    assert parse("1 - 2 - 3") == BinaryOp('-', BinaryOp('-', Number(1.0), Number(2.0)), Number(3.0))
+    assert parse("1 + 2 * x") == BinaryOp('+', Number(1.0), BinaryOp('*', Number(2.0), Variable('x')))
+    assert parse("2 ** 3 ** 2") == BinaryOp('**', Number(2.0), BinaryOp('**', Number(3.0), Number(2.0)))
+
+def test_parse_parentheses_and_negative_literals():
+    """Test grouping with parentheses and negative number literals."""
+
+    assert parse("(1 + 2) * -3") == BinaryOp('*', BinaryOp('+', Number(1.0), Number(2.0)), Number(-3.0))
+
+@pytest.mark.parametrize("source, message", [
+    ("1 +", "Invalid expression: unexpected end of input."),
+    ("(1 + 2", "Invalid expression: unexpected end of input."),
+    ("(1 + 2 3", "Invalid expression: expected ')'."),
+    ("1 2", "Invalid expression: unexpected '2'."),
+    ("* 2", "Invalid expression: unexpected '*'."),
+    ("1 $ 2", "Invalid expression: unexpected '$ 2'."),
+])
+def test_parse_errors(source, message):
+    """Test that malformed expressions raise ValueError with a clear message."""
+
+    with pytest.raises(ValueError) as exc_info:
+        parse(source)
+
+    assert str(exc_info.value) == message
+
+def test_variables_of():
+    """Test collecting the variables of an expression."""
+
+    assert variables_of(parse("y * (x + y) - 2")) == ("x", "y")
+
+#-------------------------------------------
+# Evaluation
+#-------------------------------------------
+
+@pytest.mark.parametrize("source, expected", [
+    ("1 + 2 * 3", 7.0),
+    ("2 ** 3 ** 2", 512.0),
+    ("(x + 2) * y ** 2", 27.0),
+    ("10 % 4 - -2", 4.0),
+    ("8 / 2 / 2", 2.0),
+])
+def test_compiled_matches_tree_walk(source, expected):
+    """Test that compiled functions return the same results as tree walking."""
+
+    # Arrange
+    values = {"x": 1.0, "y": 3.0}
+    compiled = compile_expression(source)
+
+    # Act and Assert
+    assert evaluate(parse(source), values) == expected
+    assert compiled(**{name: values[name] for name in compiled.variables}) == expected
+
+@pytest.mark.parametrize("source, message", [
+    ("x / y", "Cannot divide by zero."),
+    ("x % y", "Modulus: Cannot divide by zero."),
+])
+def test_zero_division_semantics(source, message):
+    """Test that both paths raise the operators' ZeroDivisionError messages."""
+
+    with pytest.raises(ZeroDivisionError) as walk_info:
+        evaluate(parse(source), {"x": 1.0, "y": 0.0})
+    with pytest.raises(ZeroDivisionError) as compiled_info:
+        compile_expression(source)(x=1.0, y=0.0)
+
+    assert str(walk_info.value) == str(compiled_info.value) == message
+
+def test_undefined_variables():
+    """Test that missing variables raise UndefinedVariableError on both paths."""
+
+    with pytest.raises(UndefinedVariableError):
+        evaluate(parse("x + 1"))
+    with pytest.raises(UndefinedVariableError):
+        compile_expression("x + 1")(y=1.0)
+
+#-------------------------------------------
+# Compilation and Caching
+#-------------------------------------------
+
+def test_compile_expression_is_cached():
+    """Test that repeated sources reuse the compiled expression."""
+
+    assert compile_expression("a * b") is compile_expression("a * b")
+
+def test_registering_an_operator_invalidates_the_cache():
+    """Test that custom operators, including word operators, compile after registration."""
+
+    # Arrange
+    before = compile_expression("a + b")
+
+    @CalculationFactory.register_calculation('max')
+    class MaxCalculation(Calculation):
+        operator = 'max'
+
+        def execute(self) -> float:
+            return max(self.a, self.b)
+
+    # Act
+    compiled = compile_expression("a max b + 1")
+
+    # Assert
+    assert compile_expression("a + b") is not before
+    assert compiled(a=2.0, b=5.0) == 6.0
+    assert evaluate(parse("a max b + 1"), {"a": 2.0, "b": 5.0}) == 6.0
+
+def test_compile_unsupported_operator():
+    """Test that an operator that is no longer registered is reported."""
+
+    # Arrange
+    tree = parse("1 + 2")
+    CalculationFactory._calculations.pop('+')
+
+    # Act and Assert
+    with pytest.raises(ValueError) as exc_info:
+        CompiledExpression("1 + 2", tree)
+
+    assert "Unsupported calculation type: '+'" in str(exc_info.value)
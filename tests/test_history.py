@@ -0,0 +1,211 @@
+"""
+tests/test_history.py
+
+Tests session history, its compressed chunks, and exporting and loading.
+"""
+
+import pytest
+from app.calculation import CalculationFactory, AddCalculation, DivideCalculation, MultiplyCalculation, PowerCalculation
+from app.history import History, HistoryRecord, export_history, load_history
+from app.replay import replay_history
+
+def test_export_and_load_round_trip(tmp_path):
+    """Test that exported calculations load back with their recorded results."""
+
+    # Arrange
+    path = tmp_path / "history.csv"
+    history = [AddCalculation(8.0, 2.0), DivideCalculation(1.0, 3.0)]
+
+    # Act
+    count = export_history(history, str(path))
+    records = list(load_history(str(path)))
+
+    # Assert
+    assert count == 2
+    assert records == [
+        HistoryRecord('+', 8.0, 2.0, 10.0),
+        HistoryRecord('/', 1.0, 3.0, 1.0 / 3.0),
+    ]
+
+def test_export_accepts_records(tmp_path):
+    """Test that already stored records can be exported again unchanged."""
+
+    # Arrange
+    path = tmp_path / "history.csv"
+    records = [HistoryRecord('**', 2.0, 10.0, 1024.0)]
+
+    # Act
+    export_history(records, str(path))
+
+    # Assert
+    assert list(load_history(str(path))) == records
+
+def test_export_and_load_complex_result(tmp_path):
+    """Test that a complex power result loads back and replays as a match."""
+
+    # Arrange
+    path = tmp_path / "history.csv"
+    calculation = PowerCalculation(-8.0, 0.5)
+
+    # Act
+    export_history([calculation], str(path))
+    records = list(load_history(str(path)))
+    report = replay_history(records)
+
+    # Assert
+    assert records == [HistoryRecord('**', -8.0, 0.5, calculation.execute())]
+    assert isinstance(records[0].result, complex)
+    assert report.differences == []
+
+def test_load_history_invalid_header(tmp_path):
+    """Test that a file that is not a history export is rejected."""
+
+    # Arrange
+    path = tmp_path / "other.csv"
+    path.write_text("x,y\n1,2\n")
+
+    # Act and Assert
+    with pytest.raises(ValueError):
+        list(load_history(str(path)))
+
+def test_load_history_empty_file(tmp_path):
+    """Test that an empty export yields no records."""
+
+    # Arrange
+    path = tmp_path / "empty.csv"
+    path.write_text("")
+
+    # Act and Assert
+    assert list(load_history(str(path))) == []
+
+def test_history_sequence_and_running_stats():
+    """Test that History behaves like a sequence and keeps result statistics on append."""
+
+    # Arrange
+    history = History([AddCalculation(1.0, 1.0)])
+
+    # Act
+    history.append(DivideCalculation(8.0, 2.0), 4.0)
+    history.append(AddCalculation(2.0, 4.0))
+
+    # Assert
+    assert len(history) == 3
+    assert repr(history[1]) == "DivideCalculation(a=8.0, b=2.0)"
+    assert [repr(c) for c in history[1:]] == ["DivideCalculation(a=8.0, b=2.0)", "AddCalculation(a=2.0, b=4.0)"]
+    assert history.stats.overall.count == 3
+    assert history.stats.overall.mean == 4.0
+    assert history.stats.by_operator['+'].count == 2
+    assert not History()
+
+@pytest.mark.parametrize("codec", ["zlib", "lzma"])
+def test_history_seals_older_entries(codec):
+    """Test that older entries are sealed into chunks and read back transparently."""
+
+    # Arrange
+    calculations = [MultiplyCalculation(float(i), 2.0) for i in range(10)]
+
+    # Act
+    history = History(calculations, chunk_size=3, codec=codec)
+
+    # Assert
+    assert len(history) == 10 and history.sealed == 6
+    assert len(history.live()) == 4
+    assert [repr(c) for c in history] == [repr(c) for c in calculations]
+    assert repr(history[4]) == repr(calculations[4]) and repr(history[-1]) == repr(calculations[9])
+    assert [repr(c) for c in history[2:8:2]] == [repr(c) for c in calculations[2:8:2]]
+    assert history[7] is calculations[7]
+    assert 0 < history.compressed_bytes() < history.storage_bytes()
+    assert history.stats.overall.count == 10
+    with pytest.raises(IndexError):
+        history[10]
+    with pytest.raises(IndexError):
+        history[-11]
+
+def test_history_entries_keep_results():
+    """Test that stored results are read back with their entries, sealed or not, without executing."""
+
+    # Arrange
+    calculations = [MultiplyCalculation(float(i), 2.0) for i in range(5)] + [PowerCalculation(-8.0, 0.5)]
+    results = [float(i) for i in range(5)] + [complex(1, 2)]   # not what 'execute' returns
+
+    # Act
+    history = History(chunk_size=2)
+    for calculation, result in zip(calculations, results):
+        history.append(calculation, result)
+
+    # Assert
+    assert history.sealed == 4
+    assert [result for _, result in history.entries()] == results
+    assert [repr(c) for c, _ in history.entries()] == [repr(c) for c in calculations]
+
+def test_history_seals_unpackable_results():
+    """Test that an entry whose result is not a float is kept as an object with its result."""
+
+    # Arrange
+    calculations = [PowerCalculation(-8.0, 0.5), AddCalculation(1.0, 2.0), AddCalculation(3.0, 4.0)]
+
+    # Act
+    history = History(calculations, chunk_size=1)
+
+    # Assert
+    assert history.sealed == 2
+    assert history[0] is calculations[0]
+    assert list(history.entries())[0] == (calculations[0], (-8.0) ** 0.5)
+
+def test_history_keeps_unpackable_entries():
+    """Test that entries without two float operands are kept as objects in their chunk."""
+
+    # Arrange
+    big = PowerCalculation(3, 100)
+    complex_operand = AddCalculation(complex(1, 2), 1.0)
+    calculations = [big, AddCalculation(1.0, 2.0), complex_operand, AddCalculation(3.0, 4.0)]
+
+    # Act
+    history = History(calculations, chunk_size=2)
+
+    # Assert
+    assert history.sealed == 2
+    assert history[0] is big and history[0].execute() == 3 ** 100
+    assert repr(history[1]) == "AddCalculation(a=1.0, b=2.0)"
+    assert history[2] is complex_operand
+
+def test_history_spills_chunks_to_disk(tmp_path):
+    """Test that with a spill file compressed chunks are not kept in memory."""
+
+    # Arrange
+    path = tmp_path / "history.bin"
+    calculations = [AddCalculation(float(i), 1.0) for i in range(8)]
+
+    # Act
+    history = History(calculations, chunk_size=2, spill_path=str(path))
+    in_memory = History(calculations, chunk_size=2)
+
+    # Assert
+    assert history.sealed == 6
+    assert path.stat().st_size == history.compressed_bytes() > 0
+    assert history.storage_bytes() < in_memory.storage_bytes()
+    assert [repr(c) for c in history] == [repr(c) for c in calculations]
+    history.close()
+    in_memory.close()
+
+@pytest.mark.parametrize("arguments", [{"chunk_size": 0}, {"codec": "bz2"}])
+def test_history_rejects_bad_arguments(arguments):
+    """Test argument validation."""
+
+    with pytest.raises(ValueError):
+        History(**arguments)
+
+def test_history_seals_shared_instances():
+    """Test that shared (interned) calculations are sealed and rebuilt like any other."""
+
+    # Arrange
+    CalculationFactory.set_interning(True)
+    calculations = [CalculationFactory.create_calculation(2.0, '*', 3.0) for _ in range(5)]
+
+    # Act
+    history = History(calculations, chunk_size=2)
+
+    # Assert
+    assert history.sealed == 2
+    assert [str(c) for c in history] == ["MultiplyCalculation: 2.0 * 3.0 = 6.0"] * 5
+    assert isinstance(history[0], MultiplyCalculation)
@@ -0,0 +1,73 @@
+"""
+tests/test_memory.py
+
+Tests the memory usage report.
+"""
+
+import tracemalloc
+import pytest
+from app.calculation import CalculationFactory
+from app.history import History
+from app.memory import calculation_bytes, format_bytes, memory_report, process_memory, stop_tracing
+
+@pytest.fixture
+def no_tracing():
+    """Makes sure tracemalloc is off before and after a test."""
+    stop_tracing()
+    yield
+    stop_tracing()
+
+@pytest.mark.parametrize("size, text", [
+    (512, "512 B"), (1536, "1.5 KiB"), (3 * 1024 ** 2, "3.0 MiB"), (5 * 1024 ** 3, "5.0 GiB"),
+])
+def test_format_bytes(size, text):
+    """Test human-readable byte counts."""
+
+    assert format_bytes(size) == text
+
+def test_process_memory():
+    """Test that the resident set size is known here and the peak is at least the current size."""
+
+    # Act
+    current, peak = process_memory()
+
+    # Assert
+    assert 0 < current <= peak
+
+def test_calculation_bytes_counts_shared_objects_once():
+    """Test that a Calculation referenced twice is counted once."""
+
+    # Arrange
+    first = CalculationFactory.create_calculation(1.0, '+', 2.0)
+    second = CalculationFactory.create_calculation(3.0, '*', 4.0)
+
+    # Act
+    one = calculation_bytes([first])
+    shared = calculation_bytes([first, first, second])
+
+    # Assert
+    assert one[0] == 1 and one[1] > 0
+    assert shared[0] == 2 and shared[1] <= 2 * one[1] + 64
+
+def test_memory_report_starts_tracing_on_demand(no_tracing):
+    """Test that the first report starts tracemalloc and later ones list allocation sites."""
+
+    # Arrange
+    history = History([CalculationFactory.create_calculation(1.0, '+', 2.0)])
+
+    # Act
+    first = memory_report(history)
+    kept = [CalculationFactory.create_calculation(float(i), '+', 1.0) for i in range(1000)]
+    second = memory_report(history, top=3)
+    stopped = stop_tracing()
+
+    # Assert
+    assert "History list:" in first and "for 1 entries (0 in compressed chunks" in first
+    assert "Calculation objects:" in first and "1 distinct objects" in first
+    assert "Allocation tracing started" in first
+    assert "Traced since tracing started:" in second
+    sites = second.splitlines()[second.splitlines().index("Top allocation sites:") + 1:]
+    assert 1 <= len(sites) <= 3
+    assert "app/calculation/__init__.py" in sites[0]
+    assert stopped and not tracemalloc.is_tracing() and not stop_tracing()
+    assert len(kept) == 1000
@@ -27,7 +27,8 @@ Test Criteria:
 """
 
 import pytest
-from app.operation import Operation
+from array import array
+from app.operation import Operation, VectorOperation
 
 #-----------------------------------------
 # Test Addition Method
@@ -440,4 +441,86 @@ def test_operations_invalid_input_types(calc_method, a, b, expected_exception):
     """Testing invalid input parameters to raise TypeError."""
 
     with pytest.raises(expected_exception):
-        calc_method(a, b)
\ No newline at end of file
+        calc_method(a, b)
+
+#-----------------------------------------
+# Test Vectorized Kernels
+#-----------------------------------------
+
+@pytest.mark.parametrize(
+    "kernel, scalar",
+    [
+        (VectorOperation.addition, Operation.addition),
+        (VectorOperation.subtraction, Operation.subtraction),
+        (VectorOperation.multiplication, Operation.multiplication),
+        (VectorOperation.division, Operation.division),
+        (VectorOperation.power, Operation.power),
+        (VectorOperation.modulus, Operation.modulus)
+    ])
+
+def test_vector_kernels_match_scalar_methods(kernel, scalar):
+    """Testing that each kernel matches its scalar 'Operation' method element-wise."""
+
+    # Arrange
+    a = [8.0, -3.0, 2.5, 0.0]
+    b = [2.0, 4.0, -0.5, 7.0]
+    expected_result = [scalar(x, y) for x, y in zip(a, b)]
+
+    # Act
+    result = kernel(a, b)
+
+    # Assert
+    assert result == expected_result
+
+def test_vector_kernel_writes_into_out_buffer():
+    """Testing that a kernel writes float64 results into a given buffer and returns it."""
+
+    # Arrange
+    a = array('d', [1.0, 2.0, 3.0])
+    b = array('d', [4.0, 5.0, 6.0])
+    out = array('d', [0.0] * 3)
+
+    # Act
+    result = VectorOperation.multiplication(a, b, out=out)
+
+    # Assert
+    assert result is out
+    assert list(out) == [4.0, 10.0, 18.0]
+
+def test_vector_kernel_writes_into_memoryview():
+    """Testing that a kernel can write into a float64 memoryview."""
+
+    # Arrange
+    out = memoryview(bytearray(16)).cast('d')
+
+    # Act
+    VectorOperation.addition([1.0, 2.0], [3.0, 4.0], out=out)
+
+    # Assert
+    assert out.tolist() == [4.0, 6.0]
+
+@pytest.mark.parametrize(
+    "kernel, message",
+    [
+        (VectorOperation.division, "Cannot divide by zero."),
+        (VectorOperation.modulus, "Modulus: Cannot divide by zero.")
+    ])
+
+def test_vector_kernels_zero_divisor(kernel, message):
+    """Testing that a zero divisor anywhere raises before any result is produced."""
+
+    # Arrange
+    out = [None, None]
+
+    # Act and Assert
+    with pytest.raises(ZeroDivisionError) as exc_info:
+        kernel([1.0, 2.0], [1.0, 0.0], out=out)
+
+    assert str(exc_info.value) == message
+    assert out == [None, None]
+
+def test_vector_kernel_length_mismatch():
+    """Testing that operand sequences of different lengths raise ValueError."""
+
+    with pytest.raises(ValueError):
+        VectorOperation.addition([1.0, 2.0], [1.0])
@@ -0,0 +1,128 @@
+"""
+tests/test_optimizer.py
+
+Tests constant folding and common-subexpression elimination for expression batches.
+"""
+
+from unittest.mock import patch
+import math
+import pytest
+from app.calculation import CalculationFactory
+from app.expression import evaluate, parse
+from app.optimizer import Constant, Input, Operator, evaluate_batch, optimize_batch
+from app.variables import UndefinedVariableError
+
+def test_repeated_constant_subexpression_is_folded_once():
+    """Test that a constant subterm repeated across the batch executes once."""
+
+    # Arrange
+    expressions = ["2 ** 64 + x"] * 1000
+
+    # Act
+    with patch.object(CalculationFactory, 'create_calculation',
+                      wraps=CalculationFactory.create_calculation) as mock_create:
+        batch = optimize_batch(expressions)
+        folded_calls = mock_create.call_count
+        results = batch.evaluate({"x": 1.0})
+
+    # Assert
+    assert folded_calls == 1
+    assert mock_create.call_count == 2
+    assert results == [2.0 ** 64 + 1.0] * 1000
+    assert batch.folded == 1
+    assert batch.operator_count == 1
+
+def test_common_subexpressions_are_shared():
+    """Test that identical subexpressions map to the same DAG node."""
+
+    # Arrange
+    expressions = ["(x * y) + 1", "(x * y) - 1", "x * y"]
+
+    # Act
+    batch = optimize_batch(expressions)
+
+    # Assert
+    assert batch.nodes == [
+        Input("x"), Input("y"), Operator('*', 0, 1), Constant(1.0),
+        Operator('+', 2, 3), Operator('-', 2, 3),
+    ]
+    assert batch.roots == [4, 5, 2]
+    assert batch.tree_size == 13
+
+@pytest.mark.parametrize("source", [
+    "(x + 2) * y ** 2 - x / y",
+    "2 * 3 + x * (4 - 1)",
+    "x % 3 + (1 + 1) ** (1 + 2)",
+])
+def test_optimized_results_match_tree_walk(source):
+    """Test that optimization preserves results."""
+
+    # Arrange
+    values = {"x": 5.0, "y": 2.0}
+
+    # Act
+    results, _ = evaluate_batch([source], values)
+
+    # Assert
+    assert results == [evaluate(parse(source), values)]
+
+def test_signed_zero_constants_are_not_merged():
+    """Test that 0.0 and -0.0 stay distinct constants."""
+
+    # Act
+    results, _ = evaluate_batch(["-0.0 * 1", "0 * 1"])
+
+    # Assert
+    assert math.copysign(1.0, results[0]) == -1.0
+    assert math.copysign(1.0, results[1]) == 1.0
+
+def test_complex_constants_are_folded_and_shared():
+    """Test that complex folded values keep one result per expression and are shared."""
+
+    # Act
+    results, batch = evaluate_batch(["-8 ** 0.5", "x + 1", "-8 ** 0.5"], {"x": 1.0})
+
+    # Assert
+    assert results[0] == (-8) ** 0.5
+    assert results[1] == 2.0
+    assert batch.roots[0] == batch.roots[2]
+
+def test_complex_operand_errors_are_per_expression():
+    """Test that an operator without complex support fails only its own expression."""
+
+    # Act
+    results, _ = evaluate_batch(["-8 ** 0.5 % 2", "1 + 1"])
+    variable_results, _ = evaluate_batch(["x % 2", "x + 1"], {"x": 1j})
+
+    # Assert
+    assert isinstance(results[0], TypeError)
+    assert results[1] == 2.0
+    assert isinstance(variable_results[0], TypeError)
+    assert variable_results[1] == 1 + 1j
+
+def test_errors_are_per_expression():
+    """Test that folding, parsing and evaluation errors are returned per expression."""
+
+    # Arrange
+    expressions = ["1 / 0 + x", "x +", "y * 2", "x % 0", "x + 1"]
+
+    # Act
+    results, batch = evaluate_batch(expressions, {"x": 1.0})
+
+    # Assert
+    assert isinstance(results[0], ZeroDivisionError)
+    assert isinstance(results[1], ValueError)
+    assert isinstance(results[2], UndefinedVariableError)
+    assert str(results[3]) == "Modulus: Cannot divide by zero."
+    assert results[4] == 2.0
+    assert batch.operator_count == 3
+
+def test_trees_are_accepted():
+    """Test that already parsed trees can be optimized."""
+
+    # Act
+    batch = optimize_batch([parse("1 + 1"), "1 + 1"])
+
+    # Assert
+    assert batch.roots[0] == batch.roots[1]
+    assert batch.evaluate() == [2.0, 2.0]
@@ -0,0 +1,135 @@
+"""
+tests/test_outcome.py
+
+Tests result-or-error outcomes and exception-free evaluation.
+"""
+
+import math
+import random
+import pytest
+from app.calculation import Calculation, CalculationFactory
+from app.operation import CheckedOperation
+from app.outcome import ErrorCode, ErrorCounts, Failure, classify, is_failure, json_result
+
+@pytest.mark.parametrize("error, code", [
+    (ZeroDivisionError("x"), ErrorCode.DIVIDE_BY_ZERO),
+    (OverflowError("x"), ErrorCode.OVERFLOW),
+    (ValueError("math domain error"), ErrorCode.DOMAIN_ERROR),
+    (MemoryError(), ErrorCode.RESOURCE_LIMIT),
+    (RecursionError("maximum recursion depth exceeded"), ErrorCode.RESOURCE_LIMIT),
+    (TypeError("x"), ErrorCode.CALCULATION_ERROR),
+])
+def test_classify(error, code):
+    """Test mapping exceptions to error codes."""
+
+    assert classify(error) is code
+
+def test_failure_and_codes():
+    """Test telling failures from results, and that codes compare equal to their strings."""
+
+    # Act
+    bad = Failure(ErrorCode.OVERFLOW, "too large")
+
+    # Assert
+    assert is_failure(bad) and not is_failure(3.0) and not is_failure(("overflow", "x"))
+    assert bad.code == "overflow" and str(bad.code) == "overflow"
+
+@pytest.mark.parametrize("a, method, b, code", [
+    (1.0, 'division', 0.0, ErrorCode.DIVIDE_BY_ZERO),
+    (1.0, 'modulus', -0.0, ErrorCode.DIVIDE_BY_ZERO),
+    (0.0, 'power', -1.0, ErrorCode.DIVIDE_BY_ZERO),
+    (10.0, 'power', 400.0, ErrorCode.OVERFLOW),
+    (0.5, 'power', -2000.0, ErrorCode.OVERFLOW),
+    (-8.0, 'power', 0.5, ErrorCode.DOMAIN_ERROR),
+    (-8.0, 'power', 3.0, None),
+    (0.0, 'power', -math.inf, None),
+    (10, 'power', 400, None),
+])
+def test_checked_operation_codes(a, method, b, code):
+    """Test the failures detected before computing."""
+
+    # Act
+    outcome = getattr(CheckedOperation, method)(a, b)
+
+    # Assert
+    if code is None:
+        assert not is_failure(outcome)
+    else:
+        assert outcome.code is code
+
+def test_checked_operation_matches_raising_path():
+    """Test that Calculation.evaluate agrees with execute on random and special operands."""
+
+    # Arrange
+    rng = random.Random(40)
+    specials = [0.0, -0.0, 1.0, -2.0, 0.5, 1e308, -1e-308, math.inf, -math.inf, 1024.0, -1023.5, 3]
+    def operand():
+        if rng.random() < 0.5:
+            return rng.choice(specials)
+        return rng.uniform(-1e3, 1e3) * 10 ** rng.randint(-5, 4)
+
+    for _ in range(5000):
+        a, b = operand(), operand()
+        for calculation_type in ('+', '-', '*', '/', '**', '%'):
+            calculation = CalculationFactory.create_calculation(a, calculation_type, b)
+
+            # Act
+            outcome = calculation.evaluate()
+
+            # Assert
+            try:
+                expected = calculation.execute()
+            except ArithmeticError as error:
+                assert outcome.code is classify(error)
+                continue
+            if isinstance(expected, complex):
+                assert outcome.code is ErrorCode.DOMAIN_ERROR
+            elif math.isnan(expected):
+                assert math.isnan(outcome)
+            else:
+                assert outcome == expected
+
+def test_evaluate_without_checked_operation():
+    """Test that a calculation without a checked method maps its exceptions."""
+
+    # Arrange
+    @CalculationFactory.register_calculation('log')
+    class LogCalculation(Calculation):
+        operator = 'log'
+
+        def execute(self) -> float:
+            return math.log(self.a, self.b)
+
+    # Act
+    good = CalculationFactory.create_calculation(8.0, 'log', 2.0).evaluate()
+    bad = CalculationFactory.create_calculation(-1.0, 'log', 2.0).evaluate()
+    huge = CalculationFactory.create_calculation(10 ** 400, '+', 1.0).evaluate()
+
+    # Assert
+    assert good == pytest.approx(3.0)
+    assert bad.code is ErrorCode.DOMAIN_ERROR and bad.message == "math domain error"
+    assert huge.code is ErrorCode.OVERFLOW
+
+def test_error_counts():
+    """Test counting error codes and the summary line."""
+
+    # Act
+    counts = ErrorCounts.of([None, ErrorCode.OVERFLOW, ErrorCode.DIVIDE_BY_ZERO,
+                             None, ErrorCode.DIVIDE_BY_ZERO])
+    single = ErrorCounts.of([ErrorCode.OVERFLOW])
+
+    # Assert
+    assert counts == {"divide_by_zero": 2, "overflow": 1}
+    assert counts.errors == 3
+    assert counts.summary() == "3 errors (divide_by_zero: 2, overflow: 1)"
+    assert single.summary() == "1 error (overflow: 1)"
+    assert ErrorCounts().summary() == "0 errors"
+
+@pytest.mark.parametrize("result, value", [
+    (1.5, 1.5), (2, 2), (None, None), (10 ** 400, 10 ** 400),
+    (math.inf, "inf"), (-math.inf, "-inf"), (math.nan, "nan"), (complex(1, 1), "(1+1j)"),
+])
+def test_json_result(result, value):
+    """Test that only finite real results stay JSON numbers."""
+
+    assert json_result(result) == value
@@ -0,0 +1,211 @@
+"""
+tests/test_output.py
+
+Tests the buffered output writer.
+"""
+
+import json
+import os
+from io import StringIO
+import pytest
+from app.calculation import CalculationFactory
+from app.output import OutputWriter, write_results
+from app.stream import evaluate_stream
+
+class CountingStream(StringIO):
+    """StringIO that counts write calls."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    def write(self, text: str) -> int:
+        self.calls += 1
+        return super().write(text)
+
+def test_writer_buffers_until_flush():
+    """Test that lines are written in one call on flush."""
+
+    # Arrange
+    stream = CountingStream()
+    writer = OutputWriter(stream, max_delay=60)
+
+    # Act
+    writer.line("Welcome")
+    writer.result(CalculationFactory.create_calculation(1.0, '+', 2.0), 3.0)
+    writer.result("MultiplyCalculation: 3.0 * 4.0 = 12.0", 12.0, name="x")
+    writer.error("calculation_error", "Overflow.")
+    buffered = stream.getvalue()
+    writer.flush()
+    writer.flush()
+
+    # Assert
+    assert buffered == ""
+    assert stream.calls == 1
+    assert writer.writes == 1
+    assert stream.getvalue() == (
+        "Welcome\n"
+        "Result: AddCalculation: 1.0 + 2.0 = 3.0\n"
+        "Result: x = MultiplyCalculation: 3.0 * 4.0 = 12.0\n"
+        "Error: Overflow.\n"
+    )
+
+def test_writer_flushes_on_size_and_time():
+    """Test the size and time thresholds."""
+
+    # Arrange
+    by_size = CountingStream()
+    by_time = CountingStream()
+    size_writer = OutputWriter(by_size, max_bytes=11, max_delay=60)
+    time_writer = OutputWriter(by_time, max_delay=0)
+
+    # Act
+    size_writer.line("1234")
+    size_writer.line("5678")
+    before = by_size.calls
+    size_writer.line("9")
+    time_writer.line("now")
+
+    # Assert
+    assert before == 0
+    assert by_size.getvalue() == "1234\n5678\n9\n"
+    assert by_time.getvalue() == "now\n"
+
+def reject_constant(name: str):
+    """Fails on 'Infinity', '-Infinity' and 'NaN', which strict JSON readers reject."""
+    raise ValueError(f"Invalid JSON constant: {name}")
+
+def test_writer_json_lines():
+    """Test JSON Lines rendering of messages, results and errors."""
+
+    # Arrange
+    stream = StringIO()
+    writer = OutputWriter(stream, json_lines=True)
+
+    # Act
+    writer.line(ValueError("bad"))
+    writer.result("PowerCalculation", complex(1, 1), name="z")
+    writer.result("MultiplyCalculation", float("inf"))
+    writer.error("divide_by_zero", "Cannot divide by zero.", index=3)
+    writer.flush()
+
+    # Assert
+    records = [json.loads(line, parse_constant=reject_constant)
+               for line in stream.getvalue().splitlines()]
+    assert records == [
+        {"message": "bad"},
+        {"name": "z", "calculation": "PowerCalculation", "result": "(1+1j)"},
+        {"name": None, "calculation": "MultiplyCalculation", "result": "inf"},
+        {"index": 3, "error": "divide_by_zero", "message": "Cannot divide by zero."},
+    ]
+
+@pytest.mark.parametrize("max_bytes, max_delay", [(0, 0.1), (10, -1)])
+def test_writer_rejects_bad_thresholds(max_bytes, max_delay):
+    """Test that invalid thresholds raise ValueError."""
+
+    # Act and Assert
+    with pytest.raises(ValueError):
+        OutputWriter(max_bytes=max_bytes, max_delay=max_delay)
+
+def test_read_input_piped_buffers_prompt(monkeypatch):
+    """Test that piped input keeps the prompt in order without flushing."""
+
+    # Arrange
+    stream = CountingStream()
+    writer = OutputWriter(stream, max_delay=60)
+    monkeypatch.setattr('sys.stdin', StringIO("1 + 2\n"))
+    writer.line("Result: 1")
+
+    # Act
+    text = writer.read_input(">> ")
+    writer.flush()
+
+    # Assert
+    assert text == "1 + 2"
+    assert stream.getvalue() == "Result: 1\n>> "
+    assert stream.calls == 1
+
+def test_read_input_piped_flushes_before_blocking(monkeypatch):
+    """Test that piped input flushes the buffer only when no input is ready yet."""
+
+    # Arrange
+    read_end, write_end = os.pipe()
+    stdin = os.fdopen(read_end)
+    stream = CountingStream()
+    writer = OutputWriter(stream, max_delay=60)
+    seen = []   # output written when input() is called
+
+    def fake_input(prompt: str) -> str:
+        seen.append(stream.getvalue())
+        return os.read(read_end, 64).decode().strip() if len(seen) == 1 else "exit"
+
+    monkeypatch.setattr('sys.stdin', stdin)
+    monkeypatch.setattr('builtins.input', fake_input)
+
+    # Act
+    os.write(write_end, b"1 + 2\n")
+    writer.line("Result: 1")
+    ready = writer.read_input(">> ")
+    writer.line("Result: 3")
+    waiting = writer.read_input(">> ")   # nothing written: reading would block
+
+    # Assert
+    assert (ready, waiting) == ("1 + 2", "exit")
+    assert seen == ["", "Result: 1\n>> Result: 3\n>> "]
+    assert stream.calls == 1
+    stdin.close()
+    os.close(write_end)
+
+def test_read_input_flushes_when_readiness_is_unknown(monkeypatch):
+    """Test that input that cannot be polled (e.g. Windows pipes) is treated as blocking."""
+
+    # Arrange
+    stream = StringIO()
+    writer = OutputWriter(stream, max_delay=60)
+    monkeypatch.setattr('sys.stdin', StringIO("1 + 2\n"))
+    monkeypatch.setattr('select.select', lambda *args: (_ for _ in ()).throw(OSError("not a socket")))
+    writer.line("Result: 1")
+
+    # Act
+    text = writer.read_input(">> ")
+
+    # Assert
+    assert text == "1 + 2"
+    assert stream.getvalue() == "Result: 1\n>> "
+
+def test_read_input_terminal_flushes_first(monkeypatch):
+    """Test that the buffer is flushed before waiting on a terminal."""
+
+    # Arrange
+    stream = StringIO()
+    writer = OutputWriter(stream, max_delay=60)
+    prompts = []
+    monkeypatch.setattr('sys.stdin.isatty', lambda: True, raising=False)
+    monkeypatch.setattr('builtins.input', lambda prompt: prompts.append((prompt, stream.getvalue())) or "help")
+    writer.line("Result: 1")
+
+    # Act
+    text = writer.read_input(">> ")
+
+    # Assert
+    assert text == "help"
+    assert prompts == [(">> ", "Result: 1\n")]
+
+def test_write_results_counts_errors():
+    """Test writing stream outcomes and counting errors."""
+
+    # Arrange
+    stream = StringIO()
+    writer = OutputWriter(stream)
+
+    # Act
+    errors = write_results(evaluate_stream(["1 + 2", "1 / 0", "2 * 3"]), writer)
+
+    # Assert
+    assert errors == {"divide_by_zero": 1}
+    assert errors.errors == 1
+    assert stream.getvalue().splitlines() == [
+        "Result: AddCalculation: 1.0 + 2.0 = 3.0",
+        "Error: item 1: Cannot divide by zero.",
+        "Result: MultiplyCalculation: 2.0 * 3.0 = 6.0",
+    ]
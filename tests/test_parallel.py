@@ -0,0 +1,87 @@
+"""
+tests/test_parallel.py
+
+Tests shared-memory multiprocess evaluation.
+"""
+
+import math
+from array import array
+import pytest
+from multiprocessing import shared_memory
+from app.columnar import encode_operators
+from app.parallel import _evaluate_range, evaluate_parallel, split_ranges
+
+@pytest.mark.parametrize("rows, parts, min_chunk, expected", [
+    (10, 3, 1, [(0, 4), (4, 7), (7, 10)]),
+    (10, 4, 5, [(0, 5), (5, 10)]),
+    (10, 4, 100, [(0, 10)]),
+    (2, 8, 1, [(0, 1), (1, 2)]),
+    (0, 4, 1, []),
+])
+def test_split_ranges(rows, parts, min_chunk, expected):
+    """Test splitting rows into contiguous worker ranges."""
+
+    assert split_ranges(rows, parts, min_chunk) == expected
+
+def test_evaluate_parallel_mixed_operators():
+    """Test per-row operators across several workers, with a failing row."""
+
+    # Arrange
+    a = [1.0, 2.0, 3.0, 4.0, 2.0, 9.0]
+    operators = ['+', '/', '/', '%', '**', '-']
+    b = [1.0, 0.0, 2.0, 3.0, 3.0, 4.0]
+
+    # Act
+    results, report = evaluate_parallel(a, operators, b, workers=3, min_chunk=1)
+
+    # Assert
+    assert report == (6, 5, 1, {"divide_by_zero": 1})
+    assert results[0] == 2.0 and math.isnan(results[1])
+    assert list(results[2:]) == [1.5, 1.0, 8.0, 5.0]
+
+def test_evaluate_parallel_single_operator_arrays():
+    """Test one operator for every row with float64 array inputs."""
+
+    # Arrange
+    a = array('d', range(1000))
+    b = array('d', [2.0]) * 1000
+
+    # Act
+    results, report = evaluate_parallel(a, '*', b, workers=2, min_chunk=100)
+
+    # Assert
+    assert results == array('d', (2.0 * i for i in range(1000)))
+    assert report.vectorized == 1000
+
+def test_evaluate_parallel_empty_and_invalid():
+    """Test an empty batch, mismatched lengths and an uncoded operator."""
+
+    assert evaluate_parallel([], '+', []) == (array('d'), (0, 0, 0, {}))
+    with pytest.raises(ValueError):
+        evaluate_parallel([1.0, 2.0], '+', [1.0])
+    with pytest.raises(ValueError):
+        evaluate_parallel([1.0], '//', [1.0])
+
+def test_worker_evaluates_its_range_in_place():
+    """Test the worker task in-process: only its range of the shared output is written."""
+
+    # Arrange
+    blocks = [shared_memory.SharedMemory(create=True, size=size) for size in (32, 32, 4, 32)]
+    try:
+        blocks[0].buf[:32] = array('d', [1.0, 2.0, 3.0, 4.0]).tobytes()
+        blocks[1].buf[:32] = array('d', [1.0, 1.0, 0.0, 2.0]).tobytes()
+        blocks[2].buf[:4] = encode_operators(['+', '+', '/', '/'])
+        blocks[3].buf[:32] = array('d', [-1.0] * 4).tobytes()
+
+        # Act
+        counts = _evaluate_range(tuple(block.name for block in blocks), 1, 4)
+
+        # Assert
+        results = array('d', bytes(blocks[3].buf[:32]))
+        assert counts == (1, {"divide_by_zero": 1})
+        assert results[0] == -1.0 and results[1] == 3.0
+        assert math.isnan(results[2]) and results[3] == 2.0
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
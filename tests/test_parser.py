@@ -0,0 +1,88 @@
+"""
+tests/test_parser.py
+
+Tests the REPL and batch input parser.
+"""
+
+import pytest
+from app.calculation import Calculation, CalculationFactory
+from app.parser import (
+    INVALID_INPUT,
+    INVALID_INPUT_MESSAGE,
+    UNSUPPORTED_OPERATOR,
+    ParsedInput,
+    parse_input,
+    parse_tokens,
+)
+
+@pytest.mark.parametrize("text, expected", [
+    ("8 + 2", ParsedInput(None, 8.0, '+', 2.0)),
+    ("  -1.5e3   **  .5 ", ParsedInput(None, -1500.0, '**', 0.5)),
+    ("x = 3 * 4", ParsedInput('x', 3.0, '*', 4.0)),
+    ("ans % y", ParsedInput(None, 'ans', '%', 'y')),
+    ("1_000 - inf", ParsedInput(None, 1000.0, '-', float('inf'))),
+    ("Infinity / y", ParsedInput(None, float('inf'), '/', 'y')),
+])
+def test_parse_valid_input(text, expected):
+    """Test parsing numbers, names and assignments."""
+
+    # Act
+    parsed = parse_input(text)
+
+    # Assert
+    assert parsed == expected
+    assert parsed.ok
+
+@pytest.mark.parametrize("text", [
+    "", "add 5", "1 + 2 + 3", "8 + $", "x + @", "1.2.3 + 1", "x = 1 +", "x == 1 + 2 3", "5 = 1 + 2", "x + 1.2.3",
+])
+def test_parse_invalid_input(text):
+    """Test that malformed input returns a structured error without raising."""
+
+    # Act
+    parsed = parse_input(text)
+
+    # Assert
+    assert not parsed.ok
+    assert parsed.error == INVALID_INPUT
+    assert parsed.message == INVALID_INPUT_MESSAGE
+
+def test_parse_unsupported_operator():
+    """Test that operators are checked against the registered set."""
+
+    # Act
+    parsed = parse_input("2 // 3")
+
+    # Assert
+    assert parsed.error == UNSUPPORTED_OPERATOR
+    assert parsed.message == CalculationFactory.unsupported_message('//')
+    assert (parsed.a, parsed.operator, parsed.b) == (2.0, '//', 3.0)
+
+def test_parse_sees_newly_registered_operators():
+    """Test that registering an operator makes it parse without restarting."""
+
+    # Arrange
+    assert parse_input("1 max 2").error == UNSUPPORTED_OPERATOR
+
+    @CalculationFactory.register_calculation('max')
+    class MaxCalculation(Calculation):
+        operator = 'max'
+
+        def execute(self) -> float:
+            return max(self.a, self.b)
+
+    # Act and Assert
+    assert parse_input("1 max 2").ok
+
+def test_parse_tokens_returns_the_fields_of_parse_input():
+    """Test that the hot-path form yields the same fields as a plain tuple."""
+
+    # Act
+    fields = parse_tokens("x = 8 + y".split())
+    unsupported = parse_tokens(["2", "//", "3"])
+
+    # Assert
+    assert type(fields) is tuple
+    assert fields == tuple(parse_input("x = 8 + y")) == ('x', 8.0, '+', 'y', None, None)
+    assert unsupported == tuple(parse_input("2 // 3"))
+    assert parse_tokens([]) == tuple(parse_input(""))
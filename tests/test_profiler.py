@@ -0,0 +1,129 @@
+"""
+tests/test_profiler.py
+
+Tests in-session profiling.
+"""
+
+import cProfile
+import sys
+import threading
+import pytest
+import app.profiler
+from app.calculation import CalculationFactory
+from app.parser import parse_input
+from app.profiler import SessionProfiler
+
+class BusyProfile(cProfile.Profile):
+    """A profile that cannot start, like a second one on Python 3.12+."""
+
+    def enable(self, *args, **kwargs):
+        raise ValueError("Another profiling tool is already active")
+
+def stage_calls(report: str) -> dict:
+    """Reads the stage summary of a report: stage -> calls."""
+    return {line.split()[0]: int(line.split()[1]) for line in report.splitlines()[1:6]}
+
+def test_report_includes_stages_from_all_threads():
+    """Test that the report covers the profiled thread and wrapped functions on other threads."""
+
+    # Arrange
+    profiler = SessionProfiler()
+    calculation = CalculationFactory.create_calculation(2.0, '*', 3.0)
+    results = []
+
+    # Act
+    profiler.start()
+    parse_input("2 * 3")
+    CalculationFactory.create_calculation(2.0, '*', 3.0)
+    worker = threading.Thread(target=lambda: results.append(profiler.wrap(calculation.execute)()))
+    worker.start()
+    worker.join()
+    report = profiler.stop()
+
+    # Assert
+    assert results == [6.0]
+    assert stage_calls(report) == {"parse": 1, "dispatch": 1, "execute": 1, "__str__": 0, "output": 0}
+    assert "Ordered by: internal time" in report
+    assert not profiler.active
+
+def test_paused_and_unwrapped_work_is_excluded():
+    """Test that paused blocks and work outside a session are not profiled."""
+
+    # Arrange
+    profiler = SessionProfiler()
+    calculation = CalculationFactory.create_calculation(2.0, '+', 3.0)
+
+    # Act
+    with profiler.paused():
+        parse_input("1 + 1")
+    unwrapped = profiler.wrap(calculation.execute)
+    profiler.start()
+    parse_input("1 + 1")
+    with profiler.paused():
+        parse_input("1 + 1")
+    report = profiler.stop()
+    profiler.start()
+    profiler.cancel()
+    profiler.cancel()
+
+    # Assert
+    assert unwrapped == calculation.execute
+    assert stage_calls(report)["parse"] == 1
+    assert not profiler.active
+
+def test_start_and_stop_out_of_order():
+    """Test that starting twice or stopping a stopped profiler raises ValueError."""
+
+    # Arrange
+    profiler = SessionProfiler()
+
+    # Act and Assert
+    with pytest.raises(ValueError, match="not running"):
+        profiler.stop()
+    profiler.start()
+    with pytest.raises(ValueError, match="already running"):
+        profiler.start()
+    profiler.cancel()
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="one profile covers all threads from Python 3.12")
+def test_session_profile_covers_all_threads():
+    """Test that from Python 3.12 'wrap' adds no profile and the session profile sees other threads."""
+
+    # Arrange
+    profiler = SessionProfiler()
+    calculation = CalculationFactory.create_calculation(2.0, '+', 3.0)
+    results = []
+
+    # Act
+    profiler.start()
+    wrapped = profiler.wrap(calculation.execute)
+    worker = threading.Thread(target=lambda: results.append(wrapped()))
+    worker.start()
+    worker.join()
+    report = profiler.stop()
+
+    # Assert
+    assert wrapped == calculation.execute
+    assert results == [5.0]
+    assert stage_calls(report)["execute"] == 1
+
+def test_profiles_that_fail_to_start_are_left_out(monkeypatch):
+    """Test that a profile that cannot be enabled raises ValueError and is not merged into the report."""
+
+    # Arrange
+    profiler = SessionProfiler()
+    calculation = CalculationFactory.create_calculation(2.0, '+', 3.0)
+    monkeypatch.setattr(app.profiler, "_PROFILES_ALL_THREADS", False)
+
+    # Act
+    profiler.start()
+    monkeypatch.setattr(cProfile, "Profile", BusyProfile)
+    with pytest.raises(ValueError, match="already active"):
+        profiler.wrap(calculation.execute)()
+    report = profiler.stop()
+    with pytest.raises(ValueError, match="already active"):
+        profiler.start()
+
+    # Assert
+    assert stage_calls(report)["execute"] == 0
+    assert not profiler.active
@@ -0,0 +1,128 @@
+"""
+tests/test_reduction.py
+
+Tests n-ary reductions with streaming, compensated accumulation.
+"""
+
+import math
+import pytest
+from app.operation import Operation
+from app.reduction import (
+    ProductAccumulator,
+    SumAccumulator,
+    chunked,
+    read_column,
+    reduce_values,
+)
+
+def test_sum_is_compensated():
+    """Test that summation does not accumulate rounding error."""
+
+    # Arrange
+    values = [0.1] * 10 + [1e16, 1.0, -1e16]
+
+    # Act
+    result = reduce_values("sum", values, chunk_size=3)
+
+    # Assert
+    assert result == math.fsum(values)
+
+def test_sum_accumulator_per_value_matches_fsum():
+    """Test that adding operands one at a time is compensated as well."""
+
+    # Arrange
+    accumulator = SumAccumulator()
+    values = [1.0, 1e100, 1.0, -1e100]
+
+    # Act
+    for value in values:
+        accumulator.add(value)
+
+    # Assert
+    assert accumulator.result == 2.0
+    assert accumulator.count == 4
+
+def test_sum_with_overflow_and_infinities():
+    """Test chunks that math.fsum rejects fall back to per-operand accumulation."""
+
+    assert reduce_values("sum", [1e308, 1e308]) == math.inf
+    assert math.isnan(reduce_values("sum", [math.inf, -math.inf]))
+
+def test_prod_uses_operation_multiplication(monkeypatch):
+    """Test that chunk products are combined with Operation.multiplication."""
+
+    # Arrange
+    calls = []
+    original = Operation.multiplication
+
+    def recording_multiplication(a, b):
+        calls.append((a, b))
+        return original(a, b)
+
+    monkeypatch.setattr(Operation, "multiplication", staticmethod(recording_multiplication))
+
+    # Act
+    result = reduce_values("prod", [1.0, 2.0, 3.0, 4.0, 5.0], chunk_size=2)
+
+    # Assert
+    assert result == 120.0
+    assert calls == [(1.0, 2.0), (2.0, 12.0), (24.0, 5.0)]
+
+def test_product_accumulator_add():
+    """Test multiplying in single operands."""
+
+    # Arrange
+    accumulator = ProductAccumulator()
+
+    # Act
+    accumulator.add(3.0)
+    accumulator.add_chunk([2.0, 2.0])
+
+    # Assert
+    assert accumulator.result == 12.0
+    assert accumulator.count == 3
+
+def test_empty_reductions():
+    """Test the identity results of empty reductions."""
+
+    assert reduce_values("sum", []) == 0.0
+    assert reduce_values("prod", []) == 1.0
+
+def test_unsupported_reduction():
+    """Test that unknown reductions list the available ones."""
+
+    with pytest.raises(ValueError) as exc_info:
+        reduce_values("mean", [1.0])
+
+    assert str(exc_info.value) == "Unsupported reduction: 'mean'. Available reductions: 'sum, prod'"
+
+def test_chunked():
+    """Test splitting a stream into chunks."""
+
+    assert list(chunked(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+    with pytest.raises(ValueError):
+        list(chunked([], 0))
+
+def test_read_column(tmp_path):
+    """Test reading a column from whitespace and comma separated files."""
+
+    # Arrange
+    path = tmp_path / "data.txt"
+    path.write_text("1 10\n\n2 20\n3,30\n")
+
+    # Act and Assert
+    assert list(read_column(str(path))) == [1.0, 2.0, 3.0]
+    assert list(read_column(str(path), 1)) == [10.0, 20.0, 30.0]
+
+def test_read_column_invalid(tmp_path):
+    """Test that missing or non-numeric values report the line number."""
+
+    # Arrange
+    path = tmp_path / "data.txt"
+    path.write_text("1\nx\n")
+
+    # Act and Assert
+    with pytest.raises(ValueError) as exc_info:
+        list(read_column(str(path)))
+
+    assert str(exc_info.value) == "Line 2: expected a number in column 1."
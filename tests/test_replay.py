@@ -0,0 +1,178 @@
+"""
+tests/test_replay.py
+
+Tests replaying stored history against the current operator implementations.
+"""
+
+from unittest.mock import patch
+from app.calculation import Calculation, CalculationFactory
+from app.history import HistoryRecord
+from app.operation import Operation, VectorOperation
+from app.replay import ReplayDifference, replay_history
+
+def test_replay_matching_history():
+    """Test that an unchanged history replays without differences, fully vectorized."""
+
+    # Arrange
+    records = [
+        HistoryRecord('+', 8.0, 2.0, 10.0),
+        HistoryRecord('*', 3.0, 4.0, 12.0),
+        HistoryRecord('+', 1.0, 1.0, 2.0),
+        HistoryRecord('%', 8.0, 3.0, 2.0),
+    ]
+
+    # Act
+    report = replay_history(records)
+
+    # Assert
+    assert report.total == 4
+    assert report.vectorized == 4
+    assert report.matched == 4
+    assert report.differences == []
+
+def test_replay_reports_changed_results_in_order():
+    """Test that entries whose result changed are reported in history order."""
+
+    # Arrange
+    records = [
+        HistoryRecord('-', 8.0, 2.0, 6.0),
+        HistoryRecord('+', 8.0, 2.0, 11.0),
+        HistoryRecord('-', 5.0, 5.0, 1.0),
+    ]
+
+    # Act
+    report = replay_history(records)
+
+    # Assert
+    assert report.differences == [
+        ReplayDifference(1, '+', 8.0, 2.0, 11.0, 10.0),
+        ReplayDifference(2, '-', 5.0, 5.0, 1.0, 0.0),
+    ]
+
+def test_replay_tolerance():
+    """Test that results within tolerance are treated as matching."""
+
+    # Arrange
+    records = [HistoryRecord('/', 1.0, 3.0, 0.3333333)]
+
+    # Act and Assert
+    assert replay_history(records).differences != []
+    assert replay_history(records, abs_tol=1e-6).differences == []
+
+def test_replay_zero_divisor_falls_back_per_entry():
+    """Test that a group whose kernel raises is replayed entry by entry."""
+
+    # Arrange
+    records = [
+        HistoryRecord('/', 8.0, 2.0, 4.0),
+        HistoryRecord('/', 8.0, 0.0, 4.0),
+    ]
+
+    # Act
+    report = replay_history(records)
+
+    # Assert
+    assert report.vectorized == 0
+    assert report.differences == [
+        ReplayDifference(1, '/', 8.0, 0.0, 4.0, "Cannot divide by zero."),
+    ]
+
+def test_replay_uses_kernels():
+    """Test that each operator group is executed with a single kernel call."""
+
+    # Arrange
+    records = [HistoryRecord('+', float(i), 1.0, float(i + 1)) for i in range(5)]
+
+    # Act
+    with patch.object(VectorOperation, 'addition', wraps=VectorOperation.addition) as mock_kernel, \
+            patch.object(CalculationFactory, 'get_kernel', return_value=VectorOperation.addition):
+        report = replay_history(records)
+
+    # Assert
+    mock_kernel.assert_called_once_with([0.0, 1.0, 2.0, 3.0, 4.0], [1.0] * 5)
+    assert report.matched == 5
+
+def test_replay_detects_changed_operation():
+    """Test that a changed 'Operation' method shows up in a vectorized replay."""
+
+    # Arrange
+    records = [HistoryRecord('+', 1.0, 2.0, 3.0), HistoryRecord('+', 2.0, 2.0, 4.0)]
+
+    # Act
+    with patch.object(Operation, 'addition', staticmethod(lambda a, b: a + b + 1)):
+        report = replay_history(records)
+
+    # Assert
+    assert report.vectorized == 2
+    assert report.differences == [
+        ReplayDifference(0, '+', 1.0, 2.0, 3.0, 4.0),
+        ReplayDifference(1, '+', 2.0, 2.0, 4.0, 5.0),
+    ]
+
+def test_replay_without_kernel_and_unknown_operator():
+    """Test that operators without a kernel run per entry and unknown operators are reported."""
+
+    # Arrange
+    @CalculationFactory.register_calculation('max')
+    class MaxCalculation(Calculation):
+        operator = 'max'
+
+        def execute(self) -> float:
+            return max(self.a, self.b)
+
+    records = [
+        HistoryRecord('max', 1.0, 2.0, 2.0),
+        HistoryRecord('//', 7.0, 2.0, 3.0),
+    ]
+
+    # Act
+    report = replay_history(records)
+
+    # Assert
+    assert report.vectorized == 0
+    assert len(report.differences) == 1
+    assert report.differences[0].index == 1
+    assert "Unsupported calculation type: '//'" in report.differences[0].replayed
+
+def test_replay_nan_results_match():
+    """Test that NaN results recorded and replayed compare as equal."""
+
+    # Arrange
+    nan = float('nan')
+    records = [HistoryRecord('+', nan, 1.0, nan)]
+
+    # Act and Assert
+    assert replay_history(records).differences == []
+
+def test_replay_complex_result_is_a_difference():
+    """Test that a replayed complex result is reported instead of raising."""
+
+    # Arrange
+    records = [HistoryRecord('**', -8.0, 0.5, float('nan'))]
+
+    # Act
+    report = replay_history(records)
+
+    # Assert
+    assert len(report.differences) == 1
+    assert isinstance(report.differences[0].replayed, complex)
+
+def test_replay_non_numeric_result_is_a_difference():
+    """Test that a result that cannot be compared numerically is compared by equality."""
+
+    # Arrange
+    @CalculationFactory.register_calculation('none')
+    class NoneCalculation(Calculation):
+        operator = 'none'
+
+        def execute(self) -> float:
+            return None
+
+    records = [HistoryRecord('none', 1.0, 2.0, 3.0), HistoryRecord('**', -8.0, 0.5, 2j)]
+
+    # Act
+    report = replay_history(records)
+
+    # Assert
+    assert [difference.index for difference in report.differences] == [0, 1]
+    assert report.differences[0].replayed is None
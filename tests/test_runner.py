@@ -0,0 +1,122 @@
+"""
+tests/test_runner.py
+
+Tests executing calculations on worker threads with a timeout.
+"""
+
+import threading
+from concurrent.futures import Future
+import pytest
+from app.calculation import Calculation, CalculationFactory
+from app.runner import CalculationRunner, CalculationTimeoutError
+
+class BlockingCalculation(Calculation):
+    """Calculation that runs until its class-level event is set."""
+
+    operator = 'wait'
+    release = threading.Event()
+
+    def execute(self) -> float:
+        self.release.wait()
+        return self.a
+
+@pytest.fixture
+def blocking():
+    """Provides BlockingCalculation and releases any still-running instances afterwards."""
+    BlockingCalculation.release = threading.Event()
+    yield BlockingCalculation
+    BlockingCalculation.release.set()
+
+def test_run_returns_result_and_raises_errors():
+    """Test results and exceptions from the worker."""
+
+    # Arrange
+    runner = CalculationRunner(timeout=5)
+
+    # Act and Assert
+    assert runner.run(CalculationFactory.create_calculation(2.0, '**', 3.0)) == 8.0
+    with pytest.raises(ZeroDivisionError):
+        runner.run(CalculationFactory.create_calculation(1.0, '/', 0.0))
+    runner.close()
+
+def test_timeout_abandons_and_replaces_worker(blocking):
+    """Test that a runaway calculation is abandoned and the pool keeps working."""
+
+    # Arrange
+    runner = CalculationRunner(timeout=0.05, workers=1)
+
+    # Act
+    with pytest.raises(CalculationTimeoutError, match="timed out after 0.05 seconds"):
+        runner.run(blocking(1.0, 2.0))
+    result = runner.run(CalculationFactory.create_calculation(1.0, '+', 2.0))
+
+    # Assert
+    assert result == 3.0
+    assert runner.abandoned == 1
+    runner.close()
+
+def test_timeout_of_queued_calculation_cancels_it(blocking):
+    """Test that a calculation still queued when its wait times out is never run."""
+
+    # Arrange
+    runner = CalculationRunner(timeout=0.05, workers=1)
+    occupying: Future = Future()
+    runner._jobs.put((occupying, blocking(1.0, 2.0).execute))   # keeps the only worker busy
+
+    # Act
+    with pytest.raises(CalculationTimeoutError):
+        runner.run(CalculationFactory.create_calculation(1.0, '+', 2.0))
+    blocking.release.set()
+    runner.timeout = 5
+    result = runner.run(CalculationFactory.create_calculation(2.0, '+', 2.0))
+
+    # Assert
+    assert runner.abandoned == 0
+    assert occupying.result() == 1.0 and result == 4.0
+    runner.close()
+
+def test_interrupt_abandons_calculation(blocking, monkeypatch):
+    """Test that KeyboardInterrupt while waiting abandons the calculation and propagates."""
+
+    # Arrange
+    runner = CalculationRunner(timeout=None)
+    started = threading.Event()
+
+    class StartedBlocking(blocking):
+        def execute(self) -> float:
+            started.set()
+            return super().execute()
+
+    def interrupted_result(self, timeout=None):
+        started.wait()
+        raise KeyboardInterrupt()
+    monkeypatch.setattr(Future, 'result', interrupted_result)
+
+    # Act
+    with pytest.raises(KeyboardInterrupt):
+        runner.run(StartedBlocking(1.0, 2.0))
+
+    # Assert
+    assert runner.abandoned == 1
+    runner.close()
+
+@pytest.mark.parametrize("timeout, workers", [(0, 1), (-1, 1), (1, 0)])
+def test_runner_rejects_bad_arguments(timeout, workers):
+    """Test argument validation."""
+
+    with pytest.raises(ValueError):
+        CalculationRunner(timeout=timeout, workers=workers)
+
+def test_close_stops_workers():
+    """Test that close ends the idle worker threads."""
+
+    # Arrange
+    runner = CalculationRunner(workers=3)
+
+    # Act
+    runner.close()
+    for thread in [t for t in threading.enumerate() if t.name == "calculation-worker"]:
+        thread.join(timeout=1)
+
+    # Assert
+    assert runner._running == 0
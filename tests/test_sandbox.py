@@ -0,0 +1,170 @@
+"""
+tests/test_sandbox.py
+
+Tests the isolated worker sandbox pool.
+"""
+
+import os
+import time
+import pytest
+from app.calculation import Calculation, CalculationFactory
+from app.outcome import ErrorCode, Failure
+from app.sandbox import SandboxPool, _run
+
+def register(calculation_type: str, execute) -> None:
+    """Registers a calculation type whose execute is 'execute(a, b)'."""
+
+    @CalculationFactory.register_calculation(calculation_type)
+    class HostileCalculation(Calculation):
+        operator = calculation_type
+
+        def execute(self) -> float:
+            return execute(self.a, self.b)
+
+def test_sandbox_results_and_failures():
+    """Test results and failures of calculations and expressions."""
+
+    # Arrange
+    with SandboxPool(workers=1) as pool:
+
+        # Act
+        outcomes = [
+            pool.evaluate(2.0, '**', 3.0),
+            pool.evaluate(1.0, '/', 0.0),
+            pool.evaluate(1.0, '//', 2.0),
+            pool.evaluate_expression("(x + 2) * 3", {"x": 1.0}),
+            pool.evaluate_expression("1 +"),
+            pool.evaluate_expression("x * 2"),
+        ]
+
+    # Assert
+    assert outcomes[0] == 8.0 and outcomes[3] == 9.0
+    assert [outcome.code for outcome in outcomes if type(outcome) is Failure] == [
+        ErrorCode.DIVIDE_BY_ZERO, ErrorCode.UNSUPPORTED_OPERATOR,
+        ErrorCode.INVALID_INPUT, ErrorCode.DOMAIN_ERROR,
+    ]
+
+def test_deep_nesting_is_contained_and_worker_recycled():
+    """Test that a deeply nested expression fails in the worker, which is replaced."""
+
+    # Arrange
+    with SandboxPool(workers=1) as pool:
+
+        # Act
+        nested = pool.evaluate_expression("(" * 20000 + "1" + ")" * 20000)
+        after = pool.evaluate(1.0, '+', 1.0)
+
+    # Assert
+    assert nested.code is ErrorCode.RESOURCE_LIMIT
+    assert after == 2.0
+    assert (pool.started, pool.recycled) == (2, 1)
+
+def test_memory_limit():
+    """Test that an allocation beyond the memory limit fails in the worker."""
+
+    # Arrange
+    register('alloc', lambda a, b: len(bytearray(int(a))))
+
+    # Act
+    with SandboxPool(workers=1, memory_limit=64 * 1024 * 1024) as pool:
+        outcome = pool.evaluate(1 << 30, 'alloc', 0)
+        small = pool.evaluate(1 << 10, 'alloc', 0)
+
+    # Assert
+    assert outcome.code is ErrorCode.RESOURCE_LIMIT
+    assert small == 1024
+
+def test_cpu_limit_kills_worker():
+    """Test that a job over the CPU limit is killed and reported."""
+
+    # Arrange
+    def spin(a, b):
+        while True:
+            pass
+    register('spin', spin)
+
+    # Act
+    with SandboxPool(workers=1, cpu_limit=1, timeout=30) as pool:
+        outcome = pool.evaluate(1, 'spin', 1)
+        after = pool.evaluate(2.0, '*', 2.0)
+
+    # Assert
+    assert outcome == Failure(ErrorCode.RESOURCE_LIMIT, "Sandbox CPU limit exceeded.")
+    assert after == 4.0
+
+def test_timeout_and_unexpected_exit():
+    """Test the wall-clock timeout and a worker that exits during a job."""
+
+    # Arrange
+    register('sleep', lambda a, b: time.sleep(a))
+    register('exit', lambda a, b: os._exit(3))
+
+    # Act
+    with SandboxPool(workers=1, timeout=0.2) as pool:
+        slow = pool.evaluate(30, 'sleep', 0)
+        died = pool.evaluate(0, 'exit', 0)
+        after = pool.evaluate(1.0, '-', 1.0)
+
+    # Assert
+    assert slow.code is ErrorCode.TIMEOUT
+    assert died == Failure(ErrorCode.RESOURCE_LIMIT,
+                           "Sandbox worker exited unexpectedly (exit code 3).")
+    assert after == 0.0
+    assert pool.recycled == 2
+
+def test_worker_replaced_after_unexpected_exception():
+    """Test that a job failing in the parent (an unpicklable operand) does not lose its worker."""
+
+    # Arrange
+    with SandboxPool(workers=1) as pool:
+
+        # Act
+        with pytest.raises(Exception):
+            pool.evaluate(1.0, '+', lambda: 0)
+        after = pool.evaluate(1.0, '+', 2.0)
+
+    # Assert
+    assert after == 3.0
+    assert pool.recycled == 1
+
+def test_workers_recycled_after_max_jobs():
+    """Test recycling after 'max_jobs' jobs, keeping warm workers."""
+
+    # Arrange
+    with SandboxPool(workers=2, max_jobs=2) as pool:
+
+        # Act
+        results = [pool.evaluate(float(i), '+', 1.0) for i in range(4)]
+
+    # Assert
+    assert results == [1.0, 2.0, 3.0, 4.0]
+    assert pool.recycled == 2 and pool.started == 4
+
+def test_run_in_process():
+    """Test the worker's job evaluation directly."""
+
+    assert _run(("calc", 6.0, '/', 3.0)) == 2.0
+    assert _run(("expr", "a % 4", {"a": 10.0})) == 2.0
+    assert _run(("calc", 1.0, '@', 2.0)).code is ErrorCode.UNSUPPORTED_OPERATOR
+    assert _run(("expr", "1 +", {})).code is ErrorCode.INVALID_INPUT
+    assert _run(("expr", "(" * 20000 + "1" + ")" * 20000, {})).code is ErrorCode.RESOURCE_LIMIT
+
+@pytest.mark.parametrize("arguments", [
+    {"workers": 0}, {"max_jobs": 0}, {"timeout": 0},
+])
+def test_sandbox_rejects_bad_arguments(arguments):
+    """Test argument validation."""
+
+    with pytest.raises(ValueError):
+        SandboxPool(**arguments)
+
+def test_closed_pool_rejects_jobs():
+    """Test that a closed pool raises instead of hanging."""
+
+    # Arrange
+    pool = SandboxPool(workers=1)
+    pool.close()
+
+    # Act and Assert
+    with pytest.raises(ValueError, match="closed"):
+        pool.evaluate(1.0, '+', 1.0)
@@ -0,0 +1,108 @@
+"""
+tests/test_stats.py
+
+Tests running statistics over calculation results.
+"""
+
+import statistics
+import pytest
+from app.stats import ResultStatistics, RunningStats
+
+def test_running_stats_matches_statistics_module():
+    """Test Welford aggregates against the statistics module."""
+
+    # Arrange
+    values = [4.0, 7.0, 13.0, 16.0, -2.5]
+    stats = RunningStats()
+
+    # Act
+    for value in values:
+        stats.add(value)
+
+    # Assert
+    assert stats.count == 5
+    assert stats.mean == pytest.approx(statistics.mean(values))
+    assert stats.variance == pytest.approx(statistics.pvariance(values))
+    assert stats.sample_variance == pytest.approx(statistics.variance(values))
+    assert stats.stdev == pytest.approx(statistics.pstdev(values))
+    assert (stats.minimum, stats.maximum) == (-2.5, 16.0)
+
+def test_running_stats_is_stable_with_large_offset():
+    """Test that variance stays accurate for values with a large common offset."""
+
+    # Arrange
+    stats = RunningStats()
+
+    # Act
+    for value in (1e9 + 4, 1e9 + 7, 1e9 + 13, 1e9 + 16):
+        stats.add(value)
+
+    # Assert
+    assert stats.variance == pytest.approx(22.5)
+
+def test_running_stats_empty_and_single():
+    """Test variance with fewer than two values."""
+
+    # Arrange
+    stats = RunningStats()
+
+    # Act and Assert
+    assert stats.variance == 0.0 and stats.minimum is None
+    stats.add(3.0)
+    assert stats.variance == 0.0 and stats.sample_variance == 0.0
+
+def test_result_statistics_per_operator_and_skipped():
+    """Test per-operator aggregates and that complex results are skipped."""
+
+    # Arrange
+    stats = ResultStatistics()
+
+    # Act
+    stats.record('+', 2.0)
+    stats.record('*', 6.0)
+    stats.record('+', 4.0)
+    stats.record('**', complex(0, 2))
+
+    # Assert
+    assert stats.overall.count == 3
+    assert stats.by_operator['+'].mean == 3.0
+    assert stats.by_operator['*'].count == 1
+    assert stats.skipped == 1
+    assert "skipped (non-real results): 1" in stats.summary()
+
+def test_result_statistics_skip_non_finite():
+    """Test that inf and nan results are counted apart and leave the aggregates finite."""
+
+    # Arrange
+    stats = ResultStatistics()
+
+    # Act
+    stats.record('+', 2.0)
+    stats.record('*', 1e308 * 10)
+    stats.record('-', float('nan'))
+    stats.record('+', 4.0)
+
+    # Assert
+    assert stats.overall.count == 2
+    assert stats.overall.mean == 3.0
+    assert stats.overall.variance == 1.0
+    assert stats.overall.maximum == 4.0
+    assert '*' not in stats.by_operator
+    assert stats.non_finite == 2
+    assert "skipped (inf or nan results): 2" in stats.summary()
+
+def test_result_statistics_summary_empty():
+    """Test the summary before any result."""
+
+    assert ResultStatistics().summary() == "No calculation results yet."
+
+    stats = ResultStatistics()
+    stats.record('*', float('inf'))
+    assert stats.summary() == "No finite real calculation results yet (1 inf or nan)."
+
+    stats.record('**', complex(0.0, 2.0))
+    assert stats.summary() == "No finite real calculation results yet (1 non-real, 1 inf or nan)."
+
+    stats = ResultStatistics()
+    stats.record('**', complex(0.0, 2.0))
+    assert stats.summary() == "No finite real calculation results yet (1 non-real)."
@@ -0,0 +1,123 @@
+"""
+tests/test_stream.py
+
+Tests the streaming evaluation API.
+"""
+
+import itertools
+import pytest
+from app.stream import (
+    CALCULATION_ERROR,
+    DIVIDE_BY_ZERO,
+    DOMAIN_ERROR,
+    INVALID_INPUT,
+    OVERFLOW,
+    UNSUPPORTED_OPERATOR,
+    StreamError,
+    StreamResult,
+    count_errors,
+    evaluate_stream,
+    parse_line,
+)
+from app.tracing import Tracer
+
+def test_parse_line():
+    """Test that a text line is parsed into operands and operator."""
+
+    assert parse_line(" 8 ** 2 ") == (8.0, '**', 2.0)
+
+@pytest.mark.parametrize("line", ["8 +", "a + 2", "1 + 2 + 3", "x = 1 + 2", "2 // 3"])
+def test_parse_line_invalid(line):
+    """Test that malformed lines raise ValueError."""
+
+    with pytest.raises(ValueError):
+        parse_line(line)
+
+def test_evaluate_stream_lines_and_tuples():
+    """Test that text lines and tuples are evaluated in order."""
+
+    # Arrange
+    items = ["8 + 2", (3.0, '*', 4.0)]
+
+    # Act
+    outcomes = list(evaluate_stream(items))
+
+    # Assert
+    assert [outcome.result for outcome in outcomes] == [10.0, 12.0]
+    assert [outcome.index for outcome in outcomes] == [0, 1]
+    assert all(isinstance(outcome, StreamResult) and outcome.ok for outcome in outcomes)
+    assert repr(outcomes[1].calculation) == "MultiplyCalculation(a=3.0, b=4.0)"
+
+def test_evaluate_stream_structured_errors():
+    """Test that each kind of failure is yielded as a StreamError instead of raised."""
+
+    # Arrange
+    items = ["five + 2", (1.0, '/', 0.0), "2 // 3", (1.0, '+'), "", "4 % 0", (2.0, '//', 3.0),
+             (1.0, ['+'], 2.0)]
+
+    # Act
+    outcomes = list(evaluate_stream(items))
+
+    # Assert
+    assert all(isinstance(outcome, StreamError) and not outcome.ok for outcome in outcomes)
+    assert [(outcome.index, outcome.code) for outcome in outcomes] == [
+        (0, INVALID_INPUT),
+        (1, DIVIDE_BY_ZERO),
+        (2, UNSUPPORTED_OPERATOR),
+        (3, INVALID_INPUT),
+        (5, DIVIDE_BY_ZERO),
+        (6, UNSUPPORTED_OPERATOR),
+        (7, INVALID_INPUT),
+    ]
+    assert outcomes[1].message == "Cannot divide by zero."
+    assert outcomes[1].item == (1.0, '/', 0.0)
+
+def test_evaluate_stream_unexpected_error():
+    """Test that unexpected execution errors are reported with a generic code."""
+
+    # Act
+    outcome = next(evaluate_stream([("8", '+', 2.0)]))
+
+    # Assert
+    assert outcome.code == CALCULATION_ERROR
+
+def test_evaluate_stream_is_lazy():
+    """Test that items are consumed only as results are requested."""
+
+    # Arrange
+    lines = (f"{i} + 1" for i in itertools.count())
+
+    # Act
+    first_three = list(itertools.islice(evaluate_stream(lines), 3))
+
+    # Assert
+    assert [outcome.result for outcome in first_three] == [1.0, 2.0, 3.0]
+    assert next(lines) == "3 + 1"
+
+def test_count_errors_per_code():
+    """Test per-batch error counts for overflow, domain and divide-by-zero errors."""
+
+    # Arrange
+    items = ["10 ** 400", "-8 ** 0.5", "1 / 0", "2 % 0", "2 ** 10", "8 +"]
+
+    # Act
+    counts = count_errors(evaluate_stream(items))
+
+    # Assert
+    assert counts == {OVERFLOW: 1, DOMAIN_ERROR: 1, DIVIDE_BY_ZERO: 2, INVALID_INPUT: 1}
+    assert counts.errors == 5
+
+def test_evaluate_stream_traces_stages():
+    """Test that a tracer records parse, dispatch and execute spans per item."""
+
+    # Arrange
+    tracer = Tracer()
+
+    # Act
+    list(evaluate_stream(["1 + 2", (4.0, '/', 0.0), "1 // 2"], tracer=tracer))
+
+    # Assert
+    assert [event["name"] for event in tracer.events] == [
+        "parse", "dispatch", "execute", "dispatch", "execute", "parse",
+    ]
+    assert {event["cat"] for event in tracer.events} == {"batch"}
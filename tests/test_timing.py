@@ -0,0 +1,65 @@
+"""
+tests/test_timing.py
+
+Tests timing a calculation on each evaluation path.
+"""
+
+import pytest
+from app.calculation import Calculation, CalculationFactory
+from app.timing import Timing, _timing, format_timings, time_calculation
+
+def test_time_calculation_paths():
+    """Test that every path is timed with consistent statistics."""
+
+    # Act
+    timings = time_calculation(2.0, '**', 10.0, calls=200)
+
+    # Assert
+    assert [timing.path for timing in timings] == ["factory", "evaluate", "vectorized"]
+    assert [timing.calls for timing in timings] == [200, 200, 5]
+    for timing in timings:
+        assert 0 <= timing.minimum <= timing.median <= timing.p95
+        assert timing.minimum <= timing.mean
+
+def test_paths_without_kernel_or_float_results():
+    """Test that the vectorized path is skipped without a kernel or for complex results."""
+
+    # Arrange
+    @CalculationFactory.register_calculation('max')
+    class MaxCalculation(Calculation):
+        operator = 'max'
+
+        def execute(self) -> float:
+            return max(self.a, self.b)
+
+    # Act
+    no_kernel = time_calculation(1.0, 'max', 2.0, calls=10)
+    complex_result = time_calculation(-8.0, '**', 0.5, calls=10)
+
+    # Assert
+    assert [timing.path for timing in no_kernel] == ["factory", "evaluate"]
+    assert [timing.path for timing in complex_result] == ["factory", "evaluate"]
+
+@pytest.mark.parametrize("a, operator, b, calls, message", [
+    (1.0, '/', 0.0, 10, "Cannot time a failing calculation: Cannot divide by zero."),
+    (1.0, '//', 2.0, 10, "Unsupported calculation type"),
+    (1.0, '+', 2.0, 0, "at least 1"),
+])
+def test_time_calculation_errors(a, operator, b, calls, message):
+    """Test that calculations that cannot be timed raise ValueError."""
+
+    with pytest.raises(ValueError, match=message):
+        time_calculation(a, operator, b, calls)
+
+def test_statistics_and_table():
+    """Test the summary statistics and the rendered table."""
+
+    # Act
+    timing = _timing("factory", [float(value) for value in range(100, 0, -1)])
+    table = format_timings("1 + 2", [timing, Timing("vectorized", 5, 1, 2, 3, 2)])
+
+    # Assert
+    assert timing == Timing("factory", 100, 1.0, 50.0, 95.0, 50.5)
+    assert table.splitlines()[0] == "timeit 1 + 2: 100 calls"
+    assert table.splitlines()[2].split() == ["factory", "1", "50", "95", "50"]
+    assert table.endswith("(per element)")
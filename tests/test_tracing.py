@@ -0,0 +1,76 @@
+"""
+tests/test_tracing.py
+
+Tests recording spans and writing Chrome trace files.
+"""
+
+import json
+import threading
+import pytest
+from app.tracing import NULL_TRACER, Tracer, now
+
+def test_span_and_complete_record_events():
+    """Test that spans become complete events with timestamps in microseconds."""
+
+    # Arrange
+    tracer = Tracer()
+
+    # Act
+    with tracer.span("parse", operator='+'):
+        pass
+    start = now()
+    end = tracer.complete("execute", start, "batch")
+
+    # Assert
+    parse, execute = tracer.events
+    assert parse["name"] == "parse" and parse["cat"] == "calculator" and parse["ph"] == "X"
+    assert parse["args"] == {"operator": '+'}
+    assert parse["tid"] == threading.get_ident()
+    assert execute["cat"] == "batch" and "args" not in execute
+    assert execute["ts"] == start / 1000
+    assert execute["dur"] == (end - start) / 1000 >= 0
+    assert parse["ts"] <= execute["ts"]
+
+def test_span_records_error():
+    """Test that a span left by an exception records the exception type."""
+
+    # Arrange
+    tracer = Tracer()
+
+    # Act
+    with pytest.raises(ZeroDivisionError):
+        with tracer.span("execute"):
+            1 / 0
+
+    # Assert
+    assert tracer.events[0]["args"] == {"error": "ZeroDivisionError"}
+
+def test_write_chrome_trace(tmp_path):
+    """Test the trace file format."""
+
+    # Arrange
+    tracer = Tracer()
+    with tracer.span("dispatch"):
+        pass
+    path = tmp_path / "trace.json"
+
+    # Act
+    tracer.write(str(path))
+
+    # Assert
+    trace = json.loads(path.read_text())
+    assert trace["displayTimeUnit"] == "ms"
+    assert [event["name"] for event in trace["traceEvents"]] == ["dispatch"]
+
+def test_null_tracer_records_nothing():
+    """Test that the disabled tracer accepts the same calls and records nothing."""
+
+    # Act
+    with NULL_TRACER.span("parse", operator='+') as span:
+        pass
+    end = NULL_TRACER.complete("execute", 0)
+
+    # Assert
+    assert span is NULL_TRACER.span("other")
+    assert end > 0
+    assert not NULL_TRACER.enabled and Tracer.enabled
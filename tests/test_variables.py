@@ -0,0 +1,186 @@
+"""
+tests/test_variables.py
+
+Tests named variables, 'ans' and incremental recomputation of dependents.
+"""
+
+import pytest
+from app.variables import (
+    CircularDefinitionError,
+    UndefinedVariableError,
+    Workspace,
+)
+
+def test_resolve_numbers_variables_and_ans():
+    """Test that operand tokens resolve to numbers, variable values and 'ans'."""
+
+    # Arrange
+    workspace = Workspace()
+    workspace.assign("x", "3", "*", "4")
+
+    # Act and Assert
+    assert workspace.resolve("2.5") == 2.5
+    assert workspace.resolve("x") == 12.0
+    assert workspace.resolve("ans") == 12.0
+
+@pytest.mark.parametrize("token", ["y", "ans"])
+def test_resolve_undefined(token):
+    """Test that unknown names, and 'ans' before any result, are undefined."""
+
+    with pytest.raises(UndefinedVariableError) as exc_info:
+        Workspace().resolve(token)
+
+    assert str(exc_info.value) == f"Undefined variable: '{token}'."
+
+def test_assign_returns_calculation_and_result():
+    """Test that an assignment executes its calculation and stores the value."""
+
+    # Arrange
+    workspace = Workspace()
+
+    # Act
+    calculation, result, updates = workspace.assign("x", "3", "*", "4")
+
+    # Assert
+    assert repr(calculation) == "MultiplyCalculation(a=3.0, b=4.0)"
+    assert result == 12.0
+    assert updates == []
+    assert workspace.values == {"x": 12.0}
+    assert workspace.ans == 12.0
+
+def test_redefinition_recomputes_only_dependents_in_order():
+    """Test that redefining a variable recomputes only its transitive dependents."""
+
+    # Arrange
+    workspace = Workspace()
+    workspace.assign("x", "2", "+", "0")
+    workspace.assign("unrelated", "5", "+", "5")
+    workspace.assign("z", "x", "+", "1")
+    workspace.assign("y", "x", "*", "10")
+    workspace.assign("w", "y", "-", "z")
+    unrelated_calculation = workspace.calculations["unrelated"]
+
+    # Act
+    _, _, updates = workspace.assign("x", "3", "+", "0")
+
+    # Assert
+    assert [update.name for update in updates] == ["z", "y", "w"]
+    assert all(update.error is None for update in updates)
+    assert workspace.values == {"x": 3.0, "unrelated": 10.0, "z": 4.0, "y": 30.0, "w": 26.0}
+    assert workspace.calculations["unrelated"] is unrelated_calculation
+
+def test_redefinition_drops_old_dependencies():
+    """Test that a variable stops following variables it no longer uses."""
+
+    # Arrange
+    workspace = Workspace()
+    workspace.assign("x", "1", "+", "1")
+    workspace.assign("y", "x", "+", "1")
+    workspace.assign("y", "5", "+", "5")
+
+    # Act
+    _, _, updates = workspace.assign("x", "7", "+", "0")
+
+    # Assert
+    assert updates == []
+    assert workspace.values["y"] == 10.0
+
+def test_ans_is_a_snapshot():
+    """Test that 'ans' is substituted by value and not tracked as a dependency."""
+
+    # Arrange
+    workspace = Workspace()
+    workspace.assign("x", "2", "+", "2")
+    workspace.assign("y", "ans", "*", "2")
+
+    # Act
+    workspace.assign("z", "1", "+", "1")
+
+    # Assert
+    assert workspace.values["y"] == 8.0
+    assert workspace.dependents("x") == []
+
+def test_ans_snapshot_survives_recomputation():
+    """Test that recomputing a dependent reuses the 'ans' value it was defined with."""
+
+    # Arrange
+    workspace = Workspace()
+    workspace.assign("y", "1", "+", "1")
+    workspace.assign("x", "ans", "+", "y")
+    workspace.assign("w", "y", "-", "ans")
+
+    # Act
+    _, _, updates = workspace.assign("y", "10", "+", "0")
+
+    # Assert
+    assert workspace.definitions["x"].a == 2.0
+    assert workspace.definitions["w"].b == 4.0
+    assert [update.name for update in updates] == ["x", "w"]
+    assert workspace.values["x"] == 12.0
+    assert workspace.values["w"] == 6.0
+
+def test_recompute_error_leaves_variable_undefined():
+    """Test that a dependent that can no longer be computed loses its value, as do its dependents."""
+
+    # Arrange
+    workspace = Workspace()
+    workspace.assign("x", "2", "+", "0")
+    workspace.assign("y", "1", "/", "x")
+    workspace.assign("z", "y", "+", "1")
+
+    # Act
+    _, _, updates = workspace.assign("x", "0", "+", "0")
+
+    # Assert
+    assert [(update.name, type(update.error)) for update in updates] == [
+        ("y", ZeroDivisionError),
+        ("z", UndefinedVariableError),
+    ]
+    assert "y" not in workspace.values and "z" not in workspace.values
+
+    # Act: fixing 'x' restores the dependents
+    _, _, updates = workspace.assign("x", "4", "+", "0")
+
+    # Assert
+    assert workspace.values["z"] == 1.25
+
+@pytest.mark.parametrize("name, a, b", [
+    ("x", "x", "1"),
+    ("x", "z", "1"),
+])
+def test_circular_definitions_are_rejected(name, a, b):
+    """Test that self references and cycles are rejected without changing the workspace."""
+
+    # Arrange
+    workspace = Workspace()
+    workspace.assign("x", "1", "+", "1")
+    workspace.assign("y", "x", "+", "1")
+    workspace.assign("z", "y", "+", "1")
+
+    # Act and Assert
+    with pytest.raises(CircularDefinitionError):
+        workspace.assign(name, a, "+", b)
+
+    assert workspace.values["x"] == 2.0
+
+@pytest.mark.parametrize("name", ["ans", "sum", "prod", "timeit", "2x", "help-me"])
+def test_invalid_names_are_rejected(name):
+    """Test that reserved words and non-identifiers cannot be assigned."""
+
+    with pytest.raises(ValueError) as exc_info:
+        Workspace().assign(name, "1", "+", "1")
+
+    assert "Invalid variable name" in str(exc_info.value)
+
+def test_failed_assignment_leaves_workspace_unchanged():
+    """Test that an assignment whose calculation fails does not change the workspace."""
+
+    # Arrange
+    workspace = Workspace()
+    workspace.assign("x", "1", "+", "1")
+
+    # Act and Assert
+    with pytest.raises(ZeroDivisionError):
+        workspace.assign("x", "1", "/", "0")
+
+    assert workspace.values == {"x": 2.0}